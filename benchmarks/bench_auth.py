@@ -0,0 +1,39 @@
+"""Cost of authenticating a request: requests' HTTPBasicAuth against the precomputed BasicAuth header.
+
+HTTPBasicAuth base64-encodes the credentials every time a request is prepared; BasicAuth, used by
+BuycoinsClient and Auth.setup, encodes them once. The timings are of applying the authentication to a
+prepared request, and of preparing the whole request.
+
+    PYTHONPATH=. python benchmarks/bench_auth.py [iterations]
+"""
+import sys
+import timeit
+
+import requests
+from requests.auth import HTTPBasicAuth
+
+from buycoins_client.components.auth import BasicAuth
+
+URL = "https://backend.buycoins.tech/api/graphql"
+DATA = b'{"query":"query { getPrices { id,cryptocurrency,sellPricePerCoin,minSell,maxSell,expiresAt } }"}'
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    session = requests.Session()
+    precomputed = BasicAuth("public_key", "secret_key")
+    auths = {
+        "HTTPBasicAuth per call": lambda: HTTPBasicAuth("public_key", "secret_key"),
+        "precomputed BasicAuth": lambda: precomputed,
+    }
+
+    prepared = session.prepare_request(requests.Request("POST", URL, data=DATA))
+    print("{:<26}{:>18}{:>18}".format("", "auth (us)", "prepare (us)"))
+    for name, auth in auths.items():
+        apply = timeit.timeit(lambda: auth()(prepared), number=iterations)
+        prepare = timeit.timeit(lambda: session.prepare_request(requests.Request("POST", URL, data=DATA, auth=auth())), number=iterations)
+        print("{:<26}{:>18.2f}{:>18.2f}".format(name, apply / iterations * 1e6, prepare / iterations * 1e6))
+
+
+if __name__ == "__main__":
+    main()
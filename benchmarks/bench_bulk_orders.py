@@ -0,0 +1,42 @@
+"""Time to place a cycle of limit orders: one post_limit_order call at a time, against post_limit_orders
+sending them in one document and over a concurrent pool.
+
+Runs against FakeServer with a constant latency, so the timings show the round trips saved.
+
+    PYTHONPATH=. python benchmarks/bench_bulk_orders.py [--orders 40] [--latency 0.02] [--concurrency 8]
+"""
+import argparse
+import time
+
+import buycoins_client as buycoins
+from buycoins_client.testing import Exchange, FakeServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.02, help="server latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=8)
+    options = parser.parse_args()
+
+    orders = [{"orderSide":"buy", "priceType":"static", "cryptocurrency":"bitcoin", "coinAmount":0.001, "staticPrice":24000000.0 - number * 1000} for number in range(options.orders)]
+    ways = {
+        "post_limit_order loop": lambda: [buycoins.Orders.post_limit_order(args) for args in orders],
+        "post_limit_orders, one document": lambda: buycoins.Orders.post_limit_orders(orders),
+        "post_limit_orders, concurrency {}".format(options.concurrency): lambda: buycoins.Orders.post_limit_orders(orders, concurrency=options.concurrency),
+    }
+
+    buycoins.Auth.setup("public_key", "secret_key")
+    buycoins.set_transport(buycoins.Transport(pool_size=options.concurrency))
+    print("{} limit orders, server latency {:.0f} ms".format(options.orders, options.latency * 1000))
+    for name, place in ways.items():
+        with FakeServer(Exchange(0, balances={"naira_token": 10 ** 9}), latency=options.latency):
+            start = time.perf_counter()
+            responses = place()
+            elapsed = time.perf_counter() - start
+        failures = sum(response["status"] != "success" for response in responses)
+        print("{:<36}{:>10.1f} ms{:>6} failed".format(name, elapsed * 1000, failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Overhead of the request hooks on a component call, with the network taken out.
+
+The transport returns a canned response, so the timings are the client's own work: with no hooks
+registered (the default), and with one hook that does nothing.
+
+    PYTHONPATH=. python benchmarks/bench_hooks.py [iterations]
+"""
+import json
+import sys
+import timeit
+
+import buycoins_client as buycoins
+
+BODY = json.dumps({"data":{"getPrices":[{"id":"QnV5Y29pbnNQcmljZS0x", "cryptocurrency":"bitcoin", "sellPricePerCoin":"17827839.315", "minSell":"0.001", "maxSell":"0.35190587", "expiresAt":1612391202}]}}).encode()
+
+
+class Response:
+    status_code = 200
+    content = BODY
+    headers = {}
+
+
+class CannedTransport(buycoins.Transport):
+    def post(self, url, **kwargs):
+        return Response()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    buycoins.set_transport(CannedTransport())
+    buycoins.Auth.setup("public_key", "secret_key")
+
+    def run():
+        buycoins.Prices.list()
+    run()
+    without = min(timeit.repeat(run, number=iterations, repeat=5)) / iterations * 1e6
+    hook = buycoins.Hooks.register(lambda event: None)
+    with_hook = min(timeit.repeat(run, number=iterations, repeat=5)) / iterations * 1e6
+    buycoins.Hooks.unregister(hook)
+
+    print("no hooks       {:6.2f} us/call".format(without))
+    print("one no-op hook {:6.2f} us/call (+{:.2f} us)".format(with_hook, with_hook - without))
+
+
+if __name__ == "__main__":
+    main()
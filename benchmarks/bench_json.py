@@ -0,0 +1,58 @@
+"""Encode and decode throughput of every component's default selection for each JSON backend.
+
+"encode" serializes the request body; the "form" row is the form-encoded body requests built
+before bodies were sent as JSON. "decode" parses a representative response for the selection.
+
+    PYTHONPATH=. python benchmarks/bench_json.py [iterations]
+"""
+import sys
+import timeit
+from urllib.parse import urlencode
+
+from buycoins_client.components import json_backend, utilities
+from bench_query_build import CALLS
+
+ORDER = {"id":"UG9zdE9yZGVyLTg5NDUxNTM2", "cryptocurrency":"bitcoin", "coinAmount":"0.0005", "side":"sell", "status":"active", "createdAt":1614291760, "pricePerCoin":"26599999.0", "priceType":"static", "staticPrice":"2659999900", "dynamicExchangeRate":None}
+BOOK = {"dynamicPriceExpiry":1614296236, "orders":{"edges":[{"node":ORDER}] * 100}}
+RESPONSES = {
+    "getPrices": [{"id":"QnV5Y29pbnNQcmljZS0x", "cryptocurrency":"bitcoin", "sellPricePerCoin":"23865583.5", "minSell":"0.0002", "maxSell":"4.54256862", "expiresAt":1614295216}] * 6,
+    "getBalances": [{"id":"QWNjb3VudC0=", "cryptocurrency":"bitcoin", "confirmedBalance":"0.0"}] * 6,
+    "getOrders": BOOK,
+    "getMarketBook": BOOK,
+    "postLimitOrder": ORDER,
+    "postMarketOrder": ORDER,
+    "getEstimatedNetworkFee": {"estimatedFee":"0.00062", "total":"0.02062"},
+    "send": {"id":"T25jaGFpblRyYW5zZmVy", "cryptocurrency":"bitcoin", "status":"pending", "address":"vdADFaj7f89dfkadf=", "amount":"0.02", "fee":"0.00062", "transaction":{"hash":"a1b2c3", "id":"VHJhbnNhY3Rpb24"}},
+    "buy": {"id":"T3JkZXI", "cryptocurrency":"bitcoin", "status":"processing", "totalCoinAmount":"0.02", "side":"buy"},
+    "sell": {"id":"T3JkZXI", "cryptocurrency":"bitcoin", "status":"processing", "totalCoinAmount":"0.02", "side":"sell"},
+    "createDepositAccount": {"accountNumber":"0123456789", "accountName":"Chukwuemeka Ajah", "accountType":"deposit", "bankName":"Providus", "accountReference":"afWGFdfa823ladfadfja"},
+    "createAddress": {"cryptocurrency":"bitcoin", "address":"MTyrRGZKfo1jNJvfH3RWnQ5qjivLT2UyYn"},
+}
+
+
+def rate(function, iterations):
+    return iterations / timeit.timeit(function, number=iterations) / 1000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    backends = json_backend.available()
+    print("{:<28} {:<7}".format("call", "") + "".join("{:>10}".format(name) for name in ["form"] + backends) + "   (thousand ops/s)")
+    for name, query_dict in CALLS.items():
+        body = utilities._request_body(query_dict)
+        response = json_backend.dumps({"data":{query_dict["command"]: RESPONSES[query_dict["command"]]}})
+
+        encode = [rate(lambda: urlencode({"query": body["query"]}), iterations)]
+        decode = [None]
+        for backend in backends:
+            json_backend.use(backend)
+            encode.append(rate(lambda: json_backend.dumps(body), iterations))
+            decode.append(rate(lambda: json_backend.loads(response), iterations))
+
+        print("{:<28} {:<7}".format(name, "encode") + "".join("{:>10.1f}".format(value) for value in encode))
+        print("{:<28} {:<7}".format("", "decode") + "".join("{:>10}".format("-") if value is None else "{:>10.1f}".format(value) for value in decode))
+    json_backend.use(backends[0])
+
+
+if __name__ == "__main__":
+    main()
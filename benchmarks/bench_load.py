@@ -0,0 +1,67 @@
+"""Throughput and tail latency of the client against FakeServer, with no network.
+
+The fake API runs in its own process with log-normal latency and injected 429 and 503 responses,
+and a number of concurrent callers alternate between Prices.list, Balances.list and
+Orders.list_market_orders on a large market book.
+
+    PYTHONPATH=. python benchmarks/bench_load.py [--callers 16] [--calls 2000] [--latency 0.02]
+"""
+import argparse
+import collections
+import concurrent.futures
+import multiprocessing
+import time
+
+import buycoins_client as buycoins
+from buycoins_client.components import utilities
+from buycoins_client.testing import FakeServer, lognormal
+
+CALLS = [buycoins.Prices.list, buycoins.Balances.list, lambda: buycoins.Orders.list_market_orders()]
+
+
+def serve(options, ports):
+    server = FakeServer(market_book_size=options.market_book_size, latency=lognormal(options.latency), faults={429: 0.02, 503: 0.01}, seed=1).start()
+    ports.put(server.url)
+    while True:
+        time.sleep(3600)
+
+
+def percentile(timings, fraction):
+    return timings[min(int(len(timings) * fraction), len(timings) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=16)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02, help="median server latency in seconds")
+    parser.add_argument("--market-book-size", type=int, default=1000)
+    options = parser.parse_args()
+
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(options, ports), daemon=True)
+    server.start()
+    utilities.API_URL = ports.get()
+    buycoins.Auth.setup("public_key", "secret_key")
+    buycoins.set_transport(buycoins.Transport(pool_size=options.callers))
+
+    def call(number):
+        start = time.perf_counter()
+        response = CALLS[number % len(CALLS)]()
+        return time.perf_counter() - start, response["status"] if response["status"] == "success" else response["errors"][0]["reason"]
+
+    with concurrent.futures.ThreadPoolExecutor(options.callers) as executor:
+        start = time.perf_counter()
+        results = list(executor.map(call, range(options.calls)))
+        elapsed = time.perf_counter() - start
+    server.terminate()
+
+    timings = sorted(timing * 1000 for timing, _ in results)
+    print("{} calls from {} callers, median server latency {:.0f} ms, market book of {} orders".format(options.calls, options.callers, options.latency * 1000, options.market_book_size))
+    print("throughput {:8.1f} calls/s".format(options.calls / elapsed))
+    print("latency    p50 {:.1f} ms  p90 {:.1f} ms  p99 {:.1f} ms  max {:.1f} ms".format(percentile(timings, 0.5), percentile(timings, 0.9), percentile(timings, 0.99), timings[-1]))
+    print("outcomes   {}".format(dict(collections.Counter(outcome for _, outcome in results))))
+
+
+if __name__ == "__main__":
+    main()
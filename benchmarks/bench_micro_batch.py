@@ -0,0 +1,48 @@
+"""Requests sent and time taken by a burst of concurrent Balances.get and Transfers.fees calls, with and without a
+MicroBatcher on the transport.
+
+Runs against FakeServer with a constant latency, so the timings show the round trips saved.
+
+    PYTHONPATH=. python benchmarks/bench_micro_batch.py [--threads 32] [--latency 0.02] [--window 0.002]
+"""
+import argparse
+import concurrent.futures
+import time
+
+import buycoins_client as buycoins
+from buycoins_client.testing import Exchange, FakeServer
+
+CRYPTOCURRENCIES = ["bitcoin", "ethereum", "litecoin", "usd_coin", "naira_token"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.02, help="server latency in seconds")
+    parser.add_argument("--window", type=float, default=0.002, help="micro batching window in seconds")
+    options = parser.parse_args()
+
+    calls = []
+    for number in range(options.threads):
+        cryptocurrency = CRYPTOCURRENCIES[number % len(CRYPTOCURRENCIES)]
+        if number % 2:
+            calls.append(lambda cryptocurrency=cryptocurrency: buycoins.Balances.get(cryptocurrency))
+        else:
+            calls.append(lambda cryptocurrency=cryptocurrency, number=number: buycoins.Transfers.fees({"cryptocurrency": cryptocurrency if cryptocurrency != "naira_token" else "bitcoin", "amount": 0.01 * (number + 1)}))
+
+    buycoins.Auth.setup("public_key", "secret_key")
+    print("{} concurrent calls, server latency {:.0f} ms".format(options.threads, options.latency * 1000))
+    for name, micro_batcher in (("one request per call", None), ("MicroBatcher({:g})".format(options.window), buycoins.MicroBatcher(window=options.window))):
+        buycoins.set_transport(buycoins.Transport(pool_size=options.threads, micro_batcher=micro_batcher))
+        with FakeServer(Exchange(0), latency=options.latency) as server:
+            with concurrent.futures.ThreadPoolExecutor(options.threads) as executor:
+                start = time.perf_counter()
+                responses = list(executor.map(lambda call: call(), calls))
+                elapsed = time.perf_counter() - start
+            requests = sum(count for key, count in server.stats.items() if type(key) is int) # counted by status code
+        failures = sum(response["status"] != "success" for response in responses)
+        print("{:<28}{:>10.1f} ms{:>6} requests{:>6} failed".format(name, elapsed * 1000, requests, failures))
+
+
+if __name__ == "__main__":
+    main()
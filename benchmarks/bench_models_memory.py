@@ -0,0 +1,45 @@
+"""Memory kept by a decoded getMarketBook response: node dicts against Order models.
+
+The response is decoded from the same JSON body each time and the memory still allocated after the
+raw body is released is reported, so it includes the values of every field.
+
+    PYTHONPATH=. python benchmarks/bench_models_memory.py [orders]
+"""
+import json
+import sys
+import tracemalloc
+
+from buycoins_client.components import models
+
+
+def make_body(size):
+    edges = [{"node":{"id":"UG9zdE9yZGVyLT{:08d}".format(number), "cryptocurrency":"bitcoin", "coinAmount":"0.{:04d}".format(number % 10000), "side":"sell", "status":"active", "createdAt":1614291760 + number, "pricePerCoin":"{}.0".format(26000000 + number), "priceType":"static", "staticPrice":"{}00".format(26000000 + number), "dynamicExchangeRate":None}} for number in range(size)]
+    return json.dumps({"data":{"getMarketBook":{"dynamicPriceExpiry":1614296236, "orders":{"edges":edges}}}})
+
+
+def measure(body, as_models):
+    tracemalloc.start()
+    response = {"status":"success", "data":json.loads(body)["data"]}
+    if as_models:
+        models.convert(response, "getMarketBook")
+    kept = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return response, kept
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    body = make_body(size)
+    dicts, dict_bytes = measure(body, False)
+    del dicts
+    orders, model_bytes = measure(body, True)
+    print("{} orders".format(size))
+    print("node dicts    {:8.1f} MiB".format(dict_bytes / 2 ** 20))
+    print("Order models  {:8.1f} MiB ({:.0%} of the dicts)".format(model_bytes / 2 ** 20, model_bytes / dict_bytes))
+
+    first = orders["data"]["getMarketBook"]["orders"][0]
+    print("decoded on first access: coinAmount={!r} createdAt={!r}".format(first.coinAmount, first.createdAt))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Best bid/ask and top 10 levels of every cryptocurrency after each poll of the market book:
+re-scanning the response against OrderBook.update.
+
+Each poll changes a few orders of a book of N orders. The re-scan walks the edges/node dicts of the
+response, converts every price and sorts each side; OrderBook.update only re-indexes the orders
+that changed.
+
+    PYTHONPATH=. python benchmarks/bench_order_book.py [orders] [polls]
+"""
+import random
+import sys
+import time
+from decimal import Decimal
+
+from buycoins_client import OrderBook
+
+CRYPTOCURRENCIES = ["bitcoin", "ethereum", "litecoin"]
+
+
+def make_poll(orders):
+    return {"status":"success", "data":{"getMarketBook":{"orders":{"edges":[{"node":dict(order)} for order in orders.values()]}}}}
+
+
+def rescan(response):
+    levels = {}
+    for edge in response["data"]["getMarketBook"]["orders"]["edges"]:
+        node = edge["node"]
+        side = levels.setdefault((node["cryptocurrency"], node["side"]), {})
+        price = Decimal(node["pricePerCoin"])
+        side[price] = side.get(price, 0) + Decimal(node["coinAmount"])
+    for (cryptocurrency, side), prices in levels.items():
+        sorted(prices.items(), reverse=side == "buy")[:10]
+
+
+def query(book):
+    for cryptocurrency in CRYPTOCURRENCIES:
+        book.best_bid(cryptocurrency), book.best_ask(cryptocurrency)
+        book.depth(cryptocurrency, "buy", 10), book.depth(cryptocurrency, "sell", 10)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    polls = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    random.seed(1)
+    orders = {}
+    for number in range(size):
+        side = random.choice(["buy", "sell"])
+        price = random.randint(25000000, 26000000) if side == "buy" else random.randint(26000001, 27000000)
+        orders[str(number)] = {"id":str(number), "cryptocurrency":random.choice(CRYPTOCURRENCIES), "side":side, "pricePerCoin":"{}.0".format(price), "coinAmount":"0.{:04d}".format(random.randint(1, 9999))}
+
+    responses = []
+    for poll in range(polls):
+        for order_id in random.sample(sorted(orders), 20):
+            orders[order_id]["coinAmount"] = "0.{:04d}".format(random.randint(1, 9999))
+        responses.append(make_poll(orders))
+
+    start = time.perf_counter()
+    for response in responses:
+        rescan(response)
+    scanned = (time.perf_counter() - start) / polls
+
+    book = OrderBook()
+    book.update(responses[0])
+    start = time.perf_counter()
+    for response in responses:
+        book.update(response)
+        query(book)
+    updated = (time.perf_counter() - start) / polls
+
+    print("{} orders, 20 changed per poll".format(size))
+    print("re-scan          {:8.2f} ms/poll".format(scanned * 1000))
+    print("OrderBook.update {:8.2f} ms/poll".format(updated * 1000))
+    start = time.perf_counter()
+    for _ in range(10000):
+        book.best_bid("bitcoin"), book.best_ask("bitcoin"), book.spread("bitcoin")
+    print("best bid/ask/spread lookups {:.2f} us each".format((time.perf_counter() - start) / 10000 * 1e6))
+
+
+if __name__ == "__main__":
+    main()
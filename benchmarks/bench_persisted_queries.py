@@ -0,0 +1,42 @@
+"""Bytes sent to poll the market book, open orders and a batch of prices and balances with full documents, against
+persisted queries that send the sha256 hash of each document instead.
+
+Runs against FakeServer, which counts the bytes of every request body it receives.
+
+    PYTHONPATH=. python benchmarks/bench_persisted_queries.py [--polls 100]
+"""
+import argparse
+import time
+
+import buycoins_client as buycoins
+from buycoins_client.components import utilities
+from buycoins_client.testing import FakeServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=100)
+    options = parser.parse_args()
+
+    buycoins.Auth.setup("public_key", "secret_key")
+    print("{} polls of getMarketBook, getOrders(open) and a batch of getPrices and getBalances".format(options.polls))
+    for name, persisted_queries in (("full documents", False), ("persisted queries", True)):
+        utilities.PERSISTED_QUERIES = persisted_queries
+        with FakeServer(market_book_size=10) as server:
+            start = time.perf_counter()
+            for _ in range(options.polls):
+                buycoins.Orders.list_market_orders()
+                buycoins.Orders.list_my_orders("open")
+                batch = buycoins.Batch()
+                batch.add(buycoins.Prices.list)
+                batch.add(buycoins.Balances.get, "bitcoin")
+                batch.add(buycoins.Balances.get, "naira_token")
+                batch.send()
+            elapsed = time.perf_counter() - start
+        requests = sum(count for key, count in server.stats.items() if type(key) is int)
+        print("{:<20}{:>10} bytes sent{:>8.0f} bytes per request{:>6} requests{:>10.1f} ms".format(name, server.stats["bytes_received"], server.stats["bytes_received"] / requests, requests, elapsed * 1000))
+    utilities.PERSISTED_QUERIES = False
+
+
+if __name__ == "__main__":
+    main()
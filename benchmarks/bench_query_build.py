@@ -0,0 +1,50 @@
+"""Cost of building the request for every component call, before and after document compilation.
+
+"before" rebuilds the whole document with string formatting and inlined argument values on each
+call, as create_request_body still does; "after" is the cached _request_body the
+components send.
+
+    PYTHONPATH=. python benchmarks/bench_query_build.py [iterations]
+"""
+import sys
+import timeit
+
+from buycoins_client.components import accounts, balances, orders, prices, transfers, utilities
+
+
+def legacy_create_request_body(fields):
+    query = "{operation} {{ {command}".format(operation=fields["operation"], command=fields["command"])
+    if fields.get("args", None) is not None:
+        query += "(" + utilities.parse_args(fields["args"]) + ")"
+    query += "{{ {fields} }}".format(fields=utilities.parse_fields(fields["fields"], []))
+    return {"query": query + "}"}
+
+
+CALLS = {
+    "Prices.list": prices._list_query([]),
+    "Balances.get": balances._get_query("bitcoin", []),
+    "Balances.list": balances._list_query([]),
+    "Orders.list_my_orders": orders._list_my_orders_query("open", []),
+    "Orders.list_market_orders": orders._list_market_orders_query([]),
+    "Orders.post_limit_order": orders._post_limit_order_query({"orderSide":"buy", "priceType":"static", "cryptocurrency":"bitcoin", "coinAmount":0.01, "staticPrice":24000000.0}, []),
+    "Orders.post_market_order": orders._post_market_order_query({"orderSide":"buy", "cryptocurrency":"bitcoin", "coinAmount":0.01}, []),
+    "Transfers.fees": transfers._fees_query({"cryptocurrency":"bitcoin", "amount":0.02}, []),
+    "Transfers.send": transfers._send_query({"cryptocurrency":"bitcoin", "amount":0.02, "address":"vdADFaj7f89dfkadf="}, []),
+    "Transfers.buy": transfers._buy_query({"cryptocurrency":"bitcoin", "coin_amount":0.02, "price":"QnV5Y29pbnNQcmljZS0x"}, []),
+    "Transfers.sell": transfers._sell_query({"cryptocurrency":"bitcoin", "coin_amount":0.02, "price":"QnV5Y29pbnNQcmljZS0x"}, []),
+    "Accounts.create": accounts._create_query("Chukwuemeka Ajah", []),
+    "Accounts.create_address": accounts._create_address_query("bitcoin", []),
+}
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print("{:<28} {:>12} {:>12} {:>9}".format("call", "before (us)", "after (us)", "speedup"))
+    for name, query_dict in CALLS.items():
+        before = timeit.timeit(lambda: legacy_create_request_body(query_dict), number=iterations) / iterations * 1e6
+        after = timeit.timeit(lambda: utilities._request_body(query_dict), number=iterations) / iterations * 1e6
+        print("{:<28} {:>12.2f} {:>12.2f} {:>8.1f}x".format(name, before, after, before / after))
+
+
+if __name__ == "__main__":
+    main()
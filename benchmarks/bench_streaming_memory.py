@@ -0,0 +1,89 @@
+"""Peak memory of decoding a synthetic getMarketBook response, buffered versus streamed.
+
+"buffered" reads the whole body and decodes it with parse_response, as every call did before
+streaming; "streamed" decodes it with parse_streaming_response and counts the order nodes
+without keeping them. Peak memory is measured with tracemalloc.
+
+    PYTHONPATH=. python benchmarks/bench_streaming_memory.py [orders]
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+from buycoins_client.components import utilities
+
+CHUNK_SIZE = 65536
+
+
+def book_chunks(orders):
+    """Yield the body of a market book with the given number of orders in chunks, without holding it all."""
+    pending = ['{"data":{"getMarketBook":{"dynamicPriceExpiry":1614296236,"orders":{"edges":[']
+    size = len(pending[0])
+    for index in range(orders):
+        node = {"id":"UG9zdE9yZGVyLT{:08d}".format(index), "cryptocurrency":"bitcoin", "coinAmount":"0.0005", "side":"sell" if index % 2 else "buy", "status":"active", "createdAt":1614291760, "pricePerCoin":str(26599999.0 - index), "priceType":"static", "staticPrice":"2659999900", "dynamicExchangeRate":None}
+        text = ("," if index else "") + json.dumps({"node":node})
+        pending.append(text)
+        size += len(text)
+        if size >= CHUNK_SIZE:
+            yield "".join(pending).encode("utf-8")
+            pending, size = [], 0
+    pending.append("]}}}}")
+    yield "".join(pending).encode("utf-8")
+
+
+class BufferedResponse:
+    """Reads the whole body before decoding it, like requests.Response.json."""
+
+    def __init__(self, orders):
+        self.status_code = 200
+        self.content = b"".join(book_chunks(orders))
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class StreamedResponse:
+    def __init__(self, orders):
+        self.status_code = 200
+        self.orders = orders
+
+    def iter_content(self, chunk_size):
+        return book_chunks(self.orders)
+
+    def close(self):
+        pass
+
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, peak / 2 ** 20, elapsed
+
+
+def buffered(orders):
+    response = utilities.parse_response(BufferedResponse(orders))
+    return len(response["data"]["getMarketBook"]["orders"]["edges"])
+
+
+def streamed(orders):
+    count = [0]
+    def on_node(node):
+        count[0] += 1
+    utilities.parse_streaming_response(StreamedResponse(orders), on_node)
+    return count[0]
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, run in (("buffered", buffered), ("streamed", streamed)):
+        count, peak, elapsed = measure(lambda: run(orders))
+        print("{:<9} {:>7} orders  peak {:8.2f} MiB  {:6.2f} s".format(name, count, peak, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Where the time of a call goes, for every public component function, against a local stub server.
+
+For each call this reports the time spent in is_valid_fields, _request_body, the network round
+trip (utilities.post) and parse_response, then the end-to-end throughput with 1, 8 and 64 concurrent
+callers sharing one pooled transport. Results are printed and written as JSON to --output so runs of
+different releases can be compared.
+
+    PYTHONPATH=. python benchmarks/bench_suite.py [--calls 512] [--iterations 2000] [--output bench_results.json]
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import multiprocessing
+import platform
+import re
+import statistics
+import time
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import buycoins_client as buycoins
+from buycoins_client.components import json_backend, orders, utilities
+
+from bench_json import ORDER, RESPONSES
+
+CONCURRENCY = [1, 8, 64]
+ROOT_FIELD = re.compile(r"^(?:query|mutation)[^{]*\{\s*(\w+)")
+CONNECTION = {"dynamicPriceExpiry":1614296236, "orders":{"pageInfo":{"hasNextPage":False, "endCursor":"MTAw"}, "edges":[{"cursor":"MTAw", "node":ORDER}] * 100}}
+BODIES = {command: json.dumps({"data":{command: CONNECTION if command in ("getOrders", "getMarketBook") else response}}).encode() for command, response in RESPONSES.items()}
+
+LIMIT_ORDER = {"orderSide":"buy", "priceType":"static", "cryptocurrency":"bitcoin", "coinAmount":0.01, "staticPrice":24000000.0}
+MARKET_ORDER = {"orderSide":"buy", "cryptocurrency":"bitcoin", "coinAmount":0.01}
+SEND = {"cryptocurrency":"bitcoin", "amount":0.02, "address":"vdADFaj7f89dfkadf="}
+TRADE = {"cryptocurrency":"bitcoin", "coin_amount":0.02, "price":"QnV5Y29pbnNQcmljZS0x"}
+
+# name -> (the public call, the query dict it sends)
+CALLS = {
+    "Prices.list": (lambda: buycoins.Prices.list(), lambda: utilities.capture(buycoins.Prices.list)),
+    "Balances.get": (lambda: buycoins.Balances.get("bitcoin"), lambda: utilities.capture(buycoins.Balances.get, "bitcoin")),
+    "Balances.list": (lambda: buycoins.Balances.list(), lambda: utilities.capture(buycoins.Balances.list)),
+    "Orders.list_my_orders": (lambda: buycoins.Orders.list_my_orders("open"), lambda: utilities.capture(buycoins.Orders.list_my_orders, "open")),
+    "Orders.list_market_orders": (lambda: buycoins.Orders.list_market_orders(), lambda: utilities.capture(buycoins.Orders.list_market_orders)),
+    "Orders.post_limit_order": (lambda: buycoins.Orders.post_limit_order(LIMIT_ORDER), lambda: utilities.capture(buycoins.Orders.post_limit_order, LIMIT_ORDER)),
+    "Orders.post_market_order": (lambda: buycoins.Orders.post_market_order(MARKET_ORDER), lambda: utilities.capture(buycoins.Orders.post_market_order, MARKET_ORDER)),
+    "Orders.iter_my_orders": (lambda: list(buycoins.Orders.iter_my_orders("open")), lambda: orders._iter_my_orders_query("open", [], 50, None)),
+    "Orders.iter_market_orders": (lambda: list(buycoins.Orders.iter_market_orders()), lambda: orders._iter_market_orders_query([], 50, None)),
+    "Orders.stream_my_orders": (lambda: list(buycoins.Orders.stream_my_orders("open")), lambda: orders._list_my_orders_query("open", [])),
+    "Orders.stream_market_orders": (lambda: list(buycoins.Orders.stream_market_orders()), lambda: orders._list_market_orders_query([])),
+    "Transfers.fees": (lambda: buycoins.Transfers.fees({"cryptocurrency":"bitcoin", "amount":0.02}), lambda: utilities.capture(buycoins.Transfers.fees, {"cryptocurrency":"bitcoin", "amount":0.02})),
+    "Transfers.send": (lambda: buycoins.Transfers.send(SEND), lambda: utilities.capture(buycoins.Transfers.send, SEND)),
+    "Transfers.buy": (lambda: buycoins.Transfers.buy(TRADE), lambda: utilities.capture(buycoins.Transfers.buy, TRADE)),
+    "Transfers.sell": (lambda: buycoins.Transfers.sell(TRADE), lambda: utilities.capture(buycoins.Transfers.sell, TRADE)),
+    "Accounts.create": (lambda: buycoins.Accounts.create("Chukwuemeka Ajah"), lambda: utilities.capture(buycoins.Accounts.create, "Chukwuemeka Ajah")),
+    "Accounts.create_address": (lambda: buycoins.Accounts.create_address("bitcoin"), lambda: utilities.capture(buycoins.Accounts.create_address, "bitcoin")),
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every document with a canned response for its root field."""
+
+    protocol_version = "HTTP/1.1" # keep connections alive like the real API
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        query = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))["query"]
+        body = BODIES[ROOT_FIELD.match(query).group(1)]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128 # accept the connections of every concurrent caller at once
+
+
+def serve(ports):
+    """Run the stub server in its own process, so it does not compete with the callers for the GIL."""
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+def per_call_us(function, iterations):
+    return timeit.timeit(function, number=iterations) / iterations * 1e6
+
+def phases(query, iterations):
+    query_dict = query()
+    body = utilities._request_body(query_dict)
+    network = []
+    for _ in range(max(iterations // 20, 20)):
+        start = time.perf_counter()
+        response = utilities.post(body)
+        network.append((time.perf_counter() - start) * 1e6)
+    return {
+        "is_valid_fields": per_call_us(lambda: utilities.is_valid_fields(query_dict["fields"]), iterations),
+        "_request_body": per_call_us(lambda: utilities._request_body(query_dict), iterations),
+        "network": statistics.median(network),
+        "parse_response": per_call_us(lambda: utilities.parse_response(response), iterations),
+    }
+
+def throughput(call, calls, concurrency):
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(lambda _: call(), range(concurrency))) # open a connection per caller
+        start = time.perf_counter()
+        list(executor.map(lambda _: call(), range(calls)))
+        return calls / (time.perf_counter() - start)
+
+def version():
+    try:
+        from importlib.metadata import version
+        return version("buycoins_client")
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=512, help="calls per concurrency level")
+    parser.add_argument("--iterations", type=int, default=2000, help="iterations of the local phases")
+    parser.add_argument("--output", default="bench_results.json", help="the JSON results file")
+    options = parser.parse_args()
+
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(ports,), daemon=True)
+    server.start()
+    utilities.API_URL = "http://127.0.0.1:{}/api/graphql".format(ports.get())
+    buycoins.Auth.setup("public_key", "secret_key")
+    buycoins.set_transport(buycoins.Transport(pool_size=max(CONCURRENCY)))
+
+    results = {}
+    print("{:<28}".format("call") + "".join("{:>21}".format(name) for name in ["is_valid_fields (us)", "request_body (us)", "network (us)", "parse_response (us)"]) + "".join("{:>14}".format("{} x calls/s".format(concurrency)) for concurrency in CONCURRENCY))
+    for name, (call, query) in CALLS.items():
+        call() # warm up the document cache and the connection
+        result = {
+            "phases_us": phases(query, options.iterations),
+            "calls_per_second": {str(concurrency): throughput(call, options.calls, concurrency) for concurrency in CONCURRENCY},
+        }
+        results[name] = result
+        print("{:<28}".format(name) + "".join("{:>21.2f}".format(value) for value in result["phases_us"].values()) + "".join("{:>14.0f}".format(value) for value in result["calls_per_second"].values()))
+
+    server.terminate()
+    report = {
+        "version": version(),
+        "python": platform.python_version(),
+        "json_backend": json_backend.NAME,
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "calls": results,
+    }
+    with open(options.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print("results written to {}".format(options.output))
+
+
+if __name__ == "__main__":
+    main()
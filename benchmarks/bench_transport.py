@@ -0,0 +1,79 @@
+"""Per-call latency of component calls with and without the pooled transport.
+
+Runs Prices.list against a local stub server, first through a fresh requests.post per call
+(the behaviour before the shared transport) and then through a pooled Transport.
+
+    PYTHONPATH=. python benchmarks/bench_transport.py [calls]
+"""
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import buycoins_client as buycoins
+from buycoins_client.components import utilities
+
+
+BODY = json.dumps({"data":{"getPrices":[{"id":"QnV5Y29pbnNQcmljZS0x", "cryptocurrency":"bitcoin", "sellPricePerCoin":"17827839.315", "minSell":"0.001", "maxSell":"0.35190587", "expiresAt":1612391202}]}}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep connections alive like the real API
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class UnpooledTransport(buycoins.Transport):
+    """Opens a new connection for every call, as the module-level requests.post does."""
+
+    def post(self, url, **kwargs):
+        return requests.post(url, **kwargs)
+
+
+def measure(transport, calls):
+    buycoins.set_transport(transport)
+    buycoins.Prices.list() # warm up
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        buycoins.Prices.list()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p99_ms": timings[int(len(timings) * 0.99) - 1],
+    }
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    utilities.API_URL = "http://127.0.0.1:{}/api/graphql".format(server.server_address[1])
+    buycoins.Auth.setup("public_key", "secret_key")
+
+    for name, transport in (("requests.post", UnpooledTransport()), ("pooled", buycoins.Transport())):
+        result = measure(transport, calls)
+        print("{:<14} mean {mean_ms:7.3f} ms  p50 {p50_ms:7.3f} ms  p99 {p99_ms:7.3f} ms".format(name, **result))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
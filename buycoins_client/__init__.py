@@ -4,4 +4,20 @@ from .components import accounts as Accounts
 from .components import prices as Prices
 from .components import balances as Balances
 from .components import transfers as Transfers
-
+from .components.transport import Transport
+from .components.utilities import set_transport
+from .components.batch import Batch
+from .components.order_book import OrderBook
+from .components import models
+from .components import hooks as Hooks
+from .components.metrics import Metrics
+from .components.retry import RetryPolicy
+from .components.rate_limit import RateLimiter
+from .components.client import BuycoinsClient
+from .components.price_watcher import PriceWatcher
+from .components.quotes import QuoteCache, set_quote_cache
+from .components.balance_cache import BalanceCache, set_balance_cache
+from .components.fee_estimator import FeeEstimator
+from .components.single_flight import SingleFlight
+from .components.micro_batch import MicroBatcher
+from .components.schema import Schema, set_schema, introspect
\ No newline at end of file
@@ -0,0 +1,10 @@
+from . import orders as Orders
+from ..components import auth as Auth
+from . import accounts as Accounts
+from . import prices as Prices
+from . import balances as Balances
+from . import transfers as Transfers
+from .transport import AsyncTransport
+from .utilities import set_transport
+from .batch import Batch
+from .price_watcher import AsyncPriceWatcher
\ No newline at end of file
@@ -0,0 +1,17 @@
+from ..components import accounts
+from . import utilities
+
+
+async def create(account_name:str, fields:list=[], as_models:bool=False):
+    """Awaitable version of buycoins_client.Accounts.create.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    return await utilities.execute(accounts._create_query, account_name, fields, as_models=as_models)
+
+async def create_address(crypto_currency:str, fields:list=[], as_models:bool=False):
+    """Awaitable version of buycoins_client.Accounts.create_address.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    return await utilities.execute(accounts._create_address_query, crypto_currency, fields, as_models=as_models)
@@ -0,0 +1,25 @@
+from ..components import balance_cache
+from ..components import balances
+from . import utilities
+
+
+async def get(cryptocurrency:str, fields:list=[], as_models:bool=False):
+    """Awaitable version of buycoins_client.Balances.get.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop. It is answered from the same BalanceCache.
+    """
+    cache = balance_cache.get_balance_cache()
+    if cache is None or len(fields) > 0 or utilities._capturing.get():
+        return await utilities.execute(balances._get_query, cryptocurrency, fields, as_models=as_models)
+    balances._get_query(cryptocurrency, fields) # invalid arguments raise even when the balance is cached
+    return await cache.fetch_async(cryptocurrency, lambda: utilities.execute(balances._get_query, cryptocurrency, fields), as_models)
+
+async def list(fields:list = [], as_models:bool=False):
+    """Awaitable version of buycoins_client.Balances.list.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop. It is answered from the same BalanceCache.
+    """
+    cache = balance_cache.get_balance_cache()
+    if cache is None or len(fields) > 0 or utilities._capturing.get():
+        return await utilities.execute(balances._list_query, fields, as_models=as_models)
+    return await cache.fetch_async(None, lambda: utilities.execute(balances._list_query, fields), as_models)
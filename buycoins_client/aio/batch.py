@@ -0,0 +1,30 @@
+from ..components import batch
+from ..components.hooks import HOOKS
+from . import utilities
+
+
+class Batch(batch.Batch):
+    """Asyncio version of buycoins_client.Batch.
+
+    Calls are added with the same add method, from either the blocking or the aio component modules, and sent with an awaitable send.
+    """
+
+    async def send(self):
+        """Awaitable version of buycoins_client.Batch.send."""
+        results = self._results()
+        if HOOKS:
+            for group in self._groups(results):
+                trace, data = self._start_trace(group)
+                try:
+                    response = await utilities.send(data, operation=group[0][1]["operation"], commands=[query_dict["command"] for _, query_dict in group])
+                except Exception as e:
+                    trace.end(error=e)
+                    raise
+                self._end_trace(trace, results, group, response)
+            self._changed(results)
+            return results
+
+        for body, group in self._documents(results):
+            self._split(results, group, await utilities.post(body, operation=group[0][1]["operation"], commands=[query_dict["command"] for _, query_dict in group]))
+        self._changed(results)
+        return results
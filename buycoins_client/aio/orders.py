@@ -0,0 +1,115 @@
+import asyncio
+
+from ..components import balance_cache
+from ..components import orders
+from . import utilities
+from .batch import Batch
+
+
+async def list_my_orders(status:str="open", fields:list=[], as_models:bool=False):
+    """Awaitable version of buycoins_client.Orders.list_my_orders.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    return await utilities.execute(orders._list_my_orders_query, status, fields, as_models=as_models)
+
+async def list_market_orders(fields:list=[], as_models:bool=False):
+    """Awaitable version of buycoins_client.Orders.list_market_orders.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    return await utilities.execute(orders._list_market_orders_query, fields, as_models=as_models)
+
+async def post_limit_order(args:dict, fields:list=[], as_models:bool=False):
+    """Awaitable version of buycoins_client.Orders.post_limit_order.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    response = await utilities.execute(orders._post_limit_order_query, args, fields, as_models=as_models)
+    if not utilities._capturing.get():
+        balance_cache.changed("postLimitOrder", args, response)
+    return response
+
+async def post_market_order(args:dict, fields:list=[], as_models:bool=False):
+    """Awaitable version of buycoins_client.Orders.post_market_order.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    response = await utilities.execute(orders._post_market_order_query, args, fields, as_models=as_models)
+    if not utilities._capturing.get():
+        balance_cache.changed("postMarketOrder", args, response)
+    return response
+
+async def post_limit_orders(orders_args:list, fields:list=[], concurrency:int=None, as_models:bool=False):
+    """Awaitable version of buycoins_client.Orders.post_limit_orders.
+
+    Takes the same arguments, raises the same exceptions and returns the same list of response dicts. With concurrency, up to that many requests are in flight at once on the event loop.
+    """
+    return await _post_bulk(orders._bulk_query_dicts(orders._limit_order_query, orders_args, fields, as_models), concurrency)
+
+async def post_market_orders(orders_args:list, fields:list=[], concurrency:int=None, as_models:bool=False):
+    """Awaitable version of buycoins_client.Orders.post_market_orders.
+
+    Takes the same arguments, raises the same exceptions and returns the same list of response dicts.
+    """
+    return await _post_bulk(orders._bulk_query_dicts(orders._market_order_query, orders_args, fields, as_models), concurrency)
+
+async def _post_bulk(query_dicts, concurrency):
+    orders._check_concurrency(concurrency)
+    utilities.check_auth() # raised once, not as the failure of every order
+    if concurrency is None:
+        batch = Batch()
+        for query_dict in query_dicts:
+            batch._add_query(query_dict)
+        return await batch.send()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async def post_one(query_dict):
+        async with semaphore:
+            try:
+                response = await utilities.execute(dict, query_dict) # copies the query dict, which is already built
+            except Exception as e:
+                return orders._exception_response(e)
+            balance_cache.changed(query_dict["command"], query_dict["args"], response)
+            return response
+    return await asyncio.gather(*[post_one(query_dict) for query_dict in query_dicts])
+
+def iter_my_orders(status:str="open", node_fields:list=[], page_size:int=50, prefetch:bool=True):
+    """Asynchronous generator version of buycoins_client.Orders.iter_my_orders.
+
+    Takes the same arguments and yields the same order node dicts; use it with `async for`.
+    """
+    orders._iter_my_orders_query(status, node_fields, page_size, None) # validate before the first page is requested
+    return _iter_nodes(orders._iter_my_orders_query, "getOrders", prefetch, status, node_fields, page_size)
+
+def iter_market_orders(node_fields:list=[], page_size:int=50, prefetch:bool=True):
+    """Asynchronous generator version of buycoins_client.Orders.iter_market_orders.
+
+    Takes the same arguments and yields the same order node dicts; use it with `async for`.
+    """
+    orders._iter_market_orders_query(node_fields, page_size, None) # validate before the first page is requested
+    return _iter_nodes(orders._iter_market_orders_query, "getMarketBook", prefetch, node_fields, page_size)
+
+async def _iter_nodes(build, command, prefetch, *args):
+    async def fetch(after):
+        return orders._get_connection(await utilities.execute(build, *(args + (after,))), command)
+
+    next_page = None
+    try:
+        page = await fetch(None)
+        while True:
+            page_info = page["pageInfo"]
+            if page_info["hasNextPage"] and prefetch:
+                next_page = asyncio.ensure_future(fetch(page_info["endCursor"]))
+
+            for edge in page["edges"]:
+                yield edge["node"]
+
+            if not page_info["hasNextPage"]:
+                return
+            page = None # let the consumed page be freed while waiting for the next one
+            page = await next_page if prefetch else await fetch(page_info["endCursor"])
+            next_page = None
+    finally:
+        if next_page is not None and not next_page.done():
+            next_page.cancel()
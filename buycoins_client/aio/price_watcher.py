@@ -0,0 +1,95 @@
+import asyncio
+import inspect
+import warnings
+
+from ..components import price_watcher
+from ..components.price_watcher import WATCHED_FIELDS
+from . import prices
+
+
+class AsyncPriceWatcher(price_watcher.PriceWatcher):
+    """Asyncio version of buycoins_client.PriceWatcher.
+
+    Polls on a task of the running event loop instead of a thread, and refresh, stop and the `async with` block are awaitable. Subscribers can be plain functions or coroutine functions; coroutines are run as tasks so a slow subscriber does not delay the others.
+
+    Example:
+        async with buycoins.aio.AsyncPriceWatcher(interval=2) as watcher:
+            watcher.subscribe(on_change, ["bitcoin"])
+            ...
+    """
+
+    def __init__(self, interval:float=5.0, fields:list=WATCHED_FIELDS, client=None):
+        super().__init__(interval, fields, client)
+        self._future = None
+        self._task = None
+
+    async def refresh(self):
+        """Awaitable version of buycoins_client.PriceWatcher.refresh."""
+        if self._future is not None: # a poll is already in flight; share its result
+            return await asyncio.shield(self._future)
+
+        future = self._future = asyncio.get_running_loop().create_future()
+        try:
+            changes = self._apply(await self._fetch())
+            future.set_result(changes)
+        except asyncio.CancelledError:
+            future.cancel() # the waiting callers are cancelled with the poll
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception() # retrieved here, so an unawaited future does not log it again
+            raise
+        finally:
+            self._future = None
+        self._notify(changes)
+        return changes
+
+    def start(self):
+        """Poll every interval seconds on a task of the running event loop until stop is awaited, and return the watcher."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def stop(self):
+        """Stop polling and wait for the polling task to finish."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self):
+        return self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.last_error = e
+                warnings.warn("AsyncPriceWatcher could not poll the prices: {}".format(e), RuntimeWarning)
+            await asyncio.sleep(self.interval)
+
+    async def _fetch(self):
+        response = await (self.client.aio.Prices if self.client is not None else prices).list(self._query_fields)
+        return price_watcher._price_nodes(response)
+
+    def _call(self, subscriber, changes):
+        callback, cryptocurrencies = subscriber
+        if not inspect.iscoroutinefunction(callback):
+            return super()._call(subscriber, changes)
+
+        if cryptocurrencies is not None:
+            changes = {cryptocurrency: change for cryptocurrency, change in changes.items() if cryptocurrency in cryptocurrencies}
+        if changes:
+            asyncio.ensure_future(callback(changes)).add_done_callback(lambda task: _warn(callback, task))
+
+
+def _warn(callback, task):
+    if not task.cancelled() and task.exception() is not None:
+        warnings.warn("AsyncPriceWatcher subscriber {callback!r} raised {error!r}".format(callback=callback, error=task.exception()), RuntimeWarning)
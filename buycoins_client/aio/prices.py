@@ -0,0 +1,10 @@
+from ..components import prices
+from . import utilities
+
+
+async def list(fields:list = [], as_models:bool=False):
+    """Awaitable version of buycoins_client.Prices.list.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    return await utilities.execute(prices._list_query, fields, as_models=as_models)
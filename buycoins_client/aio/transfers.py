@@ -0,0 +1,42 @@
+from ..components import balance_cache
+from ..components import quotes
+from ..components import transfers
+from . import utilities
+
+
+async def fees(args:dict, fields:list=[]):
+    """Awaitable version of buycoins_client.Transfers.fees.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    return await utilities.execute(transfers._fees_query, args, fields)
+
+async def send(args:dict, fields:list=[], as_models:bool=False):
+    """Awaitable version of buycoins_client.Transfers.send.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    response = await utilities.execute(transfers._send_query, args, fields, as_models=as_models)
+    if not utilities._capturing.get():
+        balance_cache.changed("send", args, response)
+    return response
+
+async def buy(args:dict, fields:list=[], as_models:bool=False):
+    """Awaitable version of buycoins_client.Transfers.buy.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    priced, response = await quotes.trade_async(lambda priced: utilities.execute(transfers._buy_query, priced, fields, as_models=as_models), args)
+    if not utilities._capturing.get():
+        balance_cache.changed("buy", priced, response)
+    return response
+
+async def sell(args:dict, fields:list=[], as_models:bool=False):
+    """Awaitable version of buycoins_client.Transfers.sell.
+
+    Takes the same arguments, raises the same exceptions and returns the same response dict, without blocking the event loop.
+    """
+    priced, response = await quotes.trade_async(lambda priced: utilities.execute(transfers._sell_query, priced, fields, as_models=as_models), args)
+    if not utilities._capturing.get():
+        balance_cache.changed("sell", priced, response)
+    return response
@@ -0,0 +1,103 @@
+import asyncio
+
+try:
+    import aiohttp
+except ImportError: # aiohttp is only needed by the asyncio client
+    aiohttp = None
+
+from ..components import json_backend
+from ..components.auth import BasicAuth
+from ..components.micro_batch import MicroBatcher
+from ..components.rate_limit import RateLimiter
+from ..components.retry import RetryPolicy
+from ..components.single_flight import SingleFlight
+
+
+class Response:
+    """The status code, headers and body of a finished aiohttp response, shaped like the requests.Response fields parse_response reads."""
+
+    def __init__(self, status_code:int, content:bytes, headers:dict=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if headers is not None else {}
+
+    def json(self):
+        return json_backend.loads(self.content)
+
+
+class AsyncTransport:
+    """A non-blocking keep-alive HTTP transport shared by every asyncio component call.
+
+    Wraps an aiohttp.ClientSession whose connector keeps connections to the API host open, so hundreds of concurrent calls on one event loop share a bounded pool of connections.
+
+    Args:
+        pool_size (int):
+            The maximum number of simultaneous connections to the API host. Calls beyond that wait for a free connection. Defaults to 100.
+
+        timeout (float):
+            The number of seconds to wait for the API before giving up. Defaults to None (wait forever).
+
+        retry (RetryPolicy):
+            When and how often failed requests are sent again. Defaults to None (never), see buycoins_client.RetryPolicy.
+
+        rate_limiter (RateLimiter):
+            Paces the requests sent through the transport. Defaults to None (no limit), see buycoins_client.RateLimiter.
+
+        single_flight (SingleFlight):
+            Lets identical queries in flight at the same time share one request. Defaults to None (every call sends its own), see buycoins_client.SingleFlight.
+
+        micro_batcher (MicroBatcher):
+            Merges the queries made within a short window into one document. Defaults to None (every call sends its own), see buycoins_client.MicroBatcher.
+
+    A session belongs to the event loop it was created on; a transport used from a new loop (e.g. a second asyncio.run call) opens a new session.
+    """
+
+    def __init__(self, pool_size:int=100, timeout:float=None, retry:RetryPolicy=None, rate_limiter:RateLimiter=None, single_flight:SingleFlight=None, micro_batcher:MicroBatcher=None):
+        if aiohttp is None:
+            raise Exception("The asyncio client requires aiohttp. Install it with: pip install buycoins_client[aio]")
+
+        if type(pool_size) is not int or pool_size <= 0:
+            raise Exception("pool_size must be an integer greater than 0.")
+        if retry is not None and not isinstance(retry, RetryPolicy):
+            raise Exception("retry must be an instance of buycoins_client.RetryPolicy")
+        if rate_limiter is not None and not isinstance(rate_limiter, RateLimiter):
+            raise Exception("rate_limiter must be an instance of buycoins_client.RateLimiter")
+        if single_flight is not None and not isinstance(single_flight, SingleFlight):
+            raise Exception("single_flight must be an instance of buycoins_client.SingleFlight")
+        if micro_batcher is not None and not isinstance(micro_batcher, MicroBatcher):
+            raise Exception("micro_batcher must be an instance of buycoins_client.MicroBatcher")
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.single_flight = single_flight
+        self.micro_batcher = micro_batcher
+        self._session = None
+        self._loop = None
+
+    @property
+    def session(self):
+        """The aiohttp.ClientSession bound to the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._loop = loop
+        return self._session
+
+    async def post(self, url:str, auth=None, **kwargs):
+        """Send a POST request over a pooled connection and return a Response once the body has been read. auth is a BasicAuth or a (username, password) tuple."""
+        if auth is not None:
+            if not isinstance(auth, BasicAuth):
+                auth = BasicAuth(*auth)
+            kwargs["headers"] = dict(kwargs.get("headers") or {}, Authorization=auth.header)
+
+        async with self.session.post(url, **kwargs) as response:
+            return Response(response.status, await response.read(), response.headers)
+
+    async def close(self):
+        """Close every pooled connection. The transport reconnects on the next call."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
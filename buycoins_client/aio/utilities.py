@@ -0,0 +1,142 @@
+from ..components import hooks
+from ..components import utilities
+from ..components.hooks import HOOKS
+from .transport import AsyncTransport
+
+TRANSPORT = None
+_capturing = utilities._capturing # shared with the blocking components, whose Batch captures aio calls too
+check_auth = utilities.check_auth
+
+
+def get_transport():
+    """Return the transport shared by every asyncio component, creating a default AsyncTransport on first use.
+
+    Returns:
+        An AsyncTransport instance
+    """
+    global TRANSPORT
+    if TRANSPORT is None:
+        TRANSPORT = AsyncTransport()
+    return TRANSPORT
+
+def _micro_batcher(query_dict):
+    """Return the MicroBatcher of the asyncio transport a query dict is sent through, or None to send it on its own."""
+    if query_dict["operation"] != "query":
+        return None
+    client = utilities._client.get()
+    return ((client.aio_transport if client is not None else None) or get_transport()).micro_batcher
+
+def set_transport(transport):
+    """Replace the transport shared by every asyncio component, e.g. to change the connection pool size.
+
+    Args:
+        transport (AsyncTransport):
+            The transport every subsequent asyncio API call should be sent through.
+
+    Raises:
+        Exception: Only raised if transport is not an AsyncTransport instance.
+    """
+    global TRANSPORT
+    if not isinstance(transport, AsyncTransport):
+        raise Exception("transport must be an instance of buycoins_client.aio.AsyncTransport")
+
+    TRANSPORT = transport
+
+async def execute(build, *args, as_models:bool=False):
+    """Awaitable version of buycoins_client.components.utilities.execute.
+
+    Builds the query with the same component query builder and parses the response with the same parse_response, but sends the request without blocking the event loop.
+
+    Args:
+        build (function):
+            The component function that validates its arguments and returns the query dict, e.g prices._list_query
+
+        *args:
+            The arguments passed on to build
+
+    Returns:
+        The parsed response dict as returned by parse_response
+
+    Raises:
+        Exception: Raised if build rejects its arguments or the authentication credentials have not been set up.
+    """
+    if HOOKS: # only time the request when someone is listening
+        return await _execute_traced(build, args, as_models)
+
+    query_dict = build(*args)
+    if as_models:
+        query_dict["as_models"] = True
+    if utilities._capturing.get(): # a batch is collecting the query instead of sending it
+        return query_dict
+    rejected = utilities._rejected(query_dict)
+    if rejected is not None:
+        return rejected
+    micro_batcher = _micro_batcher(query_dict)
+    if micro_batcher is not None:
+        return await micro_batcher.submit_async(query_dict)
+
+    body = utilities._request_body(query_dict)
+
+    return utilities._convert(utilities.parse_response(await post(body, query_dict["operation"], (query_dict["command"],))), query_dict)
+
+async def _execute_traced(build, args, as_models):
+    trace = hooks.Trace()
+    query_dict = build(*args)
+    if as_models:
+        query_dict["as_models"] = True
+    if utilities._capturing.get():
+        return query_dict
+    rejected = utilities._rejected(query_dict)
+    if rejected is not None:
+        return rejected
+    micro_batcher = _micro_batcher(query_dict)
+    if micro_batcher is not None: # traced by the batch it is sent in
+        return await micro_batcher.submit_async(query_dict)
+    trace.lap("validate")
+
+    data = utilities.encode_body(utilities._request_body(query_dict))
+    trace.lap("build")
+    trace.start(query_dict["command"], query_dict["operation"], len(data))
+    try:
+        response = await send(data, query_dict["operation"], (query_dict["command"],))
+        trace.lap("http")
+        parsed = utilities._convert(utilities.parse_response(response), query_dict)
+        trace.lap("parse")
+    except Exception as e:
+        trace.end(error=e)
+        raise
+    trace.end(parsed["status"], response)
+    return parsed
+
+async def post(body:dict, operation:str="mutation", commands:list=()):
+    """Awaitable version of buycoins_client.components.utilities.post."""
+    return await send(utilities.encode_body(body), operation, commands)
+
+async def send(data:bytes, operation:str="mutation", commands:list=()):
+    """Awaitable version of buycoins_client.components.utilities.send."""
+    client = utilities._client.get()
+    if client is not None:
+        basic_auth, transport, url = client.auth, client.aio_transport or get_transport(), client.api_url or utilities.API_URL
+    else:
+        basic_auth, transport, url = utilities._default_auth(), get_transport(), utilities.API_URL
+
+    if transport.single_flight is not None and operation == "query": # mutations are never shared
+        return await transport.single_flight.do_async((url, basic_auth.header, data), lambda: _send(transport, url, basic_auth, data, operation, commands))
+    return await _send(transport, url, basic_auth, data, operation, commands)
+
+async def _send(transport, url, basic_auth, data, operation, commands):
+    response = await _post(transport, url, basic_auth, data, operation, commands)
+    if type(data) is utilities.PersistedQuery and utilities.not_persisted(response):
+        response = await _post(transport, url, basic_auth, data.full(), operation, commands)
+    return response
+
+async def _post(transport, url, basic_auth, data, operation, commands):
+    if transport.retry is None and transport.rate_limiter is None:
+        return await transport.post(url, headers=utilities.HEADERS, auth=basic_auth, data=data)
+
+    async def request():
+        if transport.rate_limiter is not None:
+            await transport.rate_limiter.acquire_async(commands)
+        return await transport.post(url, headers=utilities.HEADERS, auth=basic_auth, data=data)
+
+    return await request() if transport.retry is None else await transport.retry.send_async(request, operation)
@@ -3,4 +3,20 @@ from . import auth
 from . import accounts
 from . import prices
 from . import balances
-from . import transfers
\ No newline at end of file
+from . import transfers
+from . import transport
+from . import batch
+from . import order_book
+from . import models
+from . import hooks
+from . import metrics
+from . import retry
+from . import rate_limit
+from . import client
+from . import price_watcher
+from . import quotes
+from . import balance_cache
+from . import fee_estimator
+from . import single_flight
+from . import micro_batch
+from . import schema
\ No newline at end of file
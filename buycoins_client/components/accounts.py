@@ -1,8 +1,9 @@
-import requests
-from requests.auth import HTTPBasicAuth
 from . import utilities
 
-def create(account_name:str, fields:list=[]):
+DEPOSIT_ACCOUNT_FIELDS = utilities.compile_fields([{"field":"accountNumber"}, {"field":"accountName"}, {"field":"accountType"}, {"field":"bankName"}, {"field":"accountReference"}])
+ADDRESS_FIELDS = utilities.compile_fields([{"field":"cryptocurrency"}, {"field":"address"}])
+
+def create(account_name:str, fields:list=[], as_models:bool=False):
     """Create a new bank account. Requires the account name.
 
     Returns the created bank account details made from the createDepositAccount mutation call on the API.
@@ -19,6 +20,9 @@ def create(account_name:str, fields:list=[]):
 
             Default fields are:
             [{"field":"accountNumber"}, {"field":"accountName"}, {"field":"accountType"}, {"field":"bankName"}, {"field":"accountReference"}]
+
+        as_models (bool):
+            Return the result as a buycoins_client.models.DepositAccount instance instead of a dict in the data of the response. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -35,6 +39,10 @@ def create(account_name:str, fields:list=[]):
     Raises:
         Exception: Only raised if fields having an item dict without the field property or account_name is an invalid string.
     """
+    return utilities.execute(_create_query, account_name, fields, as_models=as_models)
+
+def _create_query(account_name, fields):
+    """Validate the arguments of `create` and return its query dict."""
     if(not account_name or type(account_name) is not str or not account_name.strip()):
         raise Exception("Please provide account name to create bank account for")
 
@@ -42,19 +50,13 @@ def create(account_name:str, fields:list=[]):
         "operation": "mutation",
         "command": "createDepositAccount",
         "args": {"accountName": account_name},
-        "fields": fields if len(fields) > 0 else [{"field":"accountNumber"}, {"field":"accountName"}, {"field":"accountType"}, {"field":"bankName"}, {"field":"accountReference"}]
+        "fields": fields if len(fields) > 0 else DEPOSIT_ACCOUNT_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
+    return query_dict
 
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
 
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
-
-def create_address(crypto_currency:str, fields:list=[]):
+def create_address(crypto_currency:str, fields:list=[], as_models:bool=False):
     """Create a cryptocurrency address to receive money in. You should send this address to your prospective sender
 
     Returns the newly created cryptocurrency address from making a call on the `createAddress` mutation call on the API.
@@ -71,6 +73,9 @@ def create_address(crypto_currency:str, fields:list=[]):
 
             Default fields are:
             [{"field":"cryptocurrency"}, {"field":"address"}]
+
+        as_models (bool):
+            Return the result as a buycoins_client.models.Address instance instead of a dict in the data of the response. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -87,6 +92,10 @@ def create_address(crypto_currency:str, fields:list=[]):
     Raises:
         Exception: Only raised if fields having an item dict without the field property or crypto_currency is an invalid string.
     """
+    return utilities.execute(_create_address_query, crypto_currency, fields, as_models=as_models)
+
+def _create_address_query(crypto_currency, fields):
+    """Validate the arguments of `create_address` and return its query dict."""
 
     if(not crypto_currency or type(crypto_currency) is not str or not crypto_currency.strip()):
         raise Exception("crypto_currency parameter is compulsory and it is a string.")
@@ -95,15 +104,7 @@ def create_address(crypto_currency:str, fields:list=[]):
         "operation": "mutation",
         "command": "createAddress",
         "args": {"cryptocurrency": crypto_currency},
-        "fields": fields if len(fields) > 0 else [{"field":"cryptocurrency"}, {"field":"address"}]
+        "fields": fields if len(fields) > 0 else ADDRESS_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
-
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
-
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
-
+    return query_dict
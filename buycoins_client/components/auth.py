@@ -1,3 +1,7 @@
+import base64
+
+from requests.auth import AuthBase
+
 from . import utilities
 
 
@@ -19,10 +23,35 @@ def setup(public_key, secret_key):
     Raises:
         Exception: Only raised if public_key or secret_key parameters are not valid strings.
     """
+    validate(public_key, secret_key)
+    
+    utilities.AUTH = {'username': public_key, 'password': secret_key}
+    return True # use requests auth for basic authentication
+
+
+def validate(public_key, secret_key):
+    """Raise an Exception if public_key or secret_key is not a valid string."""
     if not public_key or type(public_key) is not str:
         raise Exception("Invalid public key. Public key should be a string")
     if not secret_key or type(secret_key) is not str:
         raise Exception("Invalid secret key. Secret key should be a string")
-    
-    utilities.AUTH = {'username': public_key, 'password': secret_key}
-    return True # use requests auth for basic authentication
\ No newline at end of file
+
+
+class BasicAuth(AuthBase):
+    """HTTP basic authentication whose Authorization header is encoded once, instead of on every request as requests.auth.HTTPBasicAuth does.
+
+    Args:
+        public_key (str), secret_key (str):
+            The credentials, see setup
+    """
+
+    def __init__(self, public_key:str, secret_key:str):
+        self.username = public_key
+        self.header = "Basic " + base64.b64encode("{}:{}".format(public_key, secret_key).encode("utf-8")).decode("ascii")
+
+    def __call__(self, request):
+        request.headers["Authorization"] = self.header
+        return request
+
+    def __repr__(self):
+        return "BasicAuth({!r})".format(self.username) # never show the secret key
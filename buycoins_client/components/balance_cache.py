@@ -0,0 +1,171 @@
+import copy
+import threading
+import time
+
+from . import models
+from . import utilities
+
+BALANCE_CACHE = None
+SETTLEMENT_CURRENCY = "naira_token" # the wallet buys are paid from and sells are paid into
+TRADE_COMMANDS = ("buy", "sell", "postLimitOrder", "postMarketOrder")
+
+
+class BalanceCache:
+    """Serves Balances.get and Balances.list from memory and forgets balances when they change.
+
+    The first call for a balance sends getBalances and keeps the response; later calls with the default fields are answered from memory until the response is ttl seconds old. A Balances.list response also answers Balances.get for each of its cryptocurrencies.
+
+    Balances change when money moves, so the cache drops the affected balances whenever a send, buy, sell, postLimitOrder or postMarketOrder mutation made through the blocking or aio module functions, a Batch or the client using the cache does not fail: the cryptocurrency of a send, and the cryptocurrency and the naira_token wallet of a trade. Deposits and fills of open orders happen outside the client, which is what ttl is for. Calls with custom fields are never cached.
+
+    Balances belong to an account, so a cache set with set_balance_cache is only used by the module functions; a BuycoinsClient uses the cache it was given.
+
+    Args:
+        ttl (float):
+            Seconds a balance is served from memory before it is fetched again. Defaults to 30.
+
+    Raises:
+        Exception: Raised if ttl is not a number greater than 0.
+
+    Example:
+        cache = buycoins.BalanceCache(ttl=60)
+        buycoins.set_balance_cache(cache)
+        buycoins.Balances.get("bitcoin") # sends getBalances
+        buycoins.Balances.get("bitcoin") # served from memory
+        print(cache.stats()) # {"hits": 1, "misses": 1, "invalidations": 0, "size": 1}
+    """
+
+    def __init__(self, ttl:float=30.0):
+        if type(ttl) not in (int, float) or ttl <= 0:
+            raise Exception("ttl must be a number of seconds greater than 0.")
+
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = {} # cryptocurrency, or None for the list of every balance -> (response, expiry)
+        self._generation = 0 # bumped by invalidate, so a response fetched before an invalidation is not kept
+        self._lock = threading.Lock()
+
+    def fetch(self, cryptocurrency:str, request, as_models:bool=False):
+        """Return the cached getBalances response of a cryptocurrency, or of every balance, calling request to fetch it on a miss.
+
+        Args:
+            cryptocurrency (str):
+                The cryptocurrency of a Balances.get call, or None for Balances.list
+            request (function):
+                Sends the getBalances query and returns its response dict
+            as_models (bool):
+                Return the balances as buycoins_client.models.Balance instances, see Balances.get
+
+        Returns:
+            A copy of the response dict, which the caller may change
+        """
+        response, generation, expiry = self._lookup(cryptocurrency)
+        if response is None:
+            response = request()
+            self._store(cryptocurrency, response, generation, expiry)
+        return _copy(response, as_models)
+
+    async def fetch_async(self, cryptocurrency:str, request, as_models:bool=False):
+        """Awaitable version of fetch, for a request function that returns a coroutine."""
+        response, generation, expiry = self._lookup(cryptocurrency)
+        if response is None:
+            response = await request()
+            self._store(cryptocurrency, response, generation, expiry)
+        return _copy(response, as_models)
+
+    def invalidate(self, *cryptocurrencies:str):
+        """Drop the balances of the given cryptocurrencies, or every balance if none is given, so the next call fetches them again."""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if not cryptocurrencies:
+                self._entries = {}
+                return
+            self._entries.pop(None, None) # the list has the dropped balances too
+            for cryptocurrency in cryptocurrencies:
+                self._entries.pop(cryptocurrency, None)
+
+    def changed(self, command:str, args:dict, response:dict):
+        """Drop the balances a mutation may have changed, unless its response says it failed.
+
+        Args:
+            command (str):
+                The command of the mutation, e.g "send"
+            args (dict):
+                The arguments it was sent with
+            response (dict):
+                Its response dict
+        """
+        if type(response) is dict and response.get("status") == "failure":
+            return
+        cryptocurrency = args.get("cryptocurrency") if type(args) is dict else None
+        if cryptocurrency is None:
+            self.invalidate()
+        elif command in TRADE_COMMANDS:
+            self.invalidate(cryptocurrency, SETTLEMENT_CURRENCY)
+        else:
+            self.invalidate(cryptocurrency)
+
+    def stats(self):
+        """Return the hits, misses and invalidations of the cache and the number of responses it holds."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations, "size": len(self._entries)}
+
+    def _lookup(self, cryptocurrency):
+        """Return the cached response of cryptocurrency, or None on a miss, with the generation and expiry to store a fetched response with."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cryptocurrency)
+            if entry is not None and entry[1] > now:
+                self.hits += 1
+                return entry[0], self._generation, None
+            self.misses += 1
+            return None, self._generation, now + self.ttl
+
+    def _store(self, cryptocurrency, response, generation, expiry):
+        if response.get("status") != "success":
+            return
+        with self._lock:
+            if generation != self._generation: # money moved while the response was on its way
+                return
+            self._entries[cryptocurrency] = (response, expiry)
+            if cryptocurrency is None and type(response["data"].get("getBalances")) is list:
+                for node in response["data"]["getBalances"]:
+                    if type(node) is dict and node.get("cryptocurrency") is not None:
+                        self._entries[node["cryptocurrency"]] = ({"status": "success", "data": {"getBalances": [node]}}, expiry)
+
+
+def _copy(response, as_models):
+    response = copy.deepcopy(response)
+    if as_models:
+        models.convert(response, "getBalances")
+    return response
+
+def set_balance_cache(cache):
+    """Set the BalanceCache that Balances.get and Balances.list are served from when they are called through the module functions.
+
+    Args:
+        cache (BalanceCache):
+            The cache to use, or None to always send getBalances
+
+    Raises:
+        Exception: Raised if cache is not a BalanceCache instance or None.
+    """
+    global BALANCE_CACHE
+    if cache is not None and not isinstance(cache, BalanceCache):
+        raise Exception("cache must be an instance of buycoins_client.BalanceCache")
+    BALANCE_CACHE = cache
+
+def get_balance_cache():
+    """Return the BalanceCache of the BuycoinsClient making the current call, or the one set with set_balance_cache for the module functions."""
+    client = utilities._client.get()
+    if client is not None:
+        return client.balance_cache
+    return BALANCE_CACHE
+
+def changed(command:str, args:dict, response:dict):
+    """Tell the current BalanceCache, if any, that a mutation was sent, see BalanceCache.changed."""
+    cache = get_balance_cache()
+    if cache is not None:
+        cache.changed(command, args, response)
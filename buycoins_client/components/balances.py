@@ -1,11 +1,12 @@
-import requests
-from requests.auth import HTTPBasicAuth
+from . import balance_cache
 from . import utilities
 
-def get(cryptocurrency:str, fields:list=[]):
+DEFAULT_FIELDS = utilities.compile_fields([{"field":"id"}, {"field":"cryptocurrency"}, {"field":"confirmedBalance"}])
+
+def get(cryptocurrency:str, fields:list=[], as_models:bool=False):
     """Retrieve a single cryptocurrency balance on your wallets
 
-    Returns balance in the specified currency. This is a call on the `getBalances` query with the `cryptocurrency` argument.
+    Returns balance in the specified currency. This is a call on the `getBalances` query with the `cryptocurrency` argument. It is answered from memory when a BalanceCache is set and fields is empty, see BalanceCache.
 
     Args:
         cryptocurrency (str):
@@ -19,6 +20,9 @@ def get(cryptocurrency:str, fields:list=[]):
 
             Default fields are:
             [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"confirmedBalance"}]
+
+        as_models (bool):
+            Return the balances as buycoins_client.models.Balance instances instead of node dicts in the data of the response. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -35,6 +39,14 @@ def get(cryptocurrency:str, fields:list=[]):
     Raises:
         Exception: Only raised if fields having an item dict without the field property.
     """
+    cache = balance_cache.get_balance_cache()
+    if cache is None or len(fields) > 0 or utilities._capturing.get():
+        return utilities.execute(_get_query, cryptocurrency, fields, as_models=as_models)
+    _get_query(cryptocurrency, fields) # invalid arguments raise even when the balance is cached
+    return cache.fetch(cryptocurrency, lambda: utilities.execute(_get_query, cryptocurrency, fields), as_models)
+
+def _get_query(cryptocurrency, fields):
+    """Validate the arguments of `get` and return its query dict."""
 
     if not cryptocurrency or type(cryptocurrency) is not str or not cryptocurrency.strip():
         raise Exception("cryptocurrency argument must be a valid string identifier.")
@@ -47,23 +59,16 @@ def get(cryptocurrency:str, fields:list=[]):
         "operation": "query",
         "command": "getBalances",
         "args": {"cryptocurrency": cryptocurrency},
-        "fields": fields if len(fields) > 0 else [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"confirmedBalance"}]
+        "fields": fields if len(fields) > 0 else DEFAULT_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
-
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
-
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
+    return query_dict
 
 
-def list(fields:list = []):
+def list(fields:list = [], as_models:bool=False):
     """Retrieve a list of balances in all supported cryptocurrencies
 
-    Returns your balances in all the cryptocurrencies you own. This is a call on the `getBalances` query.
+    Returns your balances in all the cryptocurrencies you own. This is a call on the `getBalances` query. It is answered from memory when a BalanceCache is set and fields is empty, see BalanceCache.
 
     Args:
         fields (list):
@@ -74,6 +79,9 @@ def list(fields:list = []):
 
             Default fields are:
             [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"confirmedBalance"}]
+
+        as_models (bool):
+            Return the balances as buycoins_client.models.Balance instances instead of node dicts in the data of the response. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -90,6 +98,13 @@ def list(fields:list = []):
     Raises:
         Exception: Only raised if fields having an item dict without the field property.
     """
+    cache = balance_cache.get_balance_cache()
+    if cache is None or len(fields) > 0 or utilities._capturing.get():
+        return utilities.execute(_list_query, fields, as_models=as_models)
+    return cache.fetch(None, lambda: utilities.execute(_list_query, fields), as_models)
+
+def _list_query(fields):
+    """Validate the arguments of `list` and return its query dict."""
     # add validation for fields
 
     if(not utilities.is_valid_fields(fields)):
@@ -98,14 +113,7 @@ def list(fields:list = []):
     query_dict = {
         "operation": "query",
         "command": "getBalances",
-        "fields": fields if len(fields) > 0 else [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"confirmedBalance"}]
+        "fields": fields if len(fields) > 0 else DEFAULT_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
-
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
-
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
+    return query_dict
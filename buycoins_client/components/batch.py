@@ -0,0 +1,127 @@
+from . import balance_cache
+from . import hooks
+from . import utilities
+from .hooks import HOOKS
+
+
+class Batch:
+    """Collects calls to the component functions and sends them to the API in a single request.
+
+    Every call is added as an aliased root field of one graphql document, so calling Prices.list, Balances.list and Orders.list_my_orders costs one round trip instead of three. Queries and mutations cannot share a document, so a batch holding both sends one request per operation type.
+
+    Example:
+        batch = Batch()
+        batch.add(Prices.list)
+        batch.add(Balances.get, "bitcoin", fields=[{"field":"confirmedBalance"}])
+        prices, balance = batch.send()
+    """
+
+    def __init__(self):
+        self._query_dicts = []
+
+    def __len__(self):
+        return len(self._query_dicts)
+
+    def add(self, function, *args, **kwargs):
+        """Add a component function call to the batch.
+
+        The arguments are validated immediately, exactly as if the function had been called, but no request is sent until send is called.
+
+        Args:
+            function (function):
+                A public component function e.g Prices.list or Orders.post_limit_order
+
+            *args, **kwargs:
+                The arguments passed on to function
+
+        Returns:
+            The position of the call's response in the list returned by send
+
+        Raises:
+            Exception: Raised if the component function rejects its arguments.
+        """
+        return self._add_query(utilities.capture(function, *args, **kwargs))
+
+    def _add_query(self, query_dict):
+        """Add an already validated query dict to the batch and return its position."""
+        query_dict = dict(query_dict)
+        query_dict["alias"] = "c{}".format(len(self._query_dicts))
+        self._query_dicts.append(query_dict)
+        return len(self._query_dicts) - 1
+
+    def _results(self):
+        """Return the list of responses of the collected calls, with the calls that do not match the schema set with schema.set_schema already answered."""
+        return [utilities._rejected(query_dict) for query_dict in self._query_dicts]
+
+    def _groups(self, results):
+        """Group the collected calls without a response by operation and return a [(position, query_dict)] list per group."""
+        groups = {}
+        for position, query_dict in enumerate(self._query_dicts):
+            if results[position] is not None:
+                continue
+            groups.setdefault(query_dict["operation"], []).append((position, query_dict))
+        return list(groups.values())
+
+    def _documents(self, results):
+        """Return a (request body, [(position, query_dict)]) pair per group of calls without a response."""
+        return [(utilities.create_batch_request_body([query_dict for _, query_dict in group]), group) for group in self._groups(results)]
+
+    def _split(self, results, group, response):
+        responses = utilities.parse_batch_response(response, [query_dict for _, query_dict in group])
+        for (position, _), parsed in zip(group, responses):
+            results[position] = parsed
+
+    def _start_trace(self, group):
+        """Build and encode the request body of a group of calls, emitting the start event of its request."""
+        trace = hooks.Trace()
+        data = utilities.encode_body(utilities.create_batch_request_body([query_dict for _, query_dict in group]))
+        trace.lap("build")
+        trace.start("batch", group[0][1]["operation"], len(data), commands=[query_dict["command"] for _, query_dict in group])
+        return trace, data
+
+    def _end_trace(self, trace, results, group, response):
+        """Split the response of a group of calls, emitting the end event of its request."""
+        trace.lap("http")
+        try:
+            self._split(results, group, response)
+        except Exception as e:
+            trace.end(error=e)
+            raise
+        trace.lap("parse")
+        trace.end("success" if all(results[position]["status"] == "success" for position, _ in group) else "failure", response)
+
+    def send(self):
+        """Send every collected call and return their responses.
+
+        Returns:
+            A list of response dicts in the order the calls were added. Each has the same format as the response of the individual function, so one failed call does not affect the status of the others. Calls that do not match the schema set with set_schema are answered without being sent.
+
+        Raises:
+            Exception: Only raised if the authentication credentials have not been set up.
+        """
+        results = self._results()
+        if HOOKS:
+            for group in self._groups(results):
+                trace, data = self._start_trace(group)
+                try:
+                    response = utilities.send(data, operation=group[0][1]["operation"], commands=[query_dict["command"] for _, query_dict in group])
+                except Exception as e:
+                    trace.end(error=e)
+                    raise
+                self._end_trace(trace, results, group, response)
+            self._changed(results)
+            return results
+
+        for body, group in self._documents(results):
+            self._split(results, group, utilities.post(body, operation=group[0][1]["operation"], commands=[query_dict["command"] for _, query_dict in group]))
+        self._changed(results)
+        return results
+
+    def _changed(self, results):
+        """Tell the BalanceCache in use about the mutations of the batch."""
+        cache = balance_cache.get_balance_cache()
+        if cache is None:
+            return
+        for query_dict, result in zip(self._query_dicts, results):
+            if query_dict["operation"] == "mutation":
+                cache.changed(query_dict["command"], query_dict.get("args"), result)
@@ -0,0 +1,196 @@
+import contextlib
+import functools
+import inspect
+
+from . import accounts
+from . import auth
+from . import balances
+from . import orders
+from . import prices
+from . import transfers
+from . import utilities
+from .balance_cache import BalanceCache
+from .batch import Batch
+from .quotes import QuoteCache
+from .transport import Transport
+
+COMPONENTS = {"Orders": orders, "Prices": prices, "Balances": balances, "Transfers": transfers, "Accounts": accounts}
+
+
+class BuycoinsClient:
+    """A client for one Buycoins account, with its own credentials, transport and settings.
+
+    Every public function of the Orders, Prices, Balances, Transfers and Accounts components is available as a method of the component attribute of the same name, taking the same arguments and returning the same response dicts, e.g client.Prices.list() or client.Orders.post_limit_order(args). Calls made through a client use its credentials whatever Auth.setup was given, so several accounts can be used side by side in one process. The Authorization header is encoded once, when the client is created.
+
+    A client holds no per-call state, so one client can be shared by many threads, and the asyncio components are available under client.aio, e.g await client.aio.Prices.list().
+
+    Args:
+        public_key (str), secret_key (str):
+            The credentials of the account, see Auth.setup
+        transport (Transport):
+            The transport the client's requests are sent through. Defaults to the shared transport of set_transport.
+        aio_transport (AsyncTransport):
+            The transport the client's asyncio requests are sent through. Defaults to the shared transport of buycoins_client.aio.set_transport.
+        api_url (str):
+            The graphql endpoint. Defaults to the module API_URL.
+        quote_cache (QuoteCache):
+            The cache Transfers.buy and Transfers.sell take price ids from when they are called without a price. Defaults to the cache of set_quote_cache.
+        balance_cache (BalanceCache):
+            The cache Balances.get and Balances.list of the client are served from. Defaults to None (no caching), as the cache of set_balance_cache holds the balances of the Auth.setup account.
+        persisted_queries (bool):
+            Send documents by their sha256 hash instead of their text, see utilities.encode_body. Defaults to None, which follows the module PERSISTED_QUERIES setting.
+
+    Raises:
+        Exception: Raised if public_key or secret_key is not a valid string, transport is not a Transport instance, quote_cache or balance_cache is not a cache instance or persisted_queries is not a boolean.
+
+    Example:
+        trading = buycoins.BuycoinsClient("public_key", "secret_key", transport=buycoins.Transport(pool_size=20))
+        savings = buycoins.BuycoinsClient("other_public_key", "other_secret_key")
+        trading.Orders.post_limit_order({...})
+        savings.Balances.list()
+    """
+
+    def __init__(self, public_key:str, secret_key:str, transport:Transport=None, aio_transport=None, api_url:str=None, quote_cache:QuoteCache=None, balance_cache:BalanceCache=None, persisted_queries:bool=None):
+        auth.validate(public_key, secret_key)
+        if transport is not None and not isinstance(transport, Transport):
+            raise Exception("transport must be an instance of buycoins_client.Transport")
+        if quote_cache is not None and not isinstance(quote_cache, QuoteCache):
+            raise Exception("quote_cache must be an instance of buycoins_client.QuoteCache")
+        if balance_cache is not None and not isinstance(balance_cache, BalanceCache):
+            raise Exception("balance_cache must be an instance of buycoins_client.BalanceCache")
+        if persisted_queries is not None and type(persisted_queries) is not bool:
+            raise Exception("persisted_queries must be a boolean.")
+
+        self.auth = auth.BasicAuth(public_key, secret_key)
+        self.transport = transport
+        self.aio_transport = aio_transport
+        self.api_url = api_url
+        self.quote_cache = quote_cache
+        self.balance_cache = balance_cache
+        self.persisted_queries = persisted_queries
+        for name, module in COMPONENTS.items():
+            setattr(self, name, _Component(self, module))
+        self.aio = _Aio(self)
+
+    def __repr__(self):
+        return "BuycoinsClient({!r})".format(self.auth.username)
+
+    @contextlib.contextmanager
+    def use(self):
+        """Make every call in a `with` block use the client, including calls made through the module functions and Batch.
+
+        Example:
+            with client.use():
+                batch = buycoins.Batch()
+                batch.add(buycoins.Prices.list)
+                batch.send()
+        """
+        token = utilities._client.set(self)
+        try:
+            yield self
+        finally:
+            utilities._client.reset(token)
+
+    def batch(self):
+        """Return a Batch whose send uses the client."""
+        batch = Batch()
+        batch.send = self._bind(batch.send)
+        return batch
+
+    def _bind(self, function):
+        """Wrap a component function so it runs with the client, including generators and async generators it returns."""
+        client = self
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def call(*args, **kwargs):
+                token = utilities._client.set(client)
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    utilities._client.reset(token)
+            return call
+
+        @functools.wraps(function)
+        def call(*args, **kwargs):
+            token = utilities._client.set(client)
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                utilities._client.reset(token)
+            if inspect.isgenerator(result):
+                return _bind_generator(client, result)
+            if inspect.isasyncgen(result):
+                return _bind_async_generator(client, result)
+            return result
+        return call
+
+
+class _Component:
+    """The public functions of a component module, bound to a client."""
+
+    def __init__(self, client, module):
+        self._module = module
+        for name, function in vars(module).items():
+            if not name.startswith("_") and inspect.isfunction(function) and function.__module__ == module.__name__:
+                setattr(self, name, client._bind(function))
+
+    def __repr__(self):
+        return "<{} bound to a BuycoinsClient>".format(self._module.__name__)
+
+
+class _Aio:
+    """The asyncio components, bound to a client."""
+
+    def __init__(self, client):
+        self._client = client
+        self._components = None
+
+    def __getattr__(self, name):
+        # the asyncio components are imported on first use, as they need aiohttp
+        if self._components is None:
+            from .. import aio
+            self._components = {component: _Component(self._client, getattr(aio, component)) for component in COMPONENTS}
+        try:
+            return self._components[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def batch(self):
+        """Return an asyncio Batch whose send uses the client."""
+        from ..aio import Batch as AioBatch
+        batch = AioBatch()
+        batch.send = self._client._bind(batch.send)
+        return batch
+
+
+def _bind_generator(client, generator):
+    try:
+        while True:
+            token = utilities._client.set(client)
+            try:
+                item = next(generator)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                utilities._client.reset(token)
+            yield item
+    finally:
+        token = utilities._client.set(client)
+        try:
+            generator.close()
+        finally:
+            utilities._client.reset(token)
+
+async def _bind_async_generator(client, generator):
+    try:
+        while True:
+            token = utilities._client.set(client)
+            try:
+                item = await generator.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                utilities._client.reset(token)
+            yield item
+    finally:
+        await generator.aclose()
@@ -0,0 +1,189 @@
+import threading
+import time
+import warnings
+from decimal import Decimal, InvalidOperation
+
+from . import transfers
+from .batch import Batch
+
+
+class FeeEstimator:
+    """Memoizes getEstimatedNetworkFee, so showing the fee of a withdrawal as it is typed costs a memory lookup instead of a round trip.
+
+    Estimates are cached by cryptocurrency and amount bucket for ttl seconds. An amount is bucketed by rounding it to `significant_digits` significant digits, so 0.01234 and 0.01229 share the estimate fetched for 0.012; the total of a bucketed estimate is the amount plus the estimated fee. Estimates for several amounts are fetched with a single aliased query, see fees_many.
+
+    Once start has been called, a background thread fetches the fees of the `warm` amounts every ttl / 2 seconds, so they are always in memory.
+
+    Args:
+        ttl (float):
+            Seconds an estimate is used before it is fetched again. Defaults to 10.
+        significant_digits (int):
+            The significant digits amounts are rounded to before they are looked up, or None to cache every amount on its own. Defaults to 2.
+        warm (dict):
+            The amounts to keep in memory once start has been called, by cryptocurrency e.g {"bitcoin": [0.001, 0.01, 0.1]}
+        client (BuycoinsClient):
+            The client to fetch the estimates with. Defaults to the module functions and the credentials of Auth.setup.
+
+    Raises:
+        Exception: Raised if ttl is not a number greater than 0, significant_digits is not an integer greater than 0 or None, or warm is not a dict of lists of amounts.
+
+    Example:
+        estimator = buycoins.FeeEstimator(warm={"bitcoin": [0.001, 0.01, 0.1]}).start()
+        estimator.fees({"cryptocurrency": "bitcoin", "amount": 0.0123}) # same response as Transfers.fees
+    """
+
+    def __init__(self, ttl:float=10.0, significant_digits:int=2, warm:dict=None, client=None):
+        if type(ttl) not in (int, float) or ttl <= 0:
+            raise Exception("ttl must be a number of seconds greater than 0.")
+        if significant_digits is not None and (type(significant_digits) is not int or significant_digits <= 0):
+            raise Exception("significant_digits must be an integer greater than 0 or None.")
+        if warm is not None and (type(warm) is not dict or not all(type(amounts) is list and all(type(amount) is float for amount in amounts) for amounts in warm.values())):
+            raise Exception("warm must be a dict of lists of float amounts by cryptocurrency.")
+
+        self.ttl = ttl
+        self.significant_digits = significant_digits
+        self.warm = warm or {}
+        self.client = client
+        self.hits = 0
+        self.misses = 0
+        self.last_error = None
+        self._estimates = {} # (cryptocurrency, bucket) -> (getEstimatedNetworkFee node, expiry)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def fees(self, args:dict, fields:list=[]):
+        """Cached version of Transfers.fees.
+
+        Takes the same arguments, raises the same exceptions and returns the same response dict. Calls with custom fields are sent as they are.
+        """
+        if len(fields) > 0:
+            return self._component().fees(args, fields)
+        return self.fees_many(args.get("cryptocurrency") if type(args) is dict else None, [args.get("amount") if type(args) is dict else None])[0]
+
+    def fees_many(self, cryptocurrency:str, amounts:list):
+        """Return the fee estimates of several amounts of a cryptocurrency, fetching the ones not in memory with a single request.
+
+        Args:
+            cryptocurrency (str):
+                The cryptocurrency to send e.g "bitcoin"
+            amounts (list):
+                The float amounts to estimate the fees of
+
+        Returns:
+            A list with a response dict in the format of Transfers.fees for every amount, in the order of amounts
+
+        Raises:
+            Exception: Raised if cryptocurrency or any of the amounts is invalid, see Transfers.fees.
+        """
+        if type(amounts) is not list or not amounts:
+            raise Exception("amounts must be a non-empty list of float amounts.")
+        for amount in amounts:
+            transfers._fees_query({"cryptocurrency": cryptocurrency, "amount": amount}, [])
+
+        now = time.monotonic()
+        buckets = [self._bucket(amount) for amount in amounts]
+        with self._lock:
+            nodes = {}
+            for bucket in buckets:
+                entry = self._estimates.get((cryptocurrency, bucket))
+                if entry is not None and entry[1] > now:
+                    nodes[bucket] = entry[0]
+            self.hits += sum(1 for bucket in buckets if bucket in nodes)
+            self.misses += sum(1 for bucket in buckets if bucket not in nodes)
+
+        missing = sorted(set(bucket for bucket in buckets if bucket not in nodes))
+        failures = self._fetch([(cryptocurrency, bucket) for bucket in missing], nodes) if missing else {}
+
+        return [failures[bucket] if bucket in failures else _response(nodes[bucket], amount, bucket) for amount, bucket in zip(amounts, buckets)]
+
+    def refresh(self):
+        """Fetch the fees of every warm amount now with a single request.
+
+        Raises:
+            Exception: Raised if the request could not be sent.
+        """
+        keys = sorted(set((cryptocurrency, self._bucket(amount)) for cryptocurrency, amounts in self.warm.items() for amount in amounts))
+        if keys:
+            failures = self._fetch(keys, {})
+            if failures:
+                raise Exception("Could not estimate fees: {}".format("; ".join(error["reason"] for response in failures.values() for error in response["errors"])))
+
+    def invalidate(self):
+        """Drop every cached estimate."""
+        with self._lock:
+            self._estimates = {}
+
+    def start(self):
+        """Keep the fees of the warm amounts in memory on a background thread until stop is called, and return the estimator."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="buycoins-fee-estimator", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop warming and wait for the background thread to finish."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _bucket(self, amount):
+        if self.significant_digits is None:
+            return amount
+        return float("{:.{}g}".format(amount, self.significant_digits))
+
+    def _component(self):
+        return self.client.Transfers if self.client is not None else transfers
+
+    def _fetch(self, keys, nodes):
+        """Fetch the estimates of (cryptocurrency, bucket) keys in one request, adding them to nodes, and return the failure responses by bucket."""
+        batch = self.client.batch() if self.client is not None else Batch()
+        for cryptocurrency, bucket in keys:
+            batch.add(self._component().fees, {"cryptocurrency": cryptocurrency, "amount": bucket})
+        responses = batch.send()
+
+        failures = {}
+        expiry = time.monotonic() + self.ttl
+        with self._lock:
+            for (cryptocurrency, bucket), response in zip(keys, responses):
+                node = response.get("data", {}).get("getEstimatedNetworkFee") if response["status"] == "success" else None
+                if node is None:
+                    failures[bucket] = response
+                    continue
+                self._estimates[(cryptocurrency, bucket)] = (node, expiry)
+                nodes[bucket] = node
+        return failures
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = e
+                warnings.warn("FeeEstimator could not warm the fees: {}".format(e), RuntimeWarning)
+            self._stop.wait(self.ttl / 2)
+
+
+def _response(node, amount, bucket):
+    """Return the Transfers.fees response of an amount from the estimate of its bucket."""
+    node = dict(node)
+    if amount != bucket and node.get("estimatedFee") is not None:
+        node["total"] = _add(amount, node["estimatedFee"])
+    return {"status": "success", "data": {"getEstimatedNetworkFee": node}}
+
+def _add(amount, fee):
+    """Add an estimated fee to an amount, keeping the type the API returned the fee as."""
+    if type(fee) is str:
+        try:
+            return format(Decimal(repr(amount)) + Decimal(fee), "f")
+        except InvalidOperation:
+            return None
+    return amount + fee
@@ -0,0 +1,91 @@
+import itertools
+import time
+import warnings
+
+HOOKS = []
+
+_ids = itertools.count(1)
+
+
+def register(hook):
+    """Register a function to be called with an event dict at the start and end of every API request.
+
+    A "start" event is emitted once a request has been validated and built, just before it is sent, and an "end" event once its response has been parsed or the request failed. Both carry:
+
+        {
+            "event": "start" or "end",
+            "id": 12, # the same for the start and end event of a request
+            "command": "getPrices", # "batch" for a Batch, whose event also has a "commands" list
+            "operation": "query" or "mutation",
+            "bytes_sent": 61,
+            "timings": {"validate": 4.1e-06, "build": 3.3e-06} # seconds
+        }
+
+    The end event adds "bytes_received" (None if the size of a streamed response is not known), "status_code" (the HTTP status code, None if no response arrived), "attempts" (the number of times the request was sent, see RetryPolicy), "status" ("success" or "failure", None if the request raised), "error" (the exception it raised, or None) and the "http" and "parse" timings. "validate" covers the component's argument checks including is_valid_fields and the schema check, "build" _request_body and the JSON encoding of the body, "http" the round trip including the transfer of the response body, which the transports read before they return, and "parse" decoding the body and building the response dict. For streamed requests "http" ends when the response headers arrive, and "parse" also covers reading the body as it is decoded.
+
+    Requests are only timed while at least one hook is registered, so hooks cost nothing when none are. Hooks are called on the thread that made the request, and an exception raised by a hook is turned into a warning instead of failing the request.
+
+    Args:
+        hook (function):
+            Called with each event dict
+
+    Returns:
+        The hook, so register can be used as a decorator
+
+    Raises:
+        Exception: Only raised if hook is not callable.
+    """
+    if not callable(hook):
+        raise Exception("hook must be a function that takes an event dict.")
+    HOOKS.append(hook)
+    return hook
+
+def unregister(hook):
+    """Stop calling a hook registered with register. Unknown hooks are ignored."""
+    if hook in HOOKS:
+        HOOKS.remove(hook)
+
+def emit(event:dict):
+    """Call every registered hook with an event dict."""
+    for hook in list(HOOKS):
+        try:
+            hook(event)
+        except Exception as e:
+            warnings.warn("Hook {hook!r} raised {error!r}".format(hook=hook, error=e), RuntimeWarning)
+
+
+class Trace:
+    """Times the phases of one request and emits its start and end events.
+
+    Each call to lap records the time since the previous lap (or since the trace was created) under a phase name.
+    """
+
+    __slots__ = ("event", "_mark")
+
+    def __init__(self):
+        self.event = {"id": next(_ids), "command": None, "operation": None, "bytes_sent": 0, "timings": {}}
+        self._mark = time.perf_counter()
+
+    def lap(self, phase:str):
+        now = time.perf_counter()
+        self.event["timings"][phase] = now - self._mark
+        self._mark = now
+
+    def start(self, command:str, operation:str, bytes_sent:int, **extra):
+        self.event.update(extra, command=command, operation=operation, bytes_sent=bytes_sent)
+        emit(dict(self.event, event="start", timings=dict(self.event["timings"])))
+        self._mark = time.perf_counter() # hook time does not count towards the request
+
+    def end(self, status:str=None, response=None, error:Exception=None):
+        status_code = getattr(response, "status_code", None)
+        attempts = getattr(error if response is None else response, "attempts", None) # set by a RetryPolicy
+        emit(dict(self.event, event="end", status=status, status_code=status_code, bytes_received=received(response) if response is not None else None, error=error, attempts=len(attempts) if type(attempts) is list else 1))
+
+
+def received(response):
+    """Return the number of bytes in a response body, or None if it is not known yet."""
+    content = getattr(response, "_content", None) if hasattr(response, "iter_content") else getattr(response, "content", None)
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+    length = getattr(response, "headers", {}).get("Content-Length")
+    return int(length) if length is not None else None
@@ -0,0 +1,53 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+BACKENDS = ["orjson", "ujson", "json"]
+NAME = None
+
+
+def dumps(obj):
+    """Serialize obj to a JSON bytes object with the selected backend."""
+    return _dumps(obj)
+
+def loads(data):
+    """Deserialize a JSON bytes or str object with the selected backend."""
+    return _loads(data)
+
+def use(name:str):
+    """Select the JSON backend used for request bodies and responses.
+
+    By default the fastest installed backend is used: orjson, then ujson, then the standard library json module.
+
+    Args:
+        name (str):
+            One of "orjson", "ujson" or "json"
+
+    Raises:
+        Exception: Raised if the backend is unknown or not installed.
+    """
+    global NAME, _dumps, _loads
+    if name == "orjson" and orjson is not None:
+        _dumps, _loads = orjson.dumps, orjson.loads
+    elif name == "ujson" and ujson is not None:
+        _dumps, _loads = lambda obj: ujson.dumps(obj, ensure_ascii=False).encode("utf-8"), ujson.loads
+    elif name == "json":
+        _dumps, _loads = lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), json.loads
+    else:
+        raise Exception("Unknown or uninstalled JSON backend {name}. Use one of: {backends}".format(name=name, backends=", ".join(available())))
+    NAME = name
+
+def available():
+    """Return the names of the installed JSON backends, fastest first."""
+    return [name for name, module in zip(BACKENDS, [orjson, ujson, json]) if module is not None]
+
+
+use(available()[0])
@@ -0,0 +1,261 @@
+import collections
+import math
+import threading
+
+from . import hooks
+from . import utilities
+
+PHASES = ["validate", "build", "http", "parse", "total"]
+QUANTILES = [0.5, 0.9, 0.99, 0.999]
+ERROR_CATEGORIES = ["exception", "unauthorized", "rate_limited", "server_error", "http_error", "graphql_error"]
+
+
+class Histogram:
+    """A log-linear latency histogram in the style of HdrHistogram.
+
+    Values are counted in buckets whose width grows with the value, so every recorded latency is kept with a relative error of at most 1/2**significant_bits (0.8% by default) whatever its magnitude, in a few hundred counters. Latencies are recorded in seconds and bucketed in microseconds.
+
+    Args:
+        significant_bits (int):
+            The number of bits of every value that are kept. Defaults to 7.
+    """
+
+    __slots__ = ("significant_bits", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, significant_bits:int=7):
+        self.significant_bits = significant_bits
+        self.counts = {} # bucket index -> count
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, microseconds):
+        shift = max(microseconds.bit_length() - self.significant_bits, 0)
+        return (shift << self.significant_bits) + (microseconds >> shift)
+
+    def _value(self, index):
+        # the middle of the bucket, in seconds
+        shift, mantissa = index >> self.significant_bits, index & ((1 << self.significant_bits) - 1)
+        return ((mantissa << shift) + ((1 << shift) - 1) / 2) / 1e6
+
+    def record(self, seconds:float):
+        """Count one latency, in seconds."""
+        index = self._index(max(int(seconds * 1e6), 0))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None or seconds < self.min else self.min
+        self.max = seconds if self.max is None or seconds > self.max else self.max
+
+    def percentile(self, quantile:float):
+        """Return the latency in seconds below which the given fraction (0 to 1) of the recorded latencies fall, or None if nothing has been recorded."""
+        if not self.count:
+            return None
+        rank = max(math.ceil(quantile * self.count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def snapshot(self, quantiles:list=QUANTILES):
+        """Return the count, sum, min, max and quantiles of the histogram as a dict."""
+        snapshot = {"count": self.count, "sum": self.sum, "min": self.min, "max": self.max}
+        for quantile in quantiles:
+            snapshot[_key(quantile)] = self.percentile(quantile)
+        return snapshot
+
+
+def category(event:dict):
+    """Return the failure category of the end event of a failed request, or None if it succeeded.
+
+    The categories follow the branches of parse_response: "unauthorized" (status code 401), "rate_limited" (429), "server_error" (5xx), "http_error" (any other status code above 299), "graphql_error" (a response with an errors list) and "exception" for requests that raised instead of returning a response.
+    """
+    if event.get("error") is not None:
+        return "exception"
+    status_code = event.get("status_code")
+    if status_code == 401:
+        return "unauthorized"
+    if status_code == 429:
+        return "rate_limited"
+    if status_code is not None and 500 <= status_code <= 599:
+        return "server_error"
+    if status_code is not None and status_code > 299:
+        return "http_error"
+    if event.get("status") == "failure":
+        return "graphql_error"
+    return None
+
+
+class Metrics:
+    """Aggregated request metrics per graphql command, collected with a request hook.
+
+    For every command (getPrices, postLimitOrder, "batch" for a Batch, ...) it keeps a latency Histogram per phase ("validate", "build", "http", "parse" and their "total"), the number of requests, errors by category (see category), retries and bytes sent and received. Snapshots also include the connection pool usage of a transport: the one of the given client, of the client whose `use` block the snapshot is taken in, or the shared transport. Requests are counted whichever client sends them, but the pools of other clients are not included.
+
+    Example:
+        metrics = buycoins.Metrics().enable()
+        buycoins.Prices.list()
+        print(metrics.snapshot()["commands"]["getPrices"]["latency"]["http"]["p99"])
+        print(metrics.to_prometheus())
+
+    Args:
+        significant_bits (int):
+            The precision of the latency histograms, see Histogram
+    """
+
+    def __init__(self, significant_bits:int=7):
+        self.significant_bits = significant_bits
+        self._lock = threading.Lock()
+        self._commands = {}
+
+    def enable(self):
+        """Start collecting the metrics of every request and return the Metrics."""
+        if self not in hooks.HOOKS:
+            hooks.register(self)
+        return self
+
+    def disable(self):
+        """Stop collecting metrics. The metrics collected so far are kept."""
+        hooks.unregister(self)
+
+    def reset(self):
+        """Forget every metric collected so far."""
+        with self._lock:
+            self._commands = {}
+
+    def __call__(self, event:dict):
+        if event["event"] != "end":
+            return
+
+        timings = event["timings"]
+        failure = category(event)
+        with self._lock:
+            command = self._commands.get(event["command"])
+            if command is None:
+                command = self._commands[event["command"]] = {
+                    "requests": 0, "errors": collections.Counter(), "retries": 0, "bytes_sent": 0, "bytes_received": 0,
+                    "latency": {phase: Histogram(self.significant_bits) for phase in PHASES},
+                }
+            command["requests"] += 1
+            command["retries"] += max(event.get("attempts", 1) - 1, 0)
+            command["bytes_sent"] += event["bytes_sent"] or 0
+            command["bytes_received"] += event["bytes_received"] or 0
+            if failure is not None:
+                command["errors"][failure] += 1
+            for phase, seconds in timings.items():
+                if phase in command["latency"]:
+                    command["latency"][phase].record(seconds)
+            command["latency"]["total"].record(sum(timings.values()))
+
+    def snapshot(self, quantiles:list=QUANTILES, client=None):
+        """Return every metric as a dict.
+
+        Args:
+            quantiles (list):
+                The latency quantiles to include, as fractions between 0 and 1
+            client (BuycoinsClient):
+                The client whose transport's pool usage to include. Defaults to the client of the enclosing `use` block, or the shared transport outside of one.
+
+        Returns:
+            A dict in the format shown below, with latencies in seconds:
+                {
+                    "commands": {
+                        "getPrices": {
+                            "requests": 120,
+                            "errors": {"rate_limited": 2, "graphql_error": 1},
+                            "retries": 2,
+                            "bytes_sent": 7320,
+                            "bytes_received": 37440,
+                            "latency": {
+                                "http": {"count": 120, "sum": 25.2, "min": 0.19, "max": 0.61, "p50": 0.2, "p90": 0.24, "p99": 0.52, "p999": 0.61},
+                                ... # and "validate", "build", "parse" and "total"
+                            }
+                        }
+                    },
+                    "pool": {"pools": 1, "max_size": 10, "idle": 3, "connections_opened": 4, "requests": 121} # see Transport.pool_stats
+                }
+        """
+        with self._lock:
+            commands = {
+                name: {
+                    "requests": command["requests"],
+                    "errors": dict(command["errors"]),
+                    "retries": command["retries"],
+                    "bytes_sent": command["bytes_sent"],
+                    "bytes_received": command["bytes_received"],
+                    "latency": {phase: histogram.snapshot(quantiles) for phase, histogram in command["latency"].items()},
+                }
+                for name, command in self._commands.items()
+            }
+        client = client if client is not None else utilities._client.get()
+        transport = (client.transport if client is not None else None) or utilities.TRANSPORT
+        return {"commands": commands, "pool": transport.pool_stats() if transport is not None else None}
+
+    def to_prometheus(self, namespace:str="buycoins", quantiles:list=QUANTILES, client=None):
+        """Return every metric in the Prometheus text exposition format, e.g. to serve from a /metrics endpoint.
+
+        Latencies are exported as a summary named <namespace>_request_duration_seconds with command, phase and quantile labels, and counts as counters and gauges with a command label.
+
+        Args:
+            namespace (str):
+                The prefix of every metric name
+            quantiles (list):
+                The latency quantiles to export, as fractions between 0 and 1
+            client (BuycoinsClient):
+                The client whose transport's pool usage to export, see snapshot
+
+        Returns:
+            The metrics as a string
+        """
+        snapshot = self.snapshot(quantiles, client)
+        lines = []
+
+        def family(name, kind, description, samples):
+            lines.append("# HELP {}_{} {}".format(namespace, name, description))
+            lines.append("# TYPE {}_{} {}".format(namespace, name, kind))
+            for suffix, labels, value in samples:
+                labels = ",".join('{}="{}"'.format(label, _escape(text)) for label, text in labels)
+                lines.append("{}_{}{}{} {}".format(namespace, name, suffix, "{" + labels + "}" if labels else "", _number(value)))
+
+        commands = sorted(snapshot["commands"].items())
+        family("requests_total", "counter", "Requests sent, by graphql command.", [("", [("command", name)], command["requests"]) for name, command in commands])
+        family("errors_total", "counter", "Failed requests, by graphql command and failure category.", [
+            ("", [("command", name), ("category", failure)], command["errors"][failure]) for name, command in commands for failure in ERROR_CATEGORIES if failure in command["errors"]
+        ])
+        family("retries_total", "counter", "Retried attempts, by graphql command.", [("", [("command", name)], command["retries"]) for name, command in commands])
+        family("sent_bytes_total", "counter", "Request body bytes sent, by graphql command.", [("", [("command", name)], command["bytes_sent"]) for name, command in commands])
+        family("received_bytes_total", "counter", "Response body bytes received, by graphql command.", [("", [("command", name)], command["bytes_received"]) for name, command in commands])
+
+        samples = []
+        for name, command in commands:
+            for phase in PHASES:
+                latency = command["latency"][phase]
+                labels = [("command", name), ("phase", phase)]
+                for quantile in quantiles:
+                    samples.append(("", labels + [("quantile", format(quantile, "g"))], latency[_key(quantile)]))
+                samples.append(("_sum", labels, latency["sum"]))
+                samples.append(("_count", labels, latency["count"]))
+        family("request_duration_seconds", "summary", "Time spent in each phase of a request, by graphql command.", samples)
+
+        pool = snapshot["pool"]
+        if pool is not None:
+            family("pool_idle_connections", "gauge", "Open keep-alive connections waiting for a request.", [("", [], pool["idle"])])
+            family("pool_max_size", "gauge", "The most idle connections kept per pool.", [("", [], pool["max_size"])])
+            family("pool_connections_opened_total", "counter", "Connections opened by the transport.", [("", [], pool["connections_opened"])])
+            family("pool_requests_total", "counter", "Requests sent over the connections of the transport.", [("", [], pool["requests"])])
+        return "\n".join(lines) + "\n"
+
+
+def _key(quantile):
+    # 0.5 -> "p50", 0.999 -> "p999"
+    return "p" + format(quantile * 100, "g").replace(".", "")
+
+def _escape(text):
+    return str(text).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value):
+    if value is None:
+        return "NaN"
+    return repr(float(value)) if isinstance(value, float) else str(value)
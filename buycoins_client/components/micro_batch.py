@@ -0,0 +1,128 @@
+import asyncio
+import threading
+
+from . import utilities
+
+
+class MicroBatcher:
+    """Merges the queries made within a short window into one aliased graphql document, like a DataLoader.
+
+    When a transport has a MicroBatcher, a query call does not send its request right away: it waits up to `window` seconds for queries made by other threads, or other coroutines, and the queries collected in that time are sent together as one document, exactly as a Batch would send them. Each call still returns its own response dict, in the same format as without batching, so calling code does not change. A burst of Balances.get calls for different cryptocurrencies or Transfers.fees lookups costs one request instead of one each.
+
+    Calls made through different BuycoinsClients are batched separately, as their credentials differ. Mutations and streamed requests are always sent on their own.
+
+    Args:
+        window (float):
+            Seconds a query waits for others to join its document. Defaults to 0.002.
+        max_size (int):
+            The most queries in one document. A document that fills up is sent without waiting for the rest of the window. Defaults to 50.
+
+    Raises:
+        Exception: Raised if window is not a number greater than or equal to 0 or max_size is not an integer greater than 0.
+
+    Example:
+        buycoins.set_transport(buycoins.Transport(micro_batcher=buycoins.MicroBatcher(window=0.002)))
+    """
+
+    def __init__(self, window:float=0.002, max_size:int=50):
+        if type(window) not in (int, float) or window < 0:
+            raise Exception("window must be a number of seconds greater than or equal to 0.")
+        if type(max_size) is not int or max_size <= 0:
+            raise Exception("max_size must be an integer greater than 0.")
+
+        self.window = window
+        self.max_size = max_size
+        self.calls = 0 # queries sent through the batcher
+        self.batches = 0 # documents they were sent in
+        self._lock = threading.Lock()
+        self._pending = {} # client, or (event loop, client) -> the _Pending queries collecting for it
+
+    def submit(self, query_dict:dict):
+        """Send a query dict in the next document of the current client, wait for it to be sent and return its parsed response.
+
+        The first call of a window sends the document, on its own thread, once the window has passed or the document is full.
+        """
+        key = utilities._client.get()
+        pending, position, leader = self._join(key, query_dict, lambda: _Pending(threading.Event()))
+        if not leader:
+            return pending.wait(position)
+
+        pending.full.wait(self.window)
+        self._close(key, pending)
+        from .batch import Batch # imported here, as batch imports the transport module this module is used by
+        try:
+            pending.results = _send(Batch(), pending.query_dicts)
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            pending.done.set()
+        return pending.results[position]
+
+    async def submit_async(self, query_dict:dict):
+        """Awaitable version of submit.
+
+        The document is sent by a task of its own, so a caller that is cancelled does not cancel it for the others.
+        """
+        key = (asyncio.get_running_loop(), utilities._client.get())
+        pending, position, leader = self._join(key, query_dict, lambda: _Pending(asyncio.Event()))
+        if leader:
+            pending.task = asyncio.ensure_future(self._flush_async(key, pending))
+        return (await asyncio.shield(pending.task))[position]
+
+    def _join(self, key, query_dict, create):
+        """Add a query dict to the pending document of key and return the document, the position of the query in it and whether it was created by this call."""
+        with self._lock:
+            pending = self._pending.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._pending[key] = create()
+            position = len(pending.query_dicts)
+            pending.query_dicts.append(query_dict)
+            self.calls += 1
+            if len(pending.query_dicts) >= self.max_size: # later queries start a new document
+                del self._pending[key]
+                pending.full.set()
+        return pending, position, leader
+
+    def _close(self, key, pending):
+        with self._lock:
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+            self.batches += 1
+
+    async def _flush_async(self, key, pending):
+        try:
+            await asyncio.wait_for(pending.full.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        self._close(key, pending)
+        from ..aio.batch import Batch
+        return await _send(Batch(), pending.query_dicts)
+
+
+class _Pending:
+    """The queries collected for one document and, once it has been sent, their responses."""
+
+    __slots__ = ("query_dicts", "full", "done", "results", "error", "task")
+
+    def __init__(self, full):
+        self.query_dicts = []
+        self.full = full
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+        self.task = None
+
+    def wait(self, position):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.results[position]
+
+
+def _send(batch, query_dicts):
+    """Add query dicts to a Batch and return its send result, a list or an awaitable of one."""
+    for query_dict in query_dicts:
+        batch._add_query(query_dict)
+    return batch.send()
@@ -0,0 +1,193 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+
+def _decimal(value):
+    return value if type(value) is Decimal else Decimal(value if type(value) is str else str(value))
+
+def _timestamp(value):
+    return value if type(value) is datetime else datetime.fromtimestamp(int(value), timezone.utc)
+
+
+class _Field:
+    """Reads a model field from its slot, decoding the value as received on first access and storing the decoded value back in the slot."""
+
+    __slots__ = ("slot", "decode")
+
+    def __init__(self, slot, decode):
+        self.slot = slot
+        self.decode = decode
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = self.slot.__get__(instance, owner) # raises AttributeError if the field was not requested
+        if self.decode is not None and value is not None:
+            decoded = self.decode(value)
+            if decoded is not value:
+                self.slot.__set__(instance, decoded)
+            return decoded
+        return value
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+
+
+class Model:
+    """Base class of the result models, compact alternatives to the node dicts of a response.
+
+    Every field of a model is stored in a slot instead of a per-instance dict, and the values are kept exactly as they were received: amounts and prices are only converted to Decimal, and timestamps to timezone-aware datetime objects, the first time they are read. A field that was not requested raises AttributeError, and fields a model does not know about are still available as attributes.
+    """
+
+    FIELDS = ()
+    DECIMALS = ()
+    TIMESTAMPS = ()
+    __slots__ = ("_extra",)
+
+    def __init_subclass__(cls):
+        cls._slots = {}
+        for name in cls.FIELDS:
+            slot = cls.__dict__["_" + name]
+            decode = _decimal if name in cls.DECIMALS else _timestamp if name in cls.TIMESTAMPS else None
+            setattr(cls, name, _Field(slot, decode))
+            cls._slots[name] = slot
+
+    @classmethod
+    def from_dict(cls, node:dict):
+        """Create a model from a node dict of a response without decoding or copying its values.
+
+        Args:
+            node (dict):
+                A node dict, e.g an item of data.getPrices or the node of an edge of data.getMarketBook.orders
+
+        Returns:
+            A model instance
+        """
+        model = cls.__new__(cls)
+        model._extra = None
+        slots = cls._slots
+        for name, value in node.items():
+            slot = slots.get(name)
+            if slot is not None:
+                slot.__set__(model, value)
+            elif model._extra is None:
+                model._extra = {name: value}
+            else:
+                model._extra[name] = value
+        return model
+
+    def to_dict(self):
+        """Return the requested fields as a dict, with amounts, prices and timestamps decoded."""
+        result = {}
+        for name in self.FIELDS:
+            try:
+                result[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+    def __getattr__(self, name):
+        if name != "_extra" and self._extra and name in self._extra:
+            return self._extra[name]
+        raise AttributeError("{model} has no field {name}. Add it to the fields of the query to retrieve it.".format(model=type(self).__name__, name=name))
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.to_dict() == self.to_dict()
+
+    def __repr__(self):
+        return "{model}({fields})".format(model=type(self).__name__, fields=", ".join("{}={!r}".format(name, value) for name, value in self.to_dict().items()))
+
+
+def _slots(fields):
+    return tuple("_" + name for name in fields)
+
+
+class Order(Model):
+    """An order on the Buycoins platform, as returned by getOrders, getMarketBook, postLimitOrder, postMarketOrder, buy and sell."""
+
+    FIELDS = ("id", "cryptocurrency", "coinAmount", "side", "status", "createdAt", "pricePerCoin", "priceType", "staticPrice", "dynamicExchangeRate", "totalCoinAmount")
+    DECIMALS = ("coinAmount", "pricePerCoin", "staticPrice", "dynamicExchangeRate", "totalCoinAmount")
+    TIMESTAMPS = ("createdAt",)
+    __slots__ = _slots(FIELDS)
+
+class Price(Model):
+    """A cryptocurrency price, as returned by getPrices."""
+
+    FIELDS = ("id", "cryptocurrency", "buyPricePerCoin", "sellPricePerCoin", "minBuy", "maxBuy", "minSell", "maxSell", "minCoinAmount", "expiresAt", "status")
+    DECIMALS = ("buyPricePerCoin", "sellPricePerCoin", "minBuy", "maxBuy", "minSell", "maxSell", "minCoinAmount")
+    TIMESTAMPS = ("expiresAt",)
+    __slots__ = _slots(FIELDS)
+
+class Balance(Model):
+    """The balance of a cryptocurrency account, as returned by getBalances."""
+
+    FIELDS = ("id", "cryptocurrency", "confirmedBalance")
+    DECIMALS = ("confirmedBalance",)
+    __slots__ = _slots(FIELDS)
+
+class Transfer(Model):
+    """A cryptocurrency transfer, as returned by send. The transaction field is kept as a dict."""
+
+    FIELDS = ("id", "cryptocurrency", "status", "address", "amount", "fee", "transaction", "createdAt")
+    DECIMALS = ("amount", "fee")
+    TIMESTAMPS = ("createdAt",)
+    __slots__ = _slots(FIELDS)
+
+class Address(Model):
+    """A cryptocurrency address, as returned by createAddress."""
+
+    FIELDS = ("cryptocurrency", "address")
+    __slots__ = _slots(FIELDS)
+
+class DepositAccount(Model):
+    """A naira deposit account, as returned by createDepositAccount."""
+
+    FIELDS = ("accountNumber", "accountName", "accountType", "bankName", "accountReference")
+    __slots__ = _slots(FIELDS)
+
+
+COMMAND_MODELS = {
+    "getPrices": Price,
+    "getBalances": Balance,
+    "getOrders": Order,
+    "getMarketBook": Order,
+    "postLimitOrder": Order,
+    "postMarketOrder": Order,
+    "buy": Order,
+    "sell": Order,
+    "send": Transfer,
+    "createAddress": Address,
+    "createDepositAccount": DepositAccount,
+}
+
+def convert(response:dict, command:str):
+    """Replace the node dicts in the data of a response with result models, in place.
+
+    Lists of nodes become lists of models. The `orders` connection of getOrders and getMarketBook becomes a list of Order models, unwrapped from its edges, while the other fields, such as dynamicPriceExpiry, are left as they are. Responses without data are returned unchanged.
+
+    Args:
+        response (dict):
+            A response dict as returned by parse_response
+
+        command (str):
+            The command the response is for, e.g "getPrices"
+
+    Returns:
+        The same response dict
+    """
+    data = response.get("data")
+    model = COMMAND_MODELS.get(command)
+    if not data or model is None or data.get(command) is None:
+        return response
+
+    value = data[command]
+    if command in ("getOrders", "getMarketBook"):
+        if type(value.get("orders")) is dict and "edges" in value["orders"]:
+            value["orders"] = [model.from_dict(edge["node"]) for edge in value["orders"]["edges"]]
+    elif type(value) is list:
+        data[command] = [model.from_dict(node) for node in value]
+    else:
+        data[command] = model.from_dict(value)
+    return response
@@ -0,0 +1,204 @@
+import heapq
+
+from . import models
+from . import orders
+from . import utilities
+
+BOOK_FIELDS = utilities.compile_fields([{"field":"orders", "fields":[{"field":"edges", "fields": [{"field":"node", "fields":[{"field":"id"}, {"field":"cryptocurrency"}, {"field":"side"}, {"field":"coinAmount"}, {"field":"pricePerCoin"}]}]}]}])
+
+
+class OrderBook:
+    """A local copy of the Buycoins market book, indexed by cryptocurrency and side and ordered by pricePerCoin.
+
+    The book is fed with getMarketBook results, either by calling refresh or by passing order nodes to update. Every update applies the difference from the previous one, so only the orders that were added, removed or changed since the last poll are touched. Prices and coin amounts are kept as Decimal values.
+
+    Example:
+        book = buycoins.OrderBook()
+        book.refresh()
+        book.best_ask("bitcoin") # (Decimal('26599999.0'), Decimal('0.0005'))
+        book.spread("bitcoin")
+        book.depth("bitcoin", "buy", levels=5)
+    """
+
+    def __init__(self):
+        self._orders = {} # order id -> (cryptocurrency, side, price, coin amount)
+        self._raw = {} # order id -> the same fields as received, to compare with the next update
+        self._sides = {} # (cryptocurrency, side) -> _BookSide
+
+    def refresh(self):
+        """Retrieve the market book and apply the difference from the current book.
+
+        The market book is streamed, so only the orders that changed are kept in memory while it is read.
+
+        Returns:
+            The diff dict returned by update.
+
+        Raises:
+            Exception: Raised if the market book could not be retrieved.
+        """
+        return self.update(orders.stream_market_orders(BOOK_FIELDS))
+
+    def update(self, nodes):
+        """Make the book hold exactly the given orders, touching only the orders that differ from the current book.
+
+        Args:
+            nodes (list|dict):
+                The order node dicts of a market book, or a successful response dict of Orders.list_market_orders. Each node needs the id, cryptocurrency, side, coinAmount and pricePerCoin fields.
+
+        Returns:
+            A dict with the ids of the orders that were "added", "changed" and "removed".
+
+        Raises:
+            Exception: Raised if a response dict is not successful or a node is missing a field.
+        """
+        if type(nodes) is dict:
+            nodes = _get_nodes(nodes)
+
+        diff = {"added":[], "changed":[], "removed":[]}
+        seen = set()
+        for node in nodes:
+            try:
+                order_id = node["id"]
+                raw = (node["cryptocurrency"], node["side"], node["pricePerCoin"], node["coinAmount"])
+            except KeyError as e:
+                raise Exception("Order nodes need the id, cryptocurrency, side, coinAmount and pricePerCoin fields. Missing {}".format(e))
+            seen.add(order_id)
+
+            if self._raw.get(order_id) == raw: # unchanged orders are compared as received, without converting their prices
+                continue
+            if order_id in self._orders:
+                self._remove(order_id, self._orders[order_id])
+                diff["changed"].append(order_id)
+            else:
+                diff["added"].append(order_id)
+            self._insert(order_id, (raw[0], raw[1], models._decimal(raw[2]), models._decimal(raw[3]))) # floats through their shortest repr, as models do, not their binary expansion
+            self._raw[order_id] = raw
+
+        if len(seen) < len(self._orders):
+            for order_id in [order_id for order_id in self._orders if order_id not in seen]:
+                self._remove(order_id, self._orders[order_id])
+                del self._raw[order_id]
+                diff["removed"].append(order_id)
+        return diff
+
+    def best_bid(self, cryptocurrency:str):
+        """Return the highest buy price and the coin amount available at it as a (price, amount) tuple, or None if there are no buy orders."""
+        return self._best(cryptocurrency, "buy")
+
+    def best_ask(self, cryptocurrency:str):
+        """Return the lowest sell price and the coin amount available at it as a (price, amount) tuple, or None if there are no sell orders."""
+        return self._best(cryptocurrency, "sell")
+
+    def spread(self, cryptocurrency:str):
+        """Return the best ask price minus the best bid price, or None if either side is empty."""
+        bid, ask = self.best_bid(cryptocurrency), self.best_ask(cryptocurrency)
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def depth(self, cryptocurrency:str, side:str, levels:int=None):
+        """Return the price levels of one side of the book, best first.
+
+        Args:
+            cryptocurrency (str):
+                The cryptocurrency of the orders
+            side (str):
+                "buy" for bids or "sell" for asks
+            levels (int):
+                The number of price levels to return. Every level is returned if it is not set.
+
+        Returns:
+            A list of (price, total coin amount) tuples.
+        """
+        book_side = self._sides.get((cryptocurrency, side))
+        if book_side is None:
+            return []
+        return book_side.depth(levels)
+
+    def get(self, order_id:str):
+        """Return the (cryptocurrency, side, price, coin amount) tuple of an order, or None if it is not in the book."""
+        return self._orders.get(order_id)
+
+    def __len__(self):
+        return len(self._orders)
+
+    def __contains__(self, order_id):
+        return order_id in self._orders
+
+    def _best(self, cryptocurrency, side):
+        book_side = self._sides.get((cryptocurrency, side))
+        if book_side is None:
+            return None
+        return book_side.best()
+
+    def _insert(self, order_id, order):
+        cryptocurrency, side, price, amount = order
+        book_side = self._sides.get((cryptocurrency, side))
+        if book_side is None:
+            book_side = self._sides[(cryptocurrency, side)] = _BookSide(descending=side == "buy")
+        book_side.add(price, amount)
+        self._orders[order_id] = order
+
+    def _remove(self, order_id, order):
+        cryptocurrency, side, price, amount = order
+        self._sides[(cryptocurrency, side)].discard(price, amount)
+        del self._orders[order_id]
+
+
+class _BookSide:
+    """The price levels of one side of the book.
+
+    Levels are aggregated in a dict and their prices kept in a heap with lazy deletion: an emptied level is dropped from the dict at once and from the heap when it reaches the top, so adding and removing an order is O(log n) and the best level is at the top of the heap. The heap is rebuilt from the live levels once emptied levels make up more than half of it, so a book that keeps seeing new prices does not grow without bound.
+    """
+
+    def __init__(self, descending):
+        self._sign = -1 if descending else 1
+        self._levels = {} # price -> [total coin amount, number of orders]
+        self._heap = [] # signed prices, possibly of emptied levels
+        self._in_heap = set()
+
+    def add(self, price, amount):
+        level = self._levels.get(price)
+        if level is None:
+            self._levels[price] = [amount, 1]
+            if price not in self._in_heap:
+                heapq.heappush(self._heap, self._sign * price)
+                self._in_heap.add(price)
+        else:
+            level[0] += amount
+            level[1] += 1
+
+    def discard(self, price, amount):
+        level = self._levels[price]
+        if level[1] == 1:
+            del self._levels[price]
+            if len(self._heap) > 2 * len(self._levels):
+                self._compact()
+        else:
+            level[0] -= amount
+            level[1] -= 1
+
+    def _compact(self):
+        self._heap = [self._sign * price for price in self._levels]
+        heapq.heapify(self._heap)
+        self._in_heap = set(self._levels)
+
+    def best(self):
+        heap = self._heap
+        while heap:
+            price = self._sign * heap[0]
+            if price in self._levels:
+                return (price, self._levels[price][0])
+            heapq.heappop(heap)
+            self._in_heap.discard(price)
+        return None
+
+    def depth(self, levels):
+        prices = self._levels if levels is None else heapq.nsmallest(levels, self._levels, key=lambda price: self._sign * price)
+        return [(price, self._levels[price][0]) for price in sorted(prices, key=lambda price: self._sign * price)]
+
+
+def _get_nodes(response):
+    if response.get("status") != "success":
+        raise Exception("Could not retrieve the market book: {}".format(", ".join(error["reason"] for error in response.get("errors", []))))
+    return [edge["node"] for edge in response["data"]["getMarketBook"]["orders"]["edges"]]
@@ -1,9 +1,20 @@
-import requests
-from requests.auth import HTTPBasicAuth
+import concurrent.futures
+import contextvars
+from . import balance_cache
+from . import models
 from . import utilities
+from .batch import Batch
 
+def _page_fields(node_fields:list):
+    """Return the fields of one page of an orders connection with the given node fields."""
+    return [{"field":"orders", "args":{"first":"$first", "after":"$after"}, "fields":[{"field":"pageInfo", "fields":[{"field":"hasNextPage"}, {"field":"endCursor"}]}, {"field":"edges", "fields":[{"field":"cursor"}, {"field":"node", "fields":node_fields}]}]}]
 
-def list_my_orders(status:str="open", fields:list=[]):
+ORDER_NODE_FIELDS = [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"coinAmount"}, {"field":"side"}, {"field":"status"}, {"field":"createdAt"}, {"field":"pricePerCoin"}, {"field":"priceType"}, {"field":"staticPrice"}, {"field":"dynamicExchangeRate"}]
+ORDER_BOOK_FIELDS = utilities.compile_fields([{"field":"dynamicPriceExpiry"}, {"field":"orders", "fields":[{"field":"edges", "fields": [{"field":"node", "fields":ORDER_NODE_FIELDS}]}]}])
+ORDER_PAGE_FIELDS = utilities.compile_fields(_page_fields(ORDER_NODE_FIELDS))
+ORDER_FIELDS = utilities.compile_fields([{"field":"id"}, {"field":"cryptocurrency"}, {"field":"status"}, {"field":"coinAmount"}, {"field":"side"}, {"field":"createdAt"}, {"field":"pricePerCoin"}, {"field":"priceType"}, {"field":"staticPrice"}, {"field":"dynamicExchangeRate"}])
+
+def list_my_orders(status:str="open", fields:list=[], on_node=None, as_models:bool=False):
     """Retrieve a list of orders made by you on the platform. 
 
     Returns all the orders made by you on the Buycoins platform
@@ -19,6 +30,12 @@ def list_my_orders(status:str="open", fields:list=[]):
 
             Default fields are:
             [{"field": "estimatedFee"}, {"field": "total"}]
+
+        on_node (function):
+            If given, the response is decoded incrementally and every order node is passed to this function as soon as it has been decoded instead of being kept in the returned dict, whose `edges` lists are then empty. It is an `optional` argument.
+
+        as_models (bool):
+            Return the orders as buycoins_client.models.Order instances instead of node dicts. The `orders` connection in the data of the response is then a list of Order models, and on_node is called with Order models. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -34,6 +51,12 @@ def list_my_orders(status:str="open", fields:list=[]):
     Raises:
         Exception: Only raised if the status is invalid or fields having an item dict without the field property.
     """
+    if on_node is not None:
+        return utilities.execute_streaming(_list_my_orders_query, status, fields, on_node=_as_order(on_node) if as_models else on_node)
+    return utilities.execute(_list_my_orders_query, status, fields, as_models=as_models)
+
+def _list_my_orders_query(status, fields):
+    """Validate the arguments of `list_my_orders` and return its query dict."""
 
     if(not status or type(status) is not str or not status.strip()):
         raise Exception("status parameter is compulsory and it is a string. Default is 'open'")
@@ -51,20 +74,13 @@ def list_my_orders(status:str="open", fields:list=[]):
         "operation": "query",
         "command": "getOrders",
         "args": {"status":status},
-        "fields": fields if len(fields) > 0 else [{"field":"dynamicPriceExpiry"}, {"field":"orders", "fields":[{"field":"edges", "fields": [{"field":"node", "fields":[{"field":"id"}, {"field":"cryptocurrency"}, {"field":"coinAmount"}, {"field":"side"}, {"field":"status"}, {"field":"createdAt"}, {"field":"pricePerCoin"}, {"field":"priceType"}, {"field":"staticPrice"}, {"field":"dynamicExchangeRate"}]}]}]}]
+        "fields": fields if len(fields) > 0 else ORDER_BOOK_FIELDS
     }
 
+    return query_dict
 
-    data = utilities.create_request_body(query_dict)
 
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
-
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
-
-def list_market_orders(fields:list=[]):
+def list_market_orders(fields:list=[], on_node=None, as_models:bool=False):
     """Retrieve a list of orders made on the marketplace platform.
     
     Returns all the orders that are available on the Buycoins marketplace
@@ -78,6 +94,12 @@ def list_market_orders(fields:list=[]):
 
             Default fields are:
             [{"field": "estimatedFee"}, {"field": "total"}]
+
+        on_node (function):
+            If given, the response is decoded incrementally and every order node is passed to this function as soon as it has been decoded instead of being kept in the returned dict, whose `edges` lists are then empty. It is an `optional` argument.
+
+        as_models (bool):
+            Return the orders as buycoins_client.models.Order instances instead of node dicts. The `orders` connection in the data of the response is then a list of Order models, and on_node is called with Order models. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -93,6 +115,12 @@ def list_market_orders(fields:list=[]):
     Raises:
         Exception: Only raised if fields having an item dict without the field property.
     """
+    if on_node is not None:
+        return utilities.execute_streaming(_list_market_orders_query, fields, on_node=_as_order(on_node) if as_models else on_node)
+    return utilities.execute(_list_market_orders_query, fields, as_models=as_models)
+
+def _list_market_orders_query(fields):
+    """Validate the arguments of `list_market_orders` and return its query dict."""
     # add validation for fields
 
     if(not utilities.is_valid_fields(fields)):
@@ -101,19 +129,13 @@ def list_market_orders(fields:list=[]):
     query_dict = {
         "operation": "query",
         "command": "getMarketBook",
-        "fields": fields if len(fields) > 0 else [{"field":"dynamicPriceExpiry"}, {"field":"orders", "fields":[{"field":"edges", "fields": [{"field":"node", "fields":[{"field":"id"}, {"field":"cryptocurrency"}, {"field":"coinAmount"}, {"field":"side"}, {"field":"status"}, {"field":"createdAt"}, {"field":"pricePerCoin"}, {"field":"priceType"}, {"field":"staticPrice"}, {"field":"dynamicExchangeRate"}]}]}]}]
+        "fields": fields if len(fields) > 0 else ORDER_BOOK_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
+    return query_dict
 
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
-
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
 
-def post_limit_order(args:dict, fields:list=[]):
+def post_limit_order(args:dict, fields:list=[], as_models:bool=False):
     """Post a limit order
 
     Returns the order data from making a postLimitOrder mutation call on the API. 
@@ -143,6 +165,9 @@ def post_limit_order(args:dict, fields:list=[]):
 
             Default fields are:
             [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"status"}, {"field":"coinAmount"}, {"field":"side"}, {"field":"createdAt"}, {"field":"pricePerCoin"}, {"field":"priceType"}, {"field":"staticPrice"}, {"field":"dynamicExchangeRate"}]
+
+        as_models (bool):
+            Return the result as a buycoins_client.models.Order instance instead of a dict in the data of the response. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -159,13 +184,24 @@ def post_limit_order(args:dict, fields:list=[]):
     Raises:
         Exception: Only raised if any of the args parameter fields are invalid e.g coinAmount not being a float or fields having an item dict without the field property.
     """
-    order_side_types = ["buy", "sell"]
-    price_types = ["static", "dynamic"]
-    
+    response = utilities.execute(_post_limit_order_query, args, fields, as_models=as_models)
+    if not utilities._capturing.get():
+        balance_cache.changed("postLimitOrder", args, response)
+    return response
+
+def _post_limit_order_query(args, fields):
+    """Validate the arguments of `post_limit_order` and return its query dict."""
     # add validation for fields
     if(not utilities.is_valid_fields(fields)):
         raise Exception("Fields contains a node dict without a 'field' property.")
 
+    return _limit_order_query(args, fields)
+
+def _limit_order_query(args, fields):
+    """Validate the args of a limit order and return its query dict, with fields already validated."""
+    order_side_types = ["buy", "sell"]
+    price_types = ["static", "dynamic"]
+
     if not args.get("orderSide") or args.get("orderSide") not in order_side_types:
         raise Exception("orderSide argument must be a valid string that is either 'buy' or 'sell'")
 
@@ -190,20 +226,13 @@ def post_limit_order(args:dict, fields:list=[]):
         "operation": "mutation",
         "command": "postLimitOrder",
         "args": args,
-        "fields": fields if len(fields) > 0 else [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"status"}, {"field":"coinAmount"}, {"field":"side"}, {"field":"createdAt"}, {"field":"pricePerCoin"}, {"field":"priceType"}, {"field":"staticPrice"}, {"field":"dynamicExchangeRate"}]
+        "fields": fields if len(fields) > 0 else ORDER_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
-
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
-
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
+    return query_dict
 
 
-def post_market_order(args:dict, fields:list=[]):
+def post_market_order(args:dict, fields:list=[], as_models:bool=False):
     """Post a market order
 
     Returns the order data from making a postMarketOrder mutation call on the API. 
@@ -227,6 +256,9 @@ def post_market_order(args:dict, fields:list=[]):
 
             Default fields are:
             [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"status"}, {"field":"coinAmount"}, {"field":"side"}, {"field":"createdAt"}, {"field":"pricePerCoin"}, {"field":"priceType"}, {"field":"staticPrice"}, {"field":"dynamicExchangeRate"}]
+
+        as_models (bool):
+            Return the result as a buycoins_client.models.Order instance instead of a dict in the data of the response. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -243,12 +275,23 @@ def post_market_order(args:dict, fields:list=[]):
     Raises:
         Exception: Only raised if any of the args parameter fields are invalid e.g coinAmount not being a float or fields having an item dict without the field property.
     """
-    order_side_types = ["buy", "sell"]
-    
+    response = utilities.execute(_post_market_order_query, args, fields, as_models=as_models)
+    if not utilities._capturing.get():
+        balance_cache.changed("postMarketOrder", args, response)
+    return response
+
+def _post_market_order_query(args, fields):
+    """Validate the arguments of `post_market_order` and return its query dict."""
     # add validation for fields
     if(not utilities.is_valid_fields(fields)):
         raise Exception("Fields contains a node dict without a 'field' property.")
 
+    return _market_order_query(args, fields)
+
+def _market_order_query(args, fields):
+    """Validate the args of a market order and return its query dict, with fields already validated."""
+    order_side_types = ["buy", "sell"]
+
     if not args.get("orderSide") or args.get("orderSide") not in order_side_types:
         raise Exception("orderSide argument must be a valid string that is either 'buy' or 'sell'")
 
@@ -262,15 +305,266 @@ def post_market_order(args:dict, fields:list=[]):
         "operation": "mutation",
         "command": "postMarketOrder",
         "args": args,
-        "fields": fields if len(fields) > 0 else [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"status"}, {"field":"coinAmount"}, {"field":"side"}, {"field":"createdAt"}, {"field":"pricePerCoin"}, {"field":"priceType"}, {"field":"staticPrice"}, {"field":"dynamicExchangeRate"}]
+        "fields": fields if len(fields) > 0 else ORDER_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
+    return query_dict
 
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
 
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
+def post_limit_orders(orders_args:list, fields:list=[], concurrency:int=None, as_models:bool=False):
+    """Post several limit orders at once
+
+    Every order is validated before any is sent, and the fields once for all of them. By default the orders are sent as aliased postLimitOrder mutations of a single graphql document, which the API carries out one after the other in one round trip. With concurrency, each order is sent as its own request instead, over a pool of that many threads.
+
+    Args:
+        orders_args (list):
+            The args dicts of the orders, each in the format post_limit_order takes
+
+        fields (list):
+            The fields you want returned for every order, as for post_limit_order. It is an `optional` argument.
+
+        concurrency (int):
+            The number of orders sent at the same time, one request each. It is an `optional` argument; the orders share one request if it is absent.
+
+        as_models (bool):
+            Return the results as buycoins_client.models.Order instances instead of dicts in the data of the responses. It is an `optional` argument.
+
+    Returns:
+        A list with the response dict of every order in the order they were given, each in the same format as the response of post_limit_order, so one failed order does not affect the status of the others. For example:
+
+        [{"status":"success", "data":{"postLimitOrder":{"id":"afWGFdfa823ladfadfja", "status":"active"}}},
+         {"status":"failure", "errors":[{"reason":"Insufficient balance", "field":None}], "raw":[...]}]
+
+        With concurrency, an order whose request raised an exception, such as a connection error, gets a failure response with the exception as its reason.
+
+    Raises:
+        Exception: Raised if orders_args is not a list of order args dicts, if any of them is invalid, with the position of the order in the message, or if fields is invalid. No order is sent in that case.
+    """
+    return _post_bulk(_bulk_query_dicts(_limit_order_query, orders_args, fields, as_models), concurrency)
+
+def post_market_orders(orders_args:list, fields:list=[], concurrency:int=None, as_models:bool=False):
+    """Post several market orders at once
+
+    Works like post_limit_orders, with the args dict of each order in the format post_market_order takes.
+
+    Args:
+        orders_args (list):
+            The args dicts of the orders, each in the format post_market_order takes
+
+        fields (list):
+            The fields you want returned for every order, as for post_market_order. It is an `optional` argument.
+
+        concurrency (int):
+            The number of orders sent at the same time, one request each. It is an `optional` argument; the orders share one request if it is absent.
+
+        as_models (bool):
+            Return the results as buycoins_client.models.Order instances instead of dicts in the data of the responses. It is an `optional` argument.
+
+    Returns:
+        A list with the response dict of every order in the order they were given, see post_limit_orders
+
+    Raises:
+        Exception: Raised if orders_args is not a list of order args dicts, if any of them is invalid, or if fields is invalid. No order is sent in that case.
+    """
+    return _post_bulk(_bulk_query_dicts(_market_order_query, orders_args, fields, as_models), concurrency)
+
+def _bulk_query_dicts(build, orders_args, fields, as_models):
+    """Validate the fields once and the args of every order, and return their query dicts."""
+    if type(orders_args) is not list or not orders_args:
+        raise Exception("orders_args must be a non-empty list of order args dicts.")
+
+    if(not utilities.is_valid_fields(fields)):
+        raise Exception("Fields contains a node dict without a 'field' property.")
+
+    query_dicts = []
+    for position, args in enumerate(orders_args):
+        if type(args) is not dict:
+            raise Exception("Order {}: args must be a dict.".format(position))
+        try:
+            query_dict = build(args, fields)
+        except Exception as e:
+            raise Exception("Order {}: {}".format(position, e))
+        if as_models:
+            query_dict["as_models"] = True
+        query_dicts.append(query_dict)
+    return query_dicts
+
+def _check_concurrency(concurrency):
+    if concurrency is not None and (type(concurrency) is not int or concurrency <= 0):
+        raise Exception("concurrency must be an integer greater than 0.")
+
+def _post_bulk(query_dicts, concurrency):
+    _check_concurrency(concurrency)
+    utilities.check_auth() # raised once, not as the failure of every order
+    if concurrency is None:
+        batch = Batch()
+        for query_dict in query_dicts:
+            batch._add_query(query_dict)
+        return batch.send()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(concurrency, len(query_dicts))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, _post_one, query_dict) for query_dict in query_dicts]
+        return [future.result() for future in futures]
+
+def _post_one(query_dict):
+    try:
+        response = utilities.execute(dict, query_dict) # copies the query dict, which is already built
+    except Exception as e:
+        return _exception_response(e)
+    balance_cache.changed(query_dict["command"], query_dict["args"], response)
+    return response
+
+def _exception_response(error):
+    """Return the failure response of an order whose request raised error."""
+    return {"status": "failure", "errors": [{"reason": str(error) or repr(error), "field": None}], "raw": []}
+
+
+def iter_my_orders(status:str="open", node_fields:list=[], page_size:int=50, prefetch:bool=True):
+    """Iterate over the orders made by you on the platform one order at a time.
+
+    Pages through the `orders` connection of the `getOrders` query with `first` and `after` cursors, so only the current page and the prefetched next page are held in memory however many orders there are.
+
+    Args:
+        status (str):
+            The status of the order. It is either "completed" or "open"
+
+        node_fields (list):
+            The fields you want returned for each order. It defaults to all the fields of an order node if this argument is absent or empty. An example field dict is represented as:
+
+            {"field": "pricePerCoin"}
+
+        page_size (int):
+            The number of orders requested per page. Defaults to 50.
+
+        prefetch (bool):
+            If True, the next page is requested in the background while the current one is being consumed. Defaults to True.
+
+    Returns:
+        A generator of order node dicts. For example:
+
+        {"id":"UG9zdE9yZGVyLTg5NDUxNTM2", "cryptocurrency":"bitcoin", "pricePerCoin":"26599999.0"}
+
+    Raises:
+        Exception: Raised immediately if the status, node_fields or page_size are invalid, and during iteration if a page cannot be retrieved.
+    """
+    _iter_my_orders_query(status, node_fields, page_size, None) # validate before the first page is requested
+    return _iter_nodes(_iter_my_orders_query, "getOrders", prefetch, status, node_fields, page_size)
+
+def _iter_my_orders_query(status, node_fields, page_size, after):
+    """Validate the arguments of `iter_my_orders` and return the query dict for the page after the `after` cursor."""
+    query_dict = _list_my_orders_query(status, node_fields)
+    return _page_query(query_dict, node_fields, page_size, after)
+
+def iter_market_orders(node_fields:list=[], page_size:int=50, prefetch:bool=True):
+    """Iterate over the orders available on the Buycoins marketplace one order at a time.
+
+    Pages through the `orders` connection of the `getMarketBook` query with `first` and `after` cursors, so only the current page and the prefetched next page are held in memory however deep the market book is.
+
+    Args:
+        node_fields (list):
+            The fields you want returned for each order. It defaults to all the fields of an order node if this argument is absent or empty.
+
+        page_size (int):
+            The number of orders requested per page. Defaults to 50.
+
+        prefetch (bool):
+            If True, the next page is requested in the background while the current one is being consumed. Defaults to True.
+
+    Returns:
+        A generator of order node dicts.
+
+    Raises:
+        Exception: Raised immediately if the node_fields or page_size are invalid, and during iteration if a page cannot be retrieved.
+    """
+    _iter_market_orders_query(node_fields, page_size, None) # validate before the first page is requested
+    return _iter_nodes(_iter_market_orders_query, "getMarketBook", prefetch, node_fields, page_size)
+
+def _iter_market_orders_query(node_fields, page_size, after):
+    """Validate the arguments of `iter_market_orders` and return the query dict for the page after the `after` cursor."""
+    query_dict = _list_market_orders_query(node_fields)
+    return _page_query(query_dict, node_fields, page_size, after)
+
+def _page_query(query_dict, node_fields, page_size, after):
+    if type(page_size) is not int or page_size <= 0:
+        raise Exception("page_size must be an integer greater than 0.")
+
+    query_dict["fields"] = _page_fields(node_fields) if len(node_fields) > 0 else ORDER_PAGE_FIELDS
+    query_dict["variables"] = {"first": ("Int", page_size), "after": ("String", after)}
+    return query_dict
+
+def _get_connection(response, command):
+    """Return the orders connection of a page response, or raise an Exception with the reasons the page failed."""
+    if response["status"] != "success":
+        raise Exception("Could not retrieve a page of orders: {}".format("; ".join(error["reason"] for error in response["errors"])))
+
+    return response["data"][command]["orders"]
+
+def _iter_nodes(build, command, prefetch, *args):
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1) if prefetch else None
+    fetch = lambda after: _get_connection(utilities.execute(build, *(args + (after,))), command)
+    try:
+        page = fetch(None)
+        while True:
+            page_info = page["pageInfo"]
+            if page_info["hasNextPage"] and executor:
+                next_page = executor.submit(contextvars.copy_context().run, fetch, page_info["endCursor"])
+
+            for edge in page["edges"]:
+                yield edge["node"]
+
+            if not page_info["hasNextPage"]:
+                return
+            page = None # let the consumed page be freed while waiting for the next one
+            page = next_page.result() if executor else fetch(page_info["endCursor"])
+    finally:
+        if executor:
+            executor.shutdown(wait=False)
+
+
+def stream_my_orders(status:str="open", fields:list=[]):
+    """Iterate over the orders made by you on the platform as they are decoded from a single getOrders response.
+
+    Unlike iter_my_orders this makes one request, but the response body is decoded incrementally, so an order can be processed before the rest of the response has arrived and no order is kept after it has been yielded.
+
+    Args:
+        status (str):
+            The status of the order. It is either "completed" or "open"
+
+        fields (list):
+            The fields you want returned by the graphql query, as for list_my_orders.
+
+    Returns:
+        A generator of order node dicts.
+
+    Raises:
+        Exception: Raised immediately if the status or fields are invalid, and during iteration if the request fails.
+    """
+    query_dict = _list_my_orders_query(status, fields) # validate before the request is sent
+    return _stream_nodes(query_dict)
+
+def stream_market_orders(fields:list=[]):
+    """Iterate over the orders available on the Buycoins marketplace as they are decoded from a single getMarketBook response.
+
+    Unlike iter_market_orders this makes one request, but the response body is decoded incrementally, so an order can be processed before the rest of the market book has arrived and no order is kept after it has been yielded.
+
+    Args:
+        fields (list):
+            The fields you want returned by the graphql query, as for list_market_orders.
+
+    Returns:
+        A generator of order node dicts.
+
+    Raises:
+        Exception: Raised immediately if the fields are invalid, and during iteration if the request fails.
+    """
+    query_dict = _list_market_orders_query(fields) # validate before the request is sent
+    return _stream_nodes(query_dict)
+
+def _stream_nodes(query_dict):
+    response = yield from utilities.stream(query_dict)
+    if response["status"] != "success":
+        raise Exception("Could not retrieve orders: {}".format("; ".join(error["reason"] for error in response["errors"])))
 
+def _as_order(on_node):
+    """Wrap an on_node callback so it is called with Order models instead of node dicts."""
+    return lambda node: on_node(models.Order.from_dict(node))
@@ -0,0 +1,211 @@
+import threading
+import warnings
+
+from . import prices
+
+WATCHED_FIELDS = ["buyPricePerCoin", "sellPricePerCoin", "minSell", "maxSell", "expiresAt"]
+
+
+class PriceWatcher:
+    """Polls getPrices on one schedule for any number of subscribers and tells each of them only what changed.
+
+    The watcher keeps the last price of every cryptocurrency in snapshot, keyed by cryptocurrency. After every poll each subscriber is called with the watched fields that changed since the previous poll, e.g {"bitcoin": {"sellPricePerCoin": "17827839.315", "expiresAt": 1612391202}}, and is not called at all when nothing it watches changed. A cryptocurrency that is no longer priced is reported as None.
+
+    Polls are coalesced: refresh calls made while a poll is in flight, from the polling thread or any other, wait for that poll and share its result instead of sending their own request.
+
+    Args:
+        interval (float):
+            Seconds between polls once start has been called. Defaults to 5.
+        fields (list):
+            The price fields to watch. Defaults to WATCHED_FIELDS: buyPricePerCoin, sellPricePerCoin, minSell, maxSell and expiresAt.
+        client (BuycoinsClient):
+            The client to poll with. Defaults to the module functions and the credentials of Auth.setup.
+
+    Raises:
+        Exception: Raised if interval is not a number greater than 0 or fields is not a list of field names.
+
+    Example:
+        watcher = buycoins.PriceWatcher(interval=2)
+        watcher.subscribe(lambda changes: print(changes), ["bitcoin"])
+        with watcher: # polls in the background until the block ends
+            ...
+    """
+
+    def __init__(self, interval:float=5.0, fields:list=WATCHED_FIELDS, client=None):
+        if type(interval) not in (int, float) or interval <= 0:
+            raise Exception("interval must be a number of seconds greater than 0.")
+        if type(fields) is not list or not fields or not all(type(field) is str for field in fields):
+            raise Exception("fields must be a list of price field names.")
+
+        self.interval = interval
+        self.fields = list(fields)
+        self.client = client
+        self.snapshot = {} # cryptocurrency -> the last price node
+        self.last_error = None
+        # not compiled with compile_fields, which keeps every list for good; its selection is served from the bounded cache of selections
+        self._query_fields = [{"field": field} for field in ["id", "cryptocurrency"] + [field for field in self.fields if field not in ("id", "cryptocurrency")]]
+        self._subscribers = [] # (callback, cryptocurrencies or None)
+        self._lock = threading.Lock()
+        self._flight = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback, cryptocurrencies:list=None):
+        """Call callback with the changes of every poll.
+
+        If a snapshot has already been taken, callback is first called with the whole snapshot of the cryptocurrencies it watches.
+
+        Args:
+            callback (function):
+                Called with a {cryptocurrency: {field: new value}} dict
+            cryptocurrencies (list):
+                The cryptocurrencies to be told about. Every cryptocurrency by default.
+
+        Returns:
+            The callback, so subscribe can be used as a decorator
+        """
+        if not callable(callback):
+            raise Exception("callback must be a function that takes a dict of changes.")
+        subscriber = (callback, frozenset(cryptocurrencies) if cryptocurrencies is not None else None)
+        with self._lock:
+            self._subscribers.append(subscriber)
+            current = {cryptocurrency: self._watched(node) for cryptocurrency, node in self.snapshot.items()}
+        self._call(subscriber, current)
+        return callback
+
+    def unsubscribe(self, callback):
+        """Stop calling a subscribed callback. Unknown callbacks are ignored."""
+        with self._lock:
+            self._subscribers = [subscriber for subscriber in self._subscribers if subscriber[0] is not callback]
+
+    def get(self, cryptocurrency:str):
+        """Return the last price node of a cryptocurrency, or None if it has not been seen."""
+        return self.snapshot.get(cryptocurrency)
+
+    def refresh(self):
+        """Poll getPrices now, update the snapshot and notify the subscribers.
+
+        Returns:
+            The changes of the poll, in the format subscribers are called with
+
+        Raises:
+            Exception: Raised if the prices could not be retrieved. The snapshot is left as it was.
+        """
+        with self._lock:
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight()
+        if not leader: # a poll is already in flight; share its result
+            return flight.wait()
+
+        try:
+            changes = self._apply(self._fetch())
+            flight.result = changes
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+        self._notify(changes)
+        return changes
+
+    def start(self):
+        """Poll every interval seconds on a background thread until stop is called, and return the watcher."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="buycoins-price-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling and wait for the background thread to finish."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = e
+                warnings.warn("PriceWatcher could not poll the prices: {}".format(e), RuntimeWarning)
+            self._stop.wait(self.interval)
+
+    def _fetch(self):
+        response = (self.client.Prices if self.client is not None else prices).list(self._query_fields)
+        return _price_nodes(response)
+
+    def _watched(self, node):
+        return {field: node.get(field) for field in self.fields}
+
+    def _apply(self, nodes):
+        """Replace the snapshot with the given price nodes and return the watched fields that changed."""
+        changes = {}
+        seen = set()
+        with self._lock:
+            for node in nodes:
+                cryptocurrency = node.get("cryptocurrency")
+                seen.add(cryptocurrency)
+                previous = self.snapshot.get(cryptocurrency)
+                changed = {field: node.get(field) for field in self.fields if previous is None or previous.get(field) != node.get(field)}
+                if changed:
+                    changes[cryptocurrency] = changed
+                self.snapshot[cryptocurrency] = node
+            for cryptocurrency in [cryptocurrency for cryptocurrency in self.snapshot if cryptocurrency not in seen]:
+                del self.snapshot[cryptocurrency]
+                changes[cryptocurrency] = None
+        return changes
+
+    def _notify(self, changes):
+        if not changes:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            self._call(subscriber, changes)
+
+    def _call(self, subscriber, changes):
+        callback, cryptocurrencies = subscriber
+        if cryptocurrencies is not None:
+            changes = {cryptocurrency: change for cryptocurrency, change in changes.items() if cryptocurrency in cryptocurrencies}
+        if not changes:
+            return
+        try:
+            callback(changes)
+        except Exception as e:
+            warnings.warn("PriceWatcher subscriber {callback!r} raised {error!r}".format(callback=callback, error=e), RuntimeWarning)
+
+
+class _Flight:
+    """The result of a poll that other refresh calls wait for."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _price_nodes(response):
+    """Return the price nodes of a getPrices response, or raise an Exception with the reasons it failed."""
+    if response["status"] != "success":
+        raise Exception("Could not retrieve prices: {}".format("; ".join(error["reason"] for error in response["errors"])))
+    return response["data"]["getPrices"] or []
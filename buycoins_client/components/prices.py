@@ -1,9 +1,9 @@
-import requests
-from requests.auth import HTTPBasicAuth
 from . import utilities
 
+DEFAULT_FIELDS = utilities.compile_fields([{"field":"id"}, {"field":"cryptocurrency"}, {"field":"sellPricePerCoin"}, {"field":"minSell"}, {"field":"maxSell"}, {"field":"expiresAt"}])
 
-def list(fields:list = []):
+
+def list(fields:list = [], as_models:bool=False):
     """Retrieve a list of cryptocurrency prices
 
     Returns the list of cryptocurrency prices being traded on the Buycoins platform. It utilizes the `getPrices` query on the API.
@@ -17,6 +17,9 @@ def list(fields:list = []):
 
             Default fields are:
             [{"field": "id"}, {"field": "minSell"}]
+
+        as_models (bool):
+            Return the prices as buycoins_client.models.Price instances instead of node dicts in the data of the response. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -33,6 +36,10 @@ def list(fields:list = []):
     Raises:
         Exception: Only raised if fields parameter has an item dict without the field property.
     """
+    return utilities.execute(_list_query, fields, as_models=as_models)
+
+def _list_query(fields):
+    """Validate the arguments of `list` and return its query dict."""
     # add validation for fields
 
     if(not utilities.is_valid_fields(fields)):
@@ -41,15 +48,7 @@ def list(fields:list = []):
     query_dict = {
         "operation": "query",
         "command": "getPrices",
-        "fields": fields if len(fields) > 0 else [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"sellPricePerCoin"}, {"field":"minSell"}, {"field":"maxSell"}, {"field":"expiresAt"}]
+        "fields": fields if len(fields) > 0 else DEFAULT_FIELDS
     }
 
-
-    data = utilities.create_request_body(query_dict)
-    
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
-
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
+    return query_dict
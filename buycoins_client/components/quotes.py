@@ -0,0 +1,263 @@
+import asyncio
+import contextvars
+import threading
+import time
+import warnings
+
+from . import prices
+from . import utilities
+from .price_watcher import _price_nodes
+
+QUOTE_CACHE = None
+QUOTE_FIELDS = utilities.compile_fields([{"field":"id"}, {"field":"cryptocurrency"}, {"field":"buyPricePerCoin"}, {"field":"sellPricePerCoin"}, {"field":"expiresAt"}])
+RETRY_DELAY = 1.0 # seconds the background thread waits after a failed refresh
+
+
+class QuoteCache:
+    """Keeps the price quote of every cryptocurrency until just before it expires, so Transfers.buy and Transfers.sell do not have to call getPrices first.
+
+    getPrices returns one quote per cryptocurrency with an `id`, the price id buy and sell need, and an `expiresAt` timestamp. The cache fetches all quotes with a single getPrices request and hands out a quote until `margin` seconds before its expiresAt, after which the next lookup fetches fresh quotes. Lookups that miss at the same time share one request.
+
+    Once start has been called, a background thread replaces the quotes `refresh_ahead` seconds before they stop being handed out, so trades never wait for getPrices.
+
+    Buy and sell calls without a `price` argument, blocking or aio, use the cache set with set_quote_cache, or the quote_cache of the BuycoinsClient making the call. A trade the API rejects because the cached price expired is sent once more with a freshly fetched quote.
+
+    Args:
+        margin (float):
+            Seconds before its expiresAt at which a quote is no longer used, to leave time for the trade to reach the API. Defaults to 3.
+        refresh_ahead (float):
+            Seconds before a quote stops being used at which the background thread refreshes it. Defaults to 2.
+        client (BuycoinsClient):
+            The client to fetch the quotes with. Defaults to the module functions and the credentials of Auth.setup.
+
+    Raises:
+        Exception: Raised if margin or refresh_ahead is not a number greater than or equal to 0.
+
+    Example:
+        quotes = buycoins.QuoteCache(margin=5).start()
+        buycoins.set_quote_cache(quotes)
+        buycoins.Transfers.buy({"cryptocurrency": "bitcoin", "coin_amount": 0.01}) # no getPrices call
+    """
+
+    def __init__(self, margin:float=3.0, refresh_ahead:float=2.0, client=None):
+        if type(margin) not in (int, float) or margin < 0:
+            raise Exception("margin must be a number of seconds greater than or equal to 0.")
+        if type(refresh_ahead) not in (int, float) or refresh_ahead < 0:
+            raise Exception("refresh_ahead must be a number of seconds greater than or equal to 0.")
+
+        self.margin = margin
+        self.refresh_ahead = refresh_ahead
+        self.client = client
+        self.quotes = {} # cryptocurrency -> the last quote node
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get(self, cryptocurrency:str):
+        """Return a quote of a cryptocurrency that is valid for at least margin more seconds, fetching the quotes if needed.
+
+        Args:
+            cryptocurrency (str):
+                The cryptocurrency to quote e.g "bitcoin"
+
+        Returns:
+            The getPrices node of the cryptocurrency, e.g {"id": "QnV5Y29pbnNQcmljZS0x", "cryptocurrency": "bitcoin", "buyPricePerCoin": "26260000", "sellPricePerCoin": "25740000", "expiresAt": 1612391202}
+
+        Raises:
+            Exception: Raised if the quotes could not be retrieved, the API has no price for the cryptocurrency or its quote expires within margin seconds even after fetching it twice.
+        """
+        quote = self._valid(cryptocurrency)
+        if quote is not None:
+            return quote
+
+        with self._fetch_lock:
+            quote = self._valid(cryptocurrency) # another thread may have fetched the quotes while this one waited
+            for _ in range(2): # a quote fetched just before the API replaces it can already be inside the margin
+                if quote is not None:
+                    break
+                self._fetch()
+                quote = self._valid(cryptocurrency)
+        if quote is None:
+            if cryptocurrency in self.quotes:
+                raise Exception("The price quote for {} expires within the {} second margin.".format(cryptocurrency, self.margin))
+            raise Exception("No price quote is available for {}.".format(cryptocurrency))
+        return quote
+
+    def price_id(self, cryptocurrency:str):
+        """Return the price id of a valid quote of a cryptocurrency, see get."""
+        return self.get(cryptocurrency)["id"]
+
+    def refresh(self):
+        """Fetch the quotes of every cryptocurrency now and return them.
+
+        Raises:
+            Exception: Raised if the quotes could not be retrieved. The cached quotes are left as they were.
+        """
+        with self._fetch_lock:
+            return self._fetch()
+
+    def invalidate(self, cryptocurrency:str=None):
+        """Drop the quote of a cryptocurrency, or every quote, so the next lookup fetches fresh ones."""
+        with self._lock:
+            if cryptocurrency is None:
+                self.quotes = {}
+            else:
+                self.quotes.pop(cryptocurrency, None)
+
+    def start(self):
+        """Refresh the quotes on a background thread before they expire until stop is called, and return the cache."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="buycoins-quote-cache", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop refreshing and wait for the background thread to finish."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _valid(self, cryptocurrency):
+        quote = self.quotes.get(cryptocurrency)
+        if quote is None or quote.get("expiresAt") is None:
+            return None
+        if quote["expiresAt"] - self.margin <= time.time():
+            return None
+        return quote
+
+    def _fetch(self):
+        token = utilities._capturing.set(False) # the quotes of a captured trade, e.g one added to a Batch, are still fetched
+        try:
+            response = (self.client.Prices if self.client is not None else prices).list(QUOTE_FIELDS)
+        finally:
+            utilities._capturing.reset(token)
+        nodes = _price_nodes(response)
+        quotes = {node["cryptocurrency"]: node for node in nodes}
+        with self._lock:
+            self.quotes = quotes
+        return quotes
+
+    def _next_refresh(self):
+        """Seconds until the first quote should be replaced."""
+        expiries = [quote["expiresAt"] for quote in self.quotes.values() if quote.get("expiresAt") is not None]
+        if not expiries:
+            return 0
+        return min(expiries) - self.margin - self.refresh_ahead - time.time()
+
+    def _run(self):
+        while not self._stop.is_set():
+            wait = self._next_refresh()
+            if wait > 0:
+                self._stop.wait(wait)
+                continue
+            try:
+                self.refresh()
+                wait = self._next_refresh()
+            except Exception as e:
+                self.last_error = e
+                warnings.warn("QuoteCache could not refresh the quotes: {}".format(e), RuntimeWarning)
+                wait = 0
+            if wait <= 0: # the API handed out quotes that are already due, don't poll in a tight loop
+                self._stop.wait(RETRY_DELAY)
+
+
+def set_quote_cache(cache):
+    """Set the QuoteCache that Transfers.buy and Transfers.sell take price ids from when they are called without a `price` argument.
+
+    Args:
+        cache (QuoteCache):
+            The cache to use, or None to require a price argument again
+
+    Raises:
+        Exception: Raised if cache is not a QuoteCache instance or None.
+    """
+    global QUOTE_CACHE
+    if cache is not None and not isinstance(cache, QuoteCache):
+        raise Exception("cache must be an instance of buycoins_client.QuoteCache")
+    QUOTE_CACHE = cache
+
+def get_quote_cache():
+    """Return the QuoteCache of the BuycoinsClient making the current call, or the one set with set_quote_cache."""
+    client = utilities._client.get()
+    if client is not None and client.quote_cache is not None:
+        return client.quote_cache
+    return QUOTE_CACHE
+
+def with_price(args:dict):
+    """Return trade args with the price id of a cached quote filled in when they have no price.
+
+    Args that already have a price, and any args when no QuoteCache is set, are returned as they are.
+    """
+    if type(args) is not dict or args.get("price") is not None:
+        return args
+    cache = get_quote_cache()
+    if cache is None or type(args.get("cryptocurrency")) is not str:
+        return args
+    return dict(args, price=cache.price_id(args["cryptocurrency"]))
+
+async def with_price_async(args:dict):
+    """Awaitable version of with_price. Quotes that have to be fetched are fetched on a worker thread, so the event loop is not blocked."""
+    if type(args) is not dict or args.get("price") is not None:
+        return args
+    cache = get_quote_cache()
+    if cache is None or type(args.get("cryptocurrency")) is not str:
+        return args
+    quote = cache._valid(args["cryptocurrency"])
+    if quote is not None or utilities._capturing.get(): # a captured call must not suspend, see utilities.capture, so its quotes are fetched blocking
+        return dict(args, price=quote["id"] if quote is not None else cache.price_id(args["cryptocurrency"]))
+    return await asyncio.get_running_loop().run_in_executor(None, contextvars.copy_context().run, with_price, args)
+
+def rejected(args:dict, response:dict):
+    """Drop the quote a failed trade was made with, so the next trade does not reuse a price the API no longer accepts.
+
+    Returns:
+        True if the API rejected the price as expired, in which case the trade can be sent again with a fresh quote
+    """
+    if type(response) is not dict or response.get("status") != "failure":
+        return False
+    cache = get_quote_cache()
+    if cache is not None:
+        cache.invalidate(args.get("cryptocurrency"))
+    return cache is not None and any("expired" in str(error.get("reason")).lower() for error in response.get("errors") or [])
+
+def trade(send, args:dict):
+    """Send a buy or sell, filling in the price id of a cached quote when args have no price.
+
+    A trade whose cached price the API rejected as expired is sent once more with a freshly fetched quote.
+
+    Args:
+        send (function):
+            Sends the trade with the args it is given and returns its response
+        args (dict):
+            The args of the Transfers.buy or Transfers.sell call
+
+    Returns:
+        The args the trade was last sent with and its response
+    """
+    priced = with_price(args)
+    response = send(priced)
+    if priced is not args and rejected(priced, response):
+        priced = with_price(args)
+        response = send(priced)
+        rejected(priced, response)
+    return priced, response
+
+async def trade_async(send, args:dict):
+    """Awaitable version of trade, for a send function that returns a coroutine."""
+    priced = await with_price_async(args)
+    response = await send(priced)
+    if priced is not args and rejected(priced, response):
+        priced = await with_price_async(args)
+        response = await send(priced)
+        rejected(priced, response)
+    return priced, response
@@ -0,0 +1,95 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+
+
+class RateLimiter:
+    """A token bucket rate limiter that paces requests to the API, with a global budget and optional budgets per command.
+
+    Each budget is a bucket that holds up to burst tokens and refills at rate tokens per second. Every request takes a token from the global bucket and from the bucket of each command it sends; when a bucket is empty the request waits for its turn instead of being sent and rejected by the API. Turns are handed out in the order requests arrive, so many threads sharing a limiter are spread evenly over time rather than bursting together.
+
+    With shared=True the buckets live in shared memory, so worker processes started with multiprocessing (or forked) after the limiter was created share one budget.
+
+    Args:
+        rate (float):
+            The number of requests per second allowed across all commands
+        burst (float):
+            The number of requests that may be sent at once after a quiet period. Defaults to rate, or 1 if rate is lower.
+        commands (dict):
+            The budget of individual commands, as a rate or a (rate, burst) tuple, e.g {"getBalances": 2, "getPrices": (5, 10)}
+        shared (bool):
+            Whether to keep the buckets in shared memory for use by several processes. Defaults to False.
+
+    Raises:
+        Exception: Raised if a rate is not a number greater than 0 or a burst is lower than 1.
+
+    Example:
+        limiter = buycoins.RateLimiter(10, commands={"getBalances": 2})
+        buycoins.set_transport(buycoins.Transport(rate_limiter=limiter))
+    """
+
+    def __init__(self, rate:float, burst:float=None, commands:dict=None, shared:bool=False):
+        self._index = {None: 0}
+        self._rates = []
+        self._bursts = []
+        self._add_budget(None, rate, burst)
+        for command, budget in sorted((commands or {}).items()):
+            self._index[command] = len(self._rates)
+            self._add_budget(command, *(budget if type(budget) is tuple else (budget,)))
+
+        now = time.monotonic()
+        state = [value for burst in self._bursts for value in (burst, now)] # the tokens of each bucket and when they were counted
+        if shared:
+            context = multiprocessing.get_context()
+            self._state = context.RawArray("d", state)
+            self._lock = context.Lock()
+        else:
+            self._state = state
+            self._lock = threading.Lock()
+        self.shared = shared
+
+    def _add_budget(self, command, rate, burst=None):
+        if type(rate) not in (int, float) or rate <= 0:
+            raise Exception("The rate of {} must be a number of requests per second greater than 0.".format("the " + command + " budget" if command else "a RateLimiter"))
+        burst = burst if burst is not None else max(rate, 1)
+        if burst < 1:
+            raise Exception("The burst of {} must be at least 1 request.".format("the " + command + " budget" if command else "a RateLimiter"))
+        self._rates.append(float(rate))
+        self._bursts.append(float(burst))
+
+    def reserve(self, commands=()):
+        """Take a token from the global bucket and the bucket of each command, and return how many seconds the request has to wait for them.
+
+        Args:
+            commands (list):
+                The commands the request sends. Commands without a budget of their own only count towards the global budget.
+
+        Returns:
+            The number of seconds to wait before sending, 0 if the request can be sent at once
+        """
+        buckets = [0] + [self._index[command] for command in set(commands) if command in self._index]
+        state = self._state
+        wait = 0.0
+        with self._lock:
+            now = time.monotonic()
+            for bucket in buckets:
+                tokens = min(self._bursts[bucket], state[2 * bucket] + (now - state[2 * bucket + 1]) * self._rates[bucket]) - 1
+                state[2 * bucket], state[2 * bucket + 1] = tokens, now
+                if tokens < 0: # the turn of this request comes once the debt has been refilled
+                    wait = max(wait, -tokens / self._rates[bucket])
+        return wait
+
+    def acquire(self, commands=()):
+        """Wait until a request sending the given commands is within budget. Returns the number of seconds waited."""
+        wait = self.reserve(commands)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, commands=()):
+        """Awaitable version of acquire, which waits without blocking the event loop."""
+        wait = self.reserve(commands)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
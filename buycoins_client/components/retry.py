@@ -0,0 +1,180 @@
+import asyncio
+import email.utils
+import random
+import time
+
+import requests
+
+try:
+    import aiohttp
+except ImportError: # aiohttp is only needed by the asyncio client
+    aiohttp = None
+
+from urllib3.exceptions import ConnectTimeoutError
+
+# errors that leave a query safe to send again
+_TRANSIENT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError, asyncio.TimeoutError)
+if aiohttp is not None:
+    _TRANSIENT_ERRORS += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+
+class RetryPolicy:
+    """Decides when a failed request is sent again and how long to wait before each attempt.
+
+    Queries are retried after connection errors, timeouts and the retryable status codes (429, 502, 503 and 504 by default). Mutations (send, buy, sell, postLimitOrder, postMarketOrder, ...) move money, so they are only retried when the request provably never reached the API: when the connection could not be opened. A mutation that failed after it was sent is never repeated, since the API might have carried it out.
+
+    The wait between attempts follows the "decorrelated jitter" backoff: a random delay between base and three times the previous delay, capped at cap seconds, which spreads the retries of many clients apart. A Retry-After header sent with a 429 or 503 response is honored if it asks for a longer wait, unless it is longer than max_retry_after, in which case the response is returned as it is.
+
+    Every attempt is recorded in the "attempts" list of the response dict returned by the component functions, e.g
+        [{"status_code": 502, "error": None, "delay": 0.14}, {"status_code": 200, "error": None, "delay": 0}]
+
+    Args:
+        attempts (int):
+            The maximum number of times a request is sent, including the first. Defaults to 3.
+        base (float):
+            The shortest wait before a retry in seconds. Defaults to 0.1.
+        cap (float):
+            The longest backoff wait in seconds. Defaults to 5.
+        status_codes (tuple):
+            The HTTP status codes that are retried for queries. Defaults to (429, 502, 503, 504).
+        max_retry_after (float):
+            The longest Retry-After wait in seconds that is honored. Defaults to 30.
+        seed (int):
+            Makes the jitter repeatable, e.g in tests
+
+    Raises:
+        Exception: Raised if attempts is not an integer greater than 0 or base or cap is negative.
+
+    Example:
+        buycoins.set_transport(buycoins.Transport(retry=buycoins.RetryPolicy(attempts=4)))
+    """
+
+    def __init__(self, attempts:int=3, base:float=0.1, cap:float=5.0, status_codes:tuple=(429, 502, 503, 504), max_retry_after:float=30.0, seed:int=None):
+        if type(attempts) is not int or attempts <= 0:
+            raise Exception("attempts must be an integer greater than 0.")
+        if base < 0 or cap < base:
+            raise Exception("base must not be negative and cap must not be less than base.")
+
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.status_codes = frozenset(status_codes)
+        self.max_retry_after = max_retry_after
+        self.random = random.Random(seed)
+
+    def backoff(self, previous:float):
+        """Return the wait before the next attempt, given the wait before the previous one (0 before the first retry)."""
+        return min(self.cap, self.random.uniform(self.base, max(previous, self.base) * 3))
+
+    def retryable(self, operation:str, response=None, error:Exception=None):
+        """Return whether a request of the given operation ("query" or "mutation") may be sent again after it got response or raised error."""
+        if error is not None:
+            if operation == "query":
+                return isinstance(error, _TRANSIENT_ERRORS)
+            return is_connect_failure(error)
+        return operation == "query" and response.status_code in self.status_codes
+
+    def _delay(self, previous, response):
+        delay = self.backoff(previous)
+        retry_after = _retry_after(response) if response is not None else None
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+    def send(self, request, operation:str):
+        """Call request until it returns a response that is not retried or the attempts run out, sleeping between attempts.
+
+        Args:
+            request (function):
+                Sends the request and returns the response
+            operation (str):
+                "query" or "mutation"
+
+        Returns:
+            The last response, with the list of attempts as its `attempts` attribute
+
+        Raises:
+            Exception: The error raised by the last attempt, with the list of attempts as its `attempts` attribute.
+        """
+        attempts = []
+        delay = 0
+        while True:
+            response, error = None, None
+            try:
+                response = request()
+            except Exception as e:
+                error = e
+            attempt = _attempt(response, error)
+            attempts.append(attempt)
+
+            if len(attempts) < self.attempts and self.retryable(operation, response, error):
+                delay = self._delay(delay, response)
+                if delay is not None:
+                    attempt["delay"] = delay
+                    _discard(response)
+                    time.sleep(delay)
+                    continue
+            return _finish(response, error, attempts)
+
+    async def send_async(self, request, operation:str):
+        """Awaitable version of send, for a request function that returns an awaitable."""
+        attempts = []
+        delay = 0
+        while True:
+            response, error = None, None
+            try:
+                response = await request()
+            except Exception as e:
+                error = e
+            attempt = _attempt(response, error)
+            attempts.append(attempt)
+
+            if len(attempts) < self.attempts and self.retryable(operation, response, error):
+                delay = self._delay(delay, response)
+                if delay is not None:
+                    attempt["delay"] = delay
+                    _discard(response)
+                    await asyncio.sleep(delay)
+                    continue
+            return _finish(response, error, attempts)
+
+
+def is_connect_failure(error:Exception):
+    """Return whether error means the connection to the API could not be opened, so the request was never sent."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        reason = getattr(error.args[0], "reason", None) if error.args else None # the urllib3 MaxRetryError requests wraps
+        return isinstance(reason, ConnectTimeoutError) # including NewConnectionError and NameResolutionError
+    return aiohttp is not None and isinstance(error, aiohttp.ClientConnectorError)
+
+def _attempt(response, error):
+    return {"status_code": getattr(response, "status_code", None), "error": None if error is None else repr(error), "delay": 0}
+
+def _finish(response, error, attempts):
+    if error is not None:
+        error.attempts = attempts
+        raise error
+    response.attempts = attempts
+    return response
+
+def _discard(response):
+    # return the connection of a streamed response to the pool before sending again
+    close = getattr(response, "close", None)
+    if close is not None:
+        close()
+
+def _retry_after(response):
+    value = (getattr(response, "headers", None) or {}).get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,220 @@
+import threading
+
+# The fields and arguments the components of the client use, written by hand: it is not a snapshot of the API, so it is not used unless set with set_schema.
+# type -> {field: the type of the field, or None for scalars and enums}
+TYPES = {
+    "Query": {"getPrices": "BuycoinsPrice", "getBalances": "Account", "getOrders": "PostOrders", "getMarketBook": "PostOrders", "getEstimatedNetworkFee": "EstimatedFee"},
+    "Mutation": {"send": "OnchainTransfer", "buy": "Order", "sell": "Order", "postLimitOrder": "PostOrder", "postMarketOrder": "PostOrder", "createAddress": "Address", "createDepositAccount": "DepositAccount"},
+    "BuycoinsPrice": {"id": None, "cryptocurrency": None, "buyPricePerCoin": None, "sellPricePerCoin": None, "minBuy": None, "maxBuy": None, "minSell": None, "maxSell": None, "minCoinAmount": None, "expiresAt": None, "status": None},
+    "Account": {"id": None, "cryptocurrency": None, "confirmedBalance": None},
+    "PostOrders": {"dynamicPriceExpiry": None, "orders": "PostOrderConnection"},
+    "PostOrderConnection": {"edges": "PostOrderEdge", "pageInfo": "PageInfo"},
+    "PostOrderEdge": {"cursor": None, "node": "PostOrder"},
+    "PageInfo": {"hasNextPage": None, "hasPreviousPage": None, "startCursor": None, "endCursor": None},
+    "PostOrder": {"id": None, "cryptocurrency": None, "coinAmount": None, "side": None, "status": None, "createdAt": None, "pricePerCoin": None, "priceType": None, "staticPrice": None, "dynamicExchangeRate": None},
+    "EstimatedFee": {"estimatedFee": None, "total": None},
+    "OnchainTransfer": {"id": None, "address": None, "amount": None, "cryptocurrency": None, "fee": None, "status": None, "createdAt": None, "transaction": "Transaction"},
+    "Transaction": {"id": None, "hash": None, "confirmed": None, "createdAt": None},
+    "Order": {"id": None, "cryptocurrency": None, "status": None, "side": None, "totalCoinAmount": None, "createdAt": None},
+    "Address": {"id": None, "cryptocurrency": None, "address": None, "createdAt": None},
+    "DepositAccount": {"id": None, "accountNumber": None, "accountName": None, "accountType": None, "bankName": None, "accountReference": None, "createdAt": None},
+}
+
+# type -> {field: {argument: its graphql type}}, for the fields that take arguments
+ARGUMENTS = {
+    "Query": {
+        "getPrices": {"cryptocurrency": "Cryptocurrency", "side": "OrderSide"},
+        "getBalances": {"cryptocurrency": "Cryptocurrency"},
+        "getOrders": {"status": "GetOrdersStatus!"},
+        "getMarketBook": {"cryptocurrency": "Cryptocurrency", "coinAmount": "BigDecimal"},
+        "getEstimatedNetworkFee": {"cryptocurrency": "Cryptocurrency", "amount": "BigDecimal!"},
+    },
+    "Mutation": {
+        "send": {"cryptocurrency": "Cryptocurrency", "amount": "BigDecimal!", "address": "String!"},
+        "buy": {"cryptocurrency": "Cryptocurrency", "coin_amount": "BigDecimal!", "price": "ID!"},
+        "sell": {"cryptocurrency": "Cryptocurrency", "coin_amount": "BigDecimal!", "price": "ID!"},
+        "postLimitOrder": {"orderSide": "OrderSide!", "coinAmount": "BigDecimal!", "cryptocurrency": "Cryptocurrency", "priceType": "PriceType!", "staticPrice": "BigDecimal", "dynamicExchangeRate": "BigDecimal"},
+        "postMarketOrder": {"orderSide": "OrderSide!", "coinAmount": "BigDecimal!", "cryptocurrency": "Cryptocurrency"},
+        "createAddress": {"cryptocurrency": "Cryptocurrency"},
+        "createDepositAccount": {"accountName": "String!"},
+    },
+    "PostOrders": {"orders": {"first": "Int", "after": "String", "last": "Int", "before": "String"}},
+}
+
+CACHE_SIZE = 1024
+
+# The introspection query whose result Schema.from_introspection reads.
+INTROSPECTION_QUERY = "query { __schema { queryType { name } mutationType { name } types { name fields { name args { name type { ...TypeRef } } type { ...TypeRef } } } } } fragment TypeRef on __Type { kind name ofType { kind name ofType { kind name ofType { kind name } } } }"
+
+
+class Schema:
+    """The types, fields and arguments of the API, which query dicts are checked against before they are sent.
+
+    A query dict whose fields, arguments or nesting do not match the schema is answered locally with the failure response the API would have sent, e.g
+
+        {"status": "failure", "errors": [{"reason": "Field 'cryptocurren' doesn't exist on type 'Account'", "field": "query.getBalances.cryptocurren"}], "raw": [...]}
+
+    so a typo costs microseconds instead of a round trip. Results are memoized per command, argument names and selection, so checking a query that was checked before is a dict lookup.
+
+    No schema is used until one is set with set_schema, so by default every query dict is sent and checked by the API. The schema of the API can be fetched with introspect, saved, and loaded with from_introspection. BUNDLED only knows the fields and arguments the components of the client use, so it rejects other fields the API has.
+
+    Args:
+        types (dict):
+            The fields of every object type and their types, None for scalars and enums, in the format of TYPES
+        arguments (dict):
+            The arguments of every field that takes any and their graphql types, in the format of ARGUMENTS. Arguments whose type ends with "!" are required.
+        query (str):
+            The name of the root type of queries. Defaults to "Query".
+        mutation (str):
+            The name of the root type of mutations. Defaults to "Mutation".
+    """
+
+    def __init__(self, types:dict, arguments:dict, query:str="Query", mutation:str="Mutation"):
+        self.types = types
+        self.arguments = arguments
+        self.roots = {"query": query, "mutation": mutation}
+        self._results = {} # (operation, command, argument names, selection) -> the errors of the query dict
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_introspection(cls, introspection:dict):
+        """Create a Schema from the result of INTROSPECTION_QUERY.
+
+        Args:
+            introspection (dict):
+                The data of the introspection response, as returned by introspect, or the whole response body
+
+        Raises:
+            Exception: Raised if introspection is not the result of an introspection query.
+        """
+        data = introspection.get("data", introspection) if type(introspection) is dict else None
+        if type(data) is not dict or type(data.get("__schema")) is not dict:
+            raise Exception("introspection must be the result of an introspection query, with a '__schema' key.")
+
+        objects = [node for node in data["__schema"].get("types") or [] if node.get("fields") is not None]
+        names = set(node["name"] for node in objects)
+        types = {}
+        arguments = {}
+        for node in objects:
+            types[node["name"]] = {}
+            for field in node["fields"]:
+                field_type = _named_type(field["type"])
+                types[node["name"]][field["name"]] = field_type if field_type in names else None
+                if field.get("args"):
+                    arguments.setdefault(node["name"], {})[field["name"]] = {argument["name"]: _type_name(argument["type"]) for argument in field["args"]}
+
+        roots = {operation: (data["__schema"].get(operation + "Type") or {}).get("name") for operation in ("query", "mutation")}
+        return cls(types, arguments, roots["query"] or "Query", roots["mutation"] or "Mutation")
+
+    def errors(self, query_dict:dict, selection):
+        """Return the graphql errors of a query dict, an empty list if it matches the schema.
+
+        Args:
+            query_dict (dict):
+                The query dict built by a component's query builder
+            selection:
+                A hashable value identifying the fields of the query dict, e.g their compiled selection string, under which the result is memoized
+
+        Returns:
+            A list of errors in the format of the errors of an API response, e.g
+
+            [{"message": "Field 'cryptocurren' doesn't exist on type 'Account'", "path": ["query", "getBalances", "cryptocurren"]}]
+        """
+        args = query_dict.get("args")
+        key = (query_dict["operation"], query_dict["command"], tuple(name for name, value in args.items() if value is not None) if args else (), selection)
+        errors = self._results.get(key)
+        if errors is None:
+            errors = self._check_root(query_dict, key[2])
+            with self._lock:
+                if len(self._results) >= CACHE_SIZE: # selections built from user input could otherwise grow without bound
+                    self._results = {}
+                self._results[key] = errors
+        return errors
+
+    def _check_root(self, query_dict, arguments):
+        operation = query_dict["operation"]
+        root = self.roots.get(operation)
+        if root not in self.types:
+            return [{"message": "Schema is not configured for {operation}s".format(operation=operation), "path": [operation]}]
+        return self._check([{"field": query_dict["command"], "args": dict.fromkeys(arguments), "fields": query_dict["fields"]}], root, [operation])
+
+    def _check(self, fields, type_name, path):
+        errors = []
+        for field in fields:
+            name = field["field"]
+            field_path = path + [name]
+            if name == "__typename":
+                continue
+            if name not in self.types[type_name]:
+                errors.append({"message": "Field '{field}' doesn't exist on type '{type}'".format(field=name, type=type_name), "path": field_path})
+                continue
+
+            known = self.arguments.get(type_name, {}).get(name, {})
+            given = field.get("args") or {}
+            for argument in given:
+                if argument not in known:
+                    errors.append({"message": "Field '{field}' doesn't accept argument '{argument}'".format(field=name, argument=argument), "path": field_path})
+            missing = [argument for argument, argument_type in known.items() if argument_type.endswith("!") and argument not in given]
+            if missing:
+                errors.append({"message": "Field '{field}' is missing required arguments: {arguments}".format(field=name, arguments=", ".join(missing)), "path": field_path})
+
+            field_type = self.types[type_name][name]
+            if field_type is None and field.get("fields"):
+                errors.append({"message": "Selections can't be made on scalars (field '{field}' of type '{type}')".format(field=name, type=type_name), "path": field_path})
+            elif field_type is not None and not field.get("fields"):
+                errors.append({"message": "Field '{field}' of type '{type}' must have a selection of subfields".format(field=name, type=field_type), "path": field_path})
+            elif field_type is not None:
+                errors.extend(self._check(field["fields"], field_type, field_path))
+        return errors
+
+
+def _named_type(type_ref):
+    while type_ref.get("ofType") is not None: # unwrap NON_NULL and LIST
+        type_ref = type_ref["ofType"]
+    return type_ref["name"]
+
+def _type_name(type_ref):
+    if type_ref["kind"] == "NON_NULL":
+        return _type_name(type_ref["ofType"]) + "!"
+    if type_ref["kind"] == "LIST":
+        return "[{}]".format(_type_name(type_ref["ofType"]))
+    return type_ref["name"]
+
+
+BUNDLED = Schema(TYPES, ARGUMENTS)
+SCHEMA = None
+
+
+def set_schema(schema):
+    """Set the schema query dicts are checked against before they are sent.
+
+    Args:
+        schema (Schema):
+            The schema to check against, e.g one created with Schema.from_introspection from a saved introspection result, or None to send every query dict unchecked, the default
+
+    Raises:
+        Exception: Raised if schema is not a Schema instance or None.
+
+    Example:
+        with open("schema.json", "w") as f:
+            json.dump(buycoins.introspect(), f)
+        ...
+        with open("schema.json") as f:
+            buycoins.set_schema(buycoins.Schema.from_introspection(json.load(f)))
+    """
+    global SCHEMA
+    if schema is not None and not isinstance(schema, Schema):
+        raise Exception("schema must be an instance of buycoins_client.Schema")
+    SCHEMA = schema
+
+def introspect():
+    """Send INTROSPECTION_QUERY and return the data of its response, which Schema.from_introspection reads and which can be saved as JSON to load later.
+
+    Raises:
+        Exception: Raised if the API answers with an error or the authentication credentials have not been set up.
+    """
+    from . import utilities # imported here, as utilities checks every query dict against this module
+    response = utilities.parse_response(utilities.post({"query": INTROSPECTION_QUERY}, operation="query"))
+    if response["status"] != "success":
+        raise Exception("Could not introspect the schema: {}".format("; ".join(error["reason"] for error in response["errors"])))
+    return response["data"]
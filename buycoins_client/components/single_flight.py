@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+
+class SingleFlight:
+    """Lets identical read-only requests that are in flight at the same time share one HTTP request.
+
+    When a transport has a SingleFlight, a query whose request body, credentials and endpoint are byte for byte the same as those of a query still waiting for its response is not sent: it waits for the response of the first one instead, and each caller parses that response into its own response dict. Requests are only shared while they are in flight, so nothing is ever served from a cache. Mutations and streamed requests are always sent.
+
+    Example:
+        buycoins.set_transport(buycoins.Transport(single_flight=buycoins.SingleFlight()))
+        # 50 threads calling Prices.list() at the same moment send one request
+    """
+
+    def __init__(self):
+        self.sent = 0 # requests sent
+        self.shared = 0 # calls that waited for a request in flight instead of sending their own
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+    def do(self, key, request):
+        """Call request and return its result, unless a call with the same key is in flight, in which case wait for it and return its result or raise its exception.
+
+        Args:
+            key (tuple):
+                Identifies the request, e.g (url, Authorization header, request body)
+            request (function):
+                Sends the request and returns the response
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.sent += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return call.wait()
+
+        try:
+            call.result = request()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key, request):
+        """Awaitable version of do, for a request function that returns a coroutine.
+
+        The request runs as a task of its own, so a caller that is cancelled does not cancel it for the others.
+        """
+        key = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(request())
+            task.add_done_callback(lambda task: self._done(key, task))
+            self.sent += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception() # retrieved here, so a request whose callers were all cancelled does not log it
+
+
+class _Call:
+    """A request in flight that other calls wait for."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
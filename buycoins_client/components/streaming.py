@@ -0,0 +1,111 @@
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r"
+
+
+class EdgeDecoder:
+    """Incrementally decodes a graphql JSON response body, handing each element of every `edges` list to a callback as soon as it is complete.
+
+    The elements of `edges` lists are never kept; everything else in the body (the status, errors and fields such as dynamicPriceExpiry) is kept and decoded by close, with every `edges` list left empty. Memory use therefore depends on the size of one edge, not on the number of edges in the response.
+
+    Args:
+        on_node (function):
+            Called with the `node` dict of every edge, or with the edge itself if it has no `node` key.
+
+    Example:
+        decoder = EdgeDecoder(print)
+        for chunk in response.iter_content(65536):
+            decoder.feed(chunk)
+        body = decoder.close()
+    """
+
+    def __init__(self, on_node):
+        self.on_node = on_node
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._skeleton = []
+        self._in_edges = False
+        self._in_string = False
+        self._escaped = False
+        self._string = None # the last string seen, if it is short enough to be "edges"
+        self._expect = None # the next token that continues an "edges": [ sequence
+
+    def feed(self, chunk:bytes):
+        """Decode the next chunk of the response body."""
+        self._buffer += self._utf8.decode(chunk)
+        position = 0
+        while position < len(self._buffer):
+            if self._in_edges:
+                position = self._decode_edges(position)
+                if self._in_edges: # the next edge is not complete yet
+                    break
+            else:
+                position = self._scan(position)
+        self._buffer = self._buffer[position:]
+
+    def close(self):
+        """Finish decoding and return the body with every `edges` list left empty.
+
+        Raises:
+            ValueError: Raised if the body is not valid JSON or ends in the middle of an `edges` list.
+        """
+        self.feed(self._utf8.decode(b"", final=True).encode("utf-8"))
+        if self._in_edges or self._buffer.strip():
+            raise ValueError("The response body ended before the JSON document was complete.")
+        return json.loads("".join(self._skeleton))
+
+    def _scan(self, position):
+        """Copy body text outside `edges` lists to the skeleton, stopping after the opening bracket of an `edges` list."""
+        buffer = self._buffer
+        start = position
+        while position < len(buffer):
+            character = buffer[position]
+            position += 1
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif character == "\\":
+                    self._escaped = True
+                elif character == '"':
+                    self._in_string = False
+                    self._expect = ":" if self._string == "edges" else None
+                elif self._string is not None:
+                    self._string = self._string + character if len(self._string) < 5 else None
+            elif character == '"':
+                self._in_string = True
+                self._string = ""
+            elif character in _WHITESPACE:
+                continue
+            elif self._expect == ":" and character == ":":
+                self._expect = "["
+            elif self._expect == "[" and character == "[":
+                self._expect = None
+                self._in_edges = True
+                self._skeleton.append(buffer[start:position])
+                return position
+            else:
+                self._expect = None
+        self._skeleton.append(buffer[start:position])
+        return position
+
+    def _decode_edges(self, position):
+        """Decode and hand off complete edges, leaving the position at the start of an incomplete one."""
+        buffer = self._buffer
+        while position < len(buffer):
+            character = buffer[position]
+            if character in _WHITESPACE or character == ",":
+                position += 1
+            elif character == "]":
+                self._skeleton.append("]")
+                self._in_edges = False
+                return position + 1
+            else:
+                try:
+                    edge, end = self._json.raw_decode(buffer, position)
+                except ValueError: # an incomplete edge, wait for more data
+                    return position
+                position = end
+                self.on_node(edge.get("node", edge) if type(edge) is dict else edge)
+        return position
@@ -1,7 +1,11 @@
-import requests
-from requests.auth import HTTPBasicAuth
+from . import balance_cache
+from . import quotes
 from . import utilities
 
+FEE_FIELDS = utilities.compile_fields([{"field":"estimatedFee"}, {"field":"total"}])
+SEND_FIELDS = utilities.compile_fields([{"field":"id"}, {"field":"cryptocurrency"}, {"field":"status"}, {"field":"address"}, {"field":"amount"}, {"field":"fee"}, {"field":"transaction", "fields":[{"field":"hash"}, {"field":"id"}]}])
+TRADE_FIELDS = utilities.compile_fields([{"field":"id"}, {"field":"cryptocurrency"}, {"field":"status"}, {"field":"totalCoinAmount"}, {"field":"side"}])
+
 def fees(args:dict, fields:list=[]):
     """Retrieve fees for sending a cryptocurrency to an address
       
@@ -40,6 +44,10 @@ def fees(args:dict, fields:list=[]):
     Raises:
         Exception: Only raised if any of the args parameter fields are invalid e.g amount not being a float or fields having an item dict without the field property.
     """
+    return utilities.execute(_fees_query, args, fields)
+
+def _fees_query(args, fields):
+    """Validate the arguments of `fees` and return its query dict."""
 
     if not args.get("cryptocurrency") or type(args.get("cryptocurrency")) is not str or not args.get("cryptocurrency").strip():
         raise Exception("cryptocurrency argument must be a valid string identifier.")
@@ -57,19 +65,13 @@ def fees(args:dict, fields:list=[]):
         "operation": "query",
         "command": "getEstimatedNetworkFee",
         "args": args,
-        "fields": fields if len(fields) > 0 else [{"field":"estimatedFee"}, {"field":"total"}]
+        "fields": fields if len(fields) > 0 else FEE_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
+    return query_dict
 
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
 
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
-
-def send(args:dict, fields:list=[]):
+def send(args:dict, fields:list=[], as_models:bool=False):
     """Send cryptocurrency to a cryptocurrency address
 
     Returns the transaction details after making a request to send cryptocurrency to an address
@@ -94,7 +96,10 @@ def send(args:dict, fields:list=[]):
             Default fields are:
             [{"field": "estimatedFee"}, {"field": "total"}]
 
-            See fields definition in Readme file for help on writing fields you want returned. 
+            See fields definition in Readme file for help on writing fields you want returned.
+
+        as_models (bool):
+            Return the result as a buycoins_client.models.Transfer instance instead of a dict in the data of the response. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -111,6 +116,13 @@ def send(args:dict, fields:list=[]):
     Raises:
         Exception: Only raised if any of the args parameter fields are invalid e.g amount not being a float or fields having an item dict without the field property.
     """
+    response = utilities.execute(_send_query, args, fields, as_models=as_models)
+    if not utilities._capturing.get():
+        balance_cache.changed("send", args, response)
+    return response
+
+def _send_query(args, fields):
+    """Validate the arguments of `send` and return its query dict."""
 
     if not args.get("address") or type(args.get("address")) is not str or not args.get("address").strip():
         raise Exception("address argument must be a valid string identifier.")
@@ -131,21 +143,13 @@ def send(args:dict, fields:list=[]):
         "operation": "mutation",
         "command": "send",
         "args": args,
-        "fields": fields if len(fields) > 0 else [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"status"}, {"field":"address"}, {"field":"amount"}, {"field":"fee"}, {"field":"transaction", "fields":[{"field":"hash"}, {"field":"id"}]}]
+        "fields": fields if len(fields) > 0 else SEND_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
-
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
-
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
-
+    return query_dict
 
 
-def buy(args:dict, fields:list=[]):
+def buy(args:dict, fields:list=[], as_models:bool=False):
     """Buy a cryptocurrency
     
     Returns the transaction details after making a request to buy cryptocurrency from the Buycoins marketplace
@@ -160,6 +164,7 @@ def buy(args:dict, fields:list=[]):
                 The amount of cryptocurrency you intend to buy
             args['price'] (str):
                 This is the price id retrieved from calling the Prices.list() function and retrieving the id for your buy currency
+                It can be left out when a QuoteCache is set with set_quote_cache or on the client, in which case the price id of a cached quote is used. A trade the API rejects because that price expired is sent once more with a fresh quote.
         
         fields (list):
             The fields you want returned by the graphql query. It defaults to all the query fields if this argument is absent or empty. It is a list of dictionaries. 
@@ -170,7 +175,10 @@ def buy(args:dict, fields:list=[]):
             Default fields are:
             [{"field": "estimatedFee"}, {"field": "total"}]
 
-            See fields definition in Readme file for help on writing fields you want returned. 
+            See fields definition in Readme file for help on writing fields you want returned.
+
+        as_models (bool):
+            Return the result as a buycoins_client.models.Order instance instead of a dict in the data of the response. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -187,6 +195,13 @@ def buy(args:dict, fields:list=[]):
     Raises:
         Exception: Only raised if any of the args parameter fields are invalid e.g coin_amount not being a float or fields having an item dict without the field property.
     """
+    priced, response = quotes.trade(lambda priced: utilities.execute(_buy_query, priced, fields, as_models=as_models), args)
+    if not utilities._capturing.get():
+        balance_cache.changed("buy", priced, response)
+    return response
+
+def _buy_query(args, fields):
+    """Validate the arguments of `buy` and return its query dict."""
     # add validation for fields
     if(not utilities.is_valid_fields(fields)):
         raise Exception("Fields contains a node dict without a 'field' property.")
@@ -204,19 +219,13 @@ def buy(args:dict, fields:list=[]):
         "operation": "mutation",
         "command": "buy",
         "args": args,
-        "fields": fields if len(fields) > 0 else [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"status"}, {"field":"totalCoinAmount"}, {"field":"side"}]
+        "fields": fields if len(fields) > 0 else TRADE_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
+    return query_dict
 
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
 
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
-
-def sell(args:dict, fields:list=[]):
+def sell(args:dict, fields:list=[], as_models:bool=False):
     """Sell a cryptocurrency
     Returns the transaction details after making a request to sell cryptocurrency on the Buycoins marketplace
 
@@ -230,6 +239,7 @@ def sell(args:dict, fields:list=[]):
                 The amount of cryptocurrency you intend to sell
             args['price'] (str):
                 This is the price id retrieved from calling the Prices.list() function and retrieving the id for your sell currency
+                It can be left out when a QuoteCache is set with set_quote_cache or on the client, in which case the price id of a cached quote is used. A trade the API rejects because that price expired is sent once more with a fresh quote.
         
         fields (list):
             The fields you want returned by the graphql query. It defaults to all the query fields if this argument is absent or empty. It is a list of dictionaries. 
@@ -240,7 +250,10 @@ def sell(args:dict, fields:list=[]):
             Default fields are:
             [{"field": "estimatedFee"}, {"field": "total"}]
 
-            See fields definition in Readme file for help on writing fields you want returned. 
+            See fields definition in Readme file for help on writing fields you want returned.
+
+        as_models (bool):
+            Return the result as a buycoins_client.models.Order instance instead of a dict in the data of the response. It is an `optional` argument.
     
     Returns:
         A dict mapping containing a status key which can either be one of: "failure" or "success" and an errors/data key  depending on the status of the request. For example:
@@ -257,6 +270,13 @@ def sell(args:dict, fields:list=[]):
     Raises:
         Exception: Only raised if any of the args parameter fields are invalid e.g coin_amount not being a float or fields having an item dict without the field property.
     """
+    priced, response = quotes.trade(lambda priced: utilities.execute(_sell_query, priced, fields, as_models=as_models), args)
+    if not utilities._capturing.get():
+        balance_cache.changed("sell", priced, response)
+    return response
+
+def _sell_query(args, fields):
+    """Validate the arguments of `sell` and return its query dict."""
     # add validation for fields
     if(not utilities.is_valid_fields(fields)):
         raise Exception("Fields contains a node dict without a 'field' property.")
@@ -274,14 +294,7 @@ def sell(args:dict, fields:list=[]):
         "operation": "mutation",
         "command": "sell",
         "args": args,
-        "fields": fields if len(fields) > 0 else [{"field":"id"}, {"field":"cryptocurrency"}, {"field":"status"}, {"field":"totalCoinAmount"}, {"field":"side"}]
+        "fields": fields if len(fields) > 0 else TRADE_FIELDS
     }
 
-    data = utilities.create_request_body(query_dict)
-
-    if(not utilities.AUTH):
-        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
-
-    response = requests.post(utilities.API_URL, headers=utilities.HEADERS, auth=HTTPBasicAuth(utilities.AUTH['username'], utilities.AUTH['password']), data={"query":data}, params={})
-    
-    return utilities.parse_response(response)
+    return query_dict
@@ -0,0 +1,155 @@
+import os
+import threading
+import weakref
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .micro_batch import MicroBatcher
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+
+
+_TRANSPORTS = weakref.WeakSet()
+
+
+class _RejectCookies(DefaultCookiePolicy):
+    """Cookie policy that never stores cookies, so a session can be shared between threads without mutating its jar."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+class Transport:
+    """A keep-alive HTTP transport shared by every component call.
+
+    Wraps a single requests.Session whose connection pool is reused across calls, so only the first request to the API pays for the TCP and TLS handshake.
+
+    Args:
+        pool_size (int):
+            The maximum number of idle keep-alive connections kept open to the API host. Defaults to 10.
+
+        pool_block (bool):
+            If True, threads wait for a free connection once pool_size connections are in use instead of opening throwaway ones. Defaults to False.
+
+        timeout (float):
+            The number of seconds to wait for the API before giving up. Defaults to None (wait forever), which is what requests.post does.
+
+        retry (RetryPolicy):
+            When and how often failed requests are sent again. Defaults to None (never), see RetryPolicy.
+
+        rate_limiter (RateLimiter):
+            Paces the requests sent through the transport, including retries. Defaults to None (no limit), see RateLimiter.
+
+        single_flight (SingleFlight):
+            Lets identical queries in flight at the same time share one request. Defaults to None (every call sends its own), see SingleFlight.
+
+        micro_batcher (MicroBatcher):
+            Merges the queries made within a short window into one document. Defaults to None (every call sends its own), see MicroBatcher.
+
+    The underlying session rejects cookies so it can be used from many threads at once, and it is recreated in a forked child process so the child never writes to sockets owned by its parent.
+    """
+
+    def __init__(self, pool_size:int=10, pool_block:bool=False, timeout:float=None, retry:RetryPolicy=None, rate_limiter:RateLimiter=None, single_flight:SingleFlight=None, micro_batcher:MicroBatcher=None):
+        if type(pool_size) is not int or pool_size <= 0:
+            raise Exception("pool_size must be an integer greater than 0.")
+        if retry is not None and not isinstance(retry, RetryPolicy):
+            raise Exception("retry must be an instance of buycoins_client.RetryPolicy")
+        if rate_limiter is not None and not isinstance(rate_limiter, RateLimiter):
+            raise Exception("rate_limiter must be an instance of buycoins_client.RateLimiter")
+        if single_flight is not None and not isinstance(single_flight, SingleFlight):
+            raise Exception("single_flight must be an instance of buycoins_client.SingleFlight")
+        if micro_batcher is not None and not isinstance(micro_batcher, MicroBatcher):
+            raise Exception("micro_batcher must be an instance of buycoins_client.MicroBatcher")
+
+        self.pool_size = pool_size
+        self.pool_block = pool_block
+        self.timeout = timeout
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.single_flight = single_flight
+        self.micro_batcher = micro_batcher
+        self._lock = threading.Lock()
+        self._session = None
+        self._pid = None
+        _TRANSPORTS.add(self)
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=self.pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.cookies.set_policy(_RejectCookies())
+        return session
+
+    @property
+    def session(self):
+        """The requests.Session owned by the current process, created on first use."""
+        session = self._session
+        if session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    self._session = self._create_session()
+                    self._pid = os.getpid()
+                session = self._session
+        return session
+
+    def post(self, url:str, **kwargs):
+        """Send a POST request over a pooled connection. Accepts the same keyword arguments as requests.post."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def pool_stats(self):
+        """Return the usage of the connection pools of the current process.
+
+        Returns:
+            A dict in the format shown below, with zeroes before the first request:
+                {
+                    "pools": 1, # one per API host
+                    "max_size": 10, # the most idle connections kept per pool
+                    "idle": 3, # open connections waiting for a request
+                    "connections_opened": 4, # connections opened since the session was created
+                    "requests": 250 # requests sent since the session was created
+                }
+        """
+        stats = {"pools": 0, "max_size": self.pool_size, "idle": 0, "connections_opened": 0, "requests": 0}
+        session = self._session
+        if session is None or self._pid != os.getpid():
+            return stats
+
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None: # evicted since the keys were listed
+                    continue
+                stats["pools"] += 1
+                stats["idle"] += sum(1 for connection in list(pool.pool.queue) if connection is not None) if pool.pool is not None else 0
+                stats["connections_opened"] += pool.num_connections
+                stats["requests"] += pool.num_requests
+        return stats
+
+    def close(self):
+        """Close every pooled connection. The transport can still be used afterwards; it reconnects on the next call."""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None and self._pid == os.getpid():
+            session.close()
+
+    def _after_fork(self):
+        # The parent's lock might have been held at fork time and its sockets belong to the parent,
+        # so drop both without closing anything.
+        self._lock = threading.Lock()
+        self._session = None
+        self._pid = None
+
+
+def _reset_transports_after_fork():
+    for transport in list(_TRANSPORTS):
+        transport._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_transports_after_fork)
@@ -1,7 +1,49 @@
+import collections
+import contextvars
+import hashlib
+import inspect
+import threading
+from . import auth
+from . import hooks
+from . import json_backend
+from . import models
+from . import schema
+from .streaming import EdgeDecoder
+from .hooks import HOOKS
+from .transport import Transport
 
 AUTH = None
 API_URL = "https://backend.buycoins.tech/api/graphql"
-HEADERS = { 'Accept':'application/json'}
+HEADERS = { 'Accept':'application/json', 'Content-Type':'application/json'}
+TRANSPORT = None
+PERSISTED_QUERIES = False # send documents by their sha256 hash, see encode_body
+PERSISTED_QUERY_MIN_LENGTH = 128 # shorter documents are sent as they are, they are about as long as their hash extension
+
+CACHE_SIZE = 1024
+STREAM_CHUNK_SIZE = 65536
+
+# The graphql types of the root field arguments sent as variables, per command.
+VARIABLE_TYPES = {
+    "getBalances": {"cryptocurrency": "Cryptocurrency"},
+    "getOrders": {"status": "GetOrdersStatus!"},
+    "getEstimatedNetworkFee": {"cryptocurrency": "Cryptocurrency", "amount": "BigDecimal!"},
+    "send": {"cryptocurrency": "Cryptocurrency", "amount": "BigDecimal!", "address": "String!"},
+    "buy": {"cryptocurrency": "Cryptocurrency", "coin_amount": "BigDecimal!", "price": "ID!"},
+    "sell": {"cryptocurrency": "Cryptocurrency", "coin_amount": "BigDecimal!", "price": "ID!"},
+    "postLimitOrder": {"orderSide": "OrderSide!", "coinAmount": "BigDecimal!", "cryptocurrency": "Cryptocurrency", "priceType": "PriceType!", "staticPrice": "BigDecimal", "dynamicExchangeRate": "BigDecimal"},
+    "postMarketOrder": {"orderSide": "OrderSide!", "coinAmount": "BigDecimal!", "cryptocurrency": "Cryptocurrency"},
+    "createAddress": {"cryptocurrency": "Cryptocurrency"},
+    "createDepositAccount": {"accountName": "String!"},
+}
+
+_transport_lock = threading.Lock()
+_compiled_fields = {}
+_selections = {}
+_documents = {}
+_hashes = {} # document -> its sha256 hex digest
+_capturing = contextvars.ContextVar("buycoins_capturing", default=False)
+_client = contextvars.ContextVar("buycoins_client", default=None) # the BuycoinsClient making the current call
+_auth = (None, None) # AUTH and the BasicAuth built from it
 
 
 def is_valid_fields(fields):
@@ -32,20 +74,35 @@ def is_valid_fields(fields):
             if type(field.get('args')) is not dict:
                 return False
         
-        if field.get('fields'):
-            return is_valid_fields(field.get('fields'))
+        if field.get('fields') and not is_valid_fields(field.get('fields')):
+            return False
     return True
 
 def create_request_body(fields):
-    operations = ["query", "mutation"]
+    """Create the graphql document of a query dict with its argument values written into it.
 
-    if( not fields.get("operation") in operations):
-        raise Exception("Invalid operation {operation}".format(operation=fields["operation"]))
+    The components do not send this document: they send the body of _request_body, whose compiled document is cached and takes the arguments of the root field as variables. It is kept for code that posts a query dict itself, e.g as requests.post(API_URL, data={"query": create_request_body(query_dict)}, ...).
+
+    Args:
+        fields (dict):
+            The query dict built by a component, with the "operation", "command", "fields" and optional "args" keys. For example:
+
+            {"operation":"query", "command":"getBalances", "args":{"cryptocurrency":"bitcoin"}, "fields":[{"field":"confirmedBalance"}]}
+
+    Returns:
+        The graphql document as a string e.g
+
+        "query { getBalances(cryptocurrency:bitcoin){ confirmedBalance }}"
+
+    Raises:
+        Exception: Only raised if the operation is neither query nor mutation or the command is not a valid string.
+    """
+    operation = _get_operation(fields)
 
     if (not fields.get("command") or type(fields.get("command")) is not str or not fields.get("command").strip()):
         raise Exception("Invalid command {command}".format(command=fields["command"]))
 
-    query = "{operation} {{ {command}".format(operation=fields["operation"], command=fields["command"])
+    query = "{operation} {{ {command}".format(operation=operation, command=fields["command"])
 
     if fields.get("args", None) is not None:
         query += "("
@@ -55,9 +112,267 @@ def create_request_body(fields):
     query += "{{ {fields} }}".format(fields=parse_fields(fields["fields"], []))
 
     query += "}"
-    
+
     return query
 
+def _request_body(fields):
+    """Create the JSON request body for a query dict.
+
+    The graphql document is compiled once per command, selection and set of argument names and then served from a cache, so repeated calls only collect their argument values. Arguments of the root field whose types are listed in VARIABLE_TYPES are passed as graphql variables; any others are written into the document.
+
+    Args:
+        fields (dict):
+            The query dict built by a component, with the "operation", "command", "fields" and optional "args" and "alias" keys. For example:
+
+            {"operation":"query", "command":"getBalances", "args":{"cryptocurrency":"bitcoin"}, "fields":[{"field":"confirmedBalance"}]}
+
+            Arguments of nested fields can also be variables. They are referenced as "$name" in the field's args and declared with their type and value in the "variables" key of the query dict, e.g
+
+            {..., "fields":[{"field":"orders", "args":{"first":"$first"}, ...}], "variables":{"first":("Int", 50)}}
+
+    Returns:
+        A dict with the "query" document and, if there are any, its "variables" e.g
+
+        {"query":"query($cryptocurrency:Cryptocurrency) { getBalances(cryptocurrency:$cryptocurrency){ confirmedBalance }}", "variables":{"cryptocurrency":"bitcoin"}}
+
+    Raises:
+        Exception: Only raised if the operation is neither query nor mutation or the command is not a valid string.
+    """
+    args = fields.get("args")
+    declared = fields.get("variables")
+    key = (fields.get("operation"), fields.get("command"), fields.get("alias"), _compile_selection(fields["fields"]), tuple(args) if args else (), tuple(declared) if declared else ())
+    compiled = _documents.get(key)
+    if compiled is None:
+        operation = _get_operation(fields)
+        root = _compile_root_field(fields)
+        compiled = ("{operation}{definitions} {{ {root}}}".format(operation=operation, definitions=_define_variables(root[1]), root=root[0]), root[2])
+        if root[3]:
+            _cache(_documents, key, compiled)
+            document_hash(compiled[0]) # hashed once, with the document, instead of on every persisted request
+
+    body = {"query": compiled[0]}
+    if compiled[1] or declared:
+        variables = {variable: args[argument] for argument, variable in compiled[1] if args[argument] is not None}
+        if declared:
+            prefix = _variable_prefix(fields)
+            variables.update((prefix + name, value[1]) for name, value in declared.items() if value[1] is not None)
+        if variables:
+            body["variables"] = variables
+    return body
+
+def create_batch_request_body(query_dicts:list):
+    """Create one JSON request body holding every query dict as an aliased root field.
+
+    Variables of each root field are prefixed with its alias so they cannot collide.
+
+    Args:
+        query_dicts (list):
+            The query dicts to combine. They must all have the same operation and each must have a distinct "alias" key.
+
+    Returns:
+        A dict with the "query" document and, if there are any, its "variables" e.g
+
+        {"query":"query { c0:getPrices{ id } c1:getBalances{ id }}"}
+
+    Raises:
+        Exception: Raised if the query dicts mix operations, miss an alias or are invalid.
+    """
+    operations = set(_get_operation(query_dict) for query_dict in query_dicts)
+    if len(operations) != 1:
+        raise Exception("A batch document can only contain one type of operation.")
+
+    aliases = [query_dict.get("alias") for query_dict in query_dicts]
+    if not all(aliases) or len(set(aliases)) != len(aliases):
+        raise Exception("Every query in a batch document needs a distinct alias.")
+
+    roots = [_compile_root_field(query_dict) for query_dict in query_dicts]
+    definitions = tuple(definition for root in roots for definition in root[1])
+    body = {"query": "{operation}{definitions} {{ {roots}}}".format(operation=operations.pop(), definitions=_define_variables(definitions), roots=" ".join(root[0] for root in roots))}
+
+    variables = {}
+    for query_dict, root in zip(query_dicts, roots):
+        for argument, variable in root[2]:
+            if query_dict["args"][argument] is not None:
+                variables[variable] = query_dict["args"][argument]
+        prefix = _variable_prefix(query_dict)
+        for name, value in (query_dict.get("variables") or {}).items():
+            if value[1] is not None:
+                variables[prefix + name] = value[1]
+    if variables:
+        body["variables"] = variables
+    return body
+
+def document_hash(document:str):
+    """Return the sha256 hex digest of a graphql document, which names it in a persisted query. Digests are cached."""
+    digest = _hashes.get(document)
+    if digest is None:
+        digest = hashlib.sha256(document.encode()).hexdigest()
+        _cache(_hashes, document, digest)
+    return digest
+
+def encode_body(body:dict):
+    """Encode a request body as JSON, as a persisted query when they are enabled.
+
+    With persisted queries, enabled by PERSISTED_QUERIES or the persisted_queries setting of the BuycoinsClient making the call, the document is replaced by its sha256 hash following the automatic persisted queries protocol:
+
+        {"variables": {...}, "extensions": {"persistedQuery": {"version": 1, "sha256Hash": "a1f0..."}}}
+
+    so a request body only carries its variables. If the API does not know the hash yet, send sends the full document with the hash once, after which the API knows it. Documents shorter than PERSISTED_QUERY_MIN_LENGTH characters are always sent as they are, as the hash would not make the body smaller.
+
+    Args:
+        body (dict):
+            The request body created by _request_body or create_batch_request_body
+
+    Returns:
+        The JSON encoded body, a PersistedQuery when persisted queries are enabled
+    """
+    if len(body["query"]) < PERSISTED_QUERY_MIN_LENGTH or not _persisted_queries():
+        return json_backend.dumps(body)
+
+    persisted = {"extensions": {"persistedQuery": {"version": 1, "sha256Hash": document_hash(body["query"])}}}
+    if "variables" in body:
+        persisted["variables"] = body["variables"]
+    return PersistedQuery(json_backend.dumps(persisted), dict(body, extensions=persisted["extensions"]))
+
+def _persisted_queries():
+    client = _client.get()
+    if client is not None and client.persisted_queries is not None:
+        return client.persisted_queries
+    return PERSISTED_QUERIES
+
+
+class PersistedQuery(bytes):
+    """The JSON encoded body of a persisted query, which names its document by hash, with the full request body to fall back on."""
+
+    def __new__(cls, data:bytes, body:dict):
+        persisted = bytes.__new__(cls, data)
+        persisted.body = body # the document, its variables and the persistedQuery extension
+        return persisted
+
+    def full(self):
+        """Return the encoded body with the full document and its hash, which registers the document with the API."""
+        return json_backend.dumps(self.body)
+
+
+def not_persisted(response):
+    """Return whether a response says the API does not know, or does not support, the persisted query it answers."""
+    content = getattr(response, "content", None)
+    if type(content) is not bytes or b"PersistedQueryNot" not in content: # only decode the responses that may say so
+        return False
+    try:
+        errors = json_backend.loads(content).get("errors") or []
+    except ValueError:
+        return False
+    return any(type(error) is dict and error.get("message") in ("PersistedQueryNotFound", "PersistedQueryNotSupported") for error in errors)
+
+def compile_fields(fields:list):
+    """Compile a fields list that never changes, such as a component's default fields, so every later use is a cache lookup.
+
+    Compiled lists are kept for the life of the process, so only module level constants should be compiled. Other fields lists are served from a bounded cache of selections.
+
+    Args:
+        fields (list):
+            The fields list to compile. It must not be modified afterwards.
+
+    Returns:
+        The same fields list
+    """
+    _compiled_fields[id(fields)] = (fields, parse_fields(fields, []))
+    return fields
+
+def _get_operation(fields):
+    operations = ["query", "mutation"]
+
+    if( not fields.get("operation") in operations):
+        raise Exception("Invalid operation {operation}".format(operation=fields["operation"]))
+
+    return fields["operation"]
+
+def _define_variables(definitions):
+    return "({})".format(", ".join(definitions)) if definitions else ""
+
+def _compile_selection(fields:list):
+    """Return the cached selection string of a fields list."""
+    compiled = _compiled_fields.get(id(fields))
+    if compiled is not None and compiled[0] is fields:
+        return compiled[1]
+
+    key = _freeze(fields)
+    selection = _selections.get(key)
+    if selection is None:
+        selection = parse_fields(fields, [])
+        _cache(_selections, key, selection)
+    return selection
+
+def _compile_root_field(fields):
+    """Return the (root field, variable definitions, [(argument, variable)], cacheable) of a query dict.
+
+    Root fields with arguments that are not listed in VARIABLE_TYPES have their values written into the document, so they are not cacheable. The variables of an aliased query dict, including the ones it declares for nested fields, are prefixed with its alias so they cannot collide with those of the other root fields of a batch document.
+    """
+    if (not fields.get("command") or type(fields.get("command")) is not str or not fields.get("command").strip()):
+        raise Exception("Invalid command {command}".format(command=fields["command"]))
+
+    command = fields["command"]
+    alias = fields.get("alias")
+    args = fields.get("args") or {}
+    declared = fields.get("variables") or {}
+    types = VARIABLE_TYPES.get(command, {})
+    prefix = _variable_prefix(fields)
+    selection = fields["fields"]
+    if prefix and declared:
+        selection = _rename_variables(selection, {"$" + name: "$" + prefix + name for name in declared})
+
+    variables = [(name, prefix + name) for name in args if name in types]
+    inline_args = {name: value for name, value in args.items() if name not in types}
+    arguments = ["{}:${}".format(name, variable) for name, variable in variables]
+    if inline_args:
+        arguments.append(parse_args(inline_args))
+
+    query = "{alias}:{command}".format(alias=alias, command=command) if alias else command
+    if arguments:
+        query += "(" + ",".join(arguments) + ")"
+    query += "{{ {fields} }}".format(fields=_compile_selection(selection))
+
+    definitions = tuple("${}:{}".format(variable, types[name]) for name, variable in variables)
+    definitions += tuple("${}{}:{}".format(prefix, name, value[0]) for name, value in declared.items())
+    return (query, definitions, variables, not inline_args)
+
+def _variable_prefix(fields):
+    """Return the prefix of the variables of a query dict, "<alias>_" for an aliased one."""
+    alias = fields.get("alias")
+    return "{}_".format(alias) if alias else ""
+
+def _rename_variables(fields, names):
+    """Return a copy of a fields list whose arguments reference the variables of names, a {"$old": "$new"} dict, by their new names."""
+    renamed = []
+    for field in fields:
+        field = dict(field)
+        if field.get("args"):
+            field["args"] = {name: names.get(value, value) if type(value) is str else value for name, value in field["args"].items()}
+        if field.get("fields"):
+            field["fields"] = _rename_variables(field["fields"], names)
+        renamed.append(field)
+    return renamed
+
+def _freeze(fields):
+    """Return a hashable copy of a fields list for use as a cache key."""
+    return tuple((field.get("field"), _freeze_args(field.get("args")), None if field.get("fields") is None else _freeze(field.get("fields"))) for field in fields)
+
+def _freeze_args(args):
+    if not args:
+        return None
+    items = tuple(args.items())
+    try:
+        hash(items)
+    except TypeError: # e.g a list argument value
+        return repr(items)
+    return items
+
+def _cache(cache:dict, key, value):
+    if len(cache) >= CACHE_SIZE: # selections built from user input could otherwise grow without bound
+        cache.clear()
+    cache[key] = value
+
 def parse_args(args:dict):
     """Parse arguments passed to a graphql query name or nodes and returns a string of arguments
 
@@ -136,7 +451,7 @@ def _get_fields(errors):
         A list of string paths e.g ["person.age"]
 
     """
-    return list(map(lambda error: (error.get("path", []) and ".".join(error.get("path",[]))) or "", errors))
+    return list(map(lambda error: (error.get("path", []) and ".".join(map(str, error.get("path",[])))) or "", errors))
 
 def _create_error_response(errors):
     """Combines error messages and fields to create an array of reasons for errors and the corresponding fields causing the errors.
@@ -188,30 +503,469 @@ def parse_response(response):
                 ]
                 "raw":[{"reason":"Invalid argument 'cryptocurren' passed to query 'getPrices'", "field":"cryptocurren"}] # the raw error response from the API call
             }
+
+        A failure response also has a "data" key when the API returned data for the parts of the query that succeeded, and every response has an "attempts" list when the transport has a RetryPolicy, see RetryPolicy.
+    """
+    failure = _parse_status(response.status_code) # failed requests are answered without decoding their body
+    if failure is not None:
+        return _with_attempts(failure, response)
+
+    return _with_attempts(_parse_body(_decode(response)), response)
+
+def parse_streaming_response(response, on_node):
+    """Parses a streamed requests.Response object like parse_response, decoding the body incrementally and handing every node of an `edges` list to on_node instead of keeping it.
+
+    Args:
+        response (requests.Response):
+            The response from an API call made with stream=True
+
+        on_node (function):
+            Called with every node dict of every `edges` list in the response, in order, as soon as it has been decoded
+
+    Returns:
+        A dict in the same format as parse_response returns, except that every `edges` list is empty.
     """
-    jsonResponse = response.json()
-    if(response.status_code == 401):
+    nodes = iter_streaming_response(response)
+    while True:
+        try:
+            node = next(nodes)
+        except StopIteration as stop:
+            return stop.value
+        on_node(node)
+
+def iter_streaming_response(response):
+    """Decodes a streamed requests.Response object incrementally, yielding every node of an `edges` list as soon as it has been decoded.
+
+    The generator's return value (the value of a `yield from` expression) is the parsed response dict in the format of parse_response, with every `edges` list empty.
+
+    Args:
+        response (requests.Response):
+            The response from an API call made with stream=True
+
+    Returns:
+        A generator of node dicts
+    """
+    nodes = collections.deque()
+    try:
+        failure = _parse_status(response.status_code)
+        if failure is not None:
+            return _with_attempts(failure, response)
+
+        decoder = EdgeDecoder(nodes.append)
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            decoder.feed(chunk)
+            while nodes:
+                yield nodes.popleft()
+        body = decoder.close()
+        while nodes:
+            yield nodes.popleft()
+        return _with_attempts(_parse_body(body), response)
+    finally:
+        response.close() # return the connection to the pool even if iteration stopped early
+
+def _with_attempts(parsed, response):
+    attempts = getattr(response, "attempts", None) # set by a RetryPolicy
+    if type(attempts) is list:
+        parsed["attempts"] = attempts
+    return parsed
+
+def _decode(response):
+    content = getattr(response, "content", None)
+    if content is None: # not backed by a body, e.g. a test double
+        return response.json()
+    return json_backend.loads(content)
+
+def _parse_status(status_code):
+    if(status_code == 401):
         return {
             "status": "failure",
             "errors": [{"reason": "Invalid credentials", "field":None}],
             "raw": []
         }
 
-    if(response.status_code > 299): # any other type of failed request status code away from standard 200 range.
+    if(status_code > 299): # any other type of failed request status code away from standard 200 range.
         return {
             "status": "failure",
             "errors": [{"reason": "Unknown failure", "field":None}],
             "raw": []
         }
-    
+
+def _parse_body(jsonResponse):
     if(jsonResponse.get("errors")):
-        return {
+        failure = {
             "status": "failure",
             "errors": _create_error_response(jsonResponse.get("errors", [])),
             "raw": jsonResponse.get('errors', [])
         }
+        if(jsonResponse.get("data")): # partial success
+            failure["data"] = jsonResponse.get("data")
+        return failure
     else:
         return {
             "status": "success",
             "data":jsonResponse.get("data",{})
-        }
\ No newline at end of file
+        }
+
+def get_transport():
+    """Return the transport shared by every component, creating a default pooled Transport on first use.
+
+    Returns:
+        A Transport instance
+    """
+    global TRANSPORT
+    if TRANSPORT is None:
+        with _transport_lock:
+            if TRANSPORT is None:
+                TRANSPORT = Transport()
+    return TRANSPORT
+
+def _micro_batcher(query_dict):
+    """Return the MicroBatcher of the transport a query dict is sent through, or None to send it on its own."""
+    if query_dict["operation"] != "query":
+        return None
+    client = _client.get()
+    return ((client.transport if client is not None else None) or get_transport()).micro_batcher
+
+def set_transport(transport):
+    """Replace the transport shared by every component, e.g. to change the connection pool size.
+
+    The previous transport's connections are closed.
+
+    Args:
+        transport (Transport):
+            The transport every subsequent API call should be sent through.
+
+    Raises:
+        Exception: Only raised if transport is not a Transport instance.
+    """
+    global TRANSPORT
+    if not isinstance(transport, Transport):
+        raise Exception("transport must be an instance of buycoins_client.Transport")
+
+    with _transport_lock:
+        previous, TRANSPORT = TRANSPORT, transport
+    if previous is not None and previous is not transport:
+        previous.close()
+
+def execute(build, *args, as_models:bool=False):
+    """Build a query with a component's query builder, send it through the shared transport and parse the response.
+
+    Args:
+        build (function):
+            The component function that validates its arguments and returns the query dict, e.g prices._list_query
+
+        *args:
+            The arguments passed on to build
+
+        as_models (bool):
+            Whether to replace the node dicts in the data of the response with result models, see models.convert
+
+    Returns:
+        The parsed response dict as returned by parse_response
+
+    Query dicts that do not match the schema set with schema.set_schema, if any, are answered with a failure response without being sent. Queries are sent in the next document of the transport's MicroBatcher, if it has one.
+
+    Raises:
+        Exception: Raised if build rejects its arguments or the authentication credentials have not been set up.
+    """
+    if HOOKS: # only time the request when someone is listening
+        return _execute_traced(build, args, as_models)
+
+    query_dict = build(*args)
+    if as_models:
+        query_dict["as_models"] = True
+    if _capturing.get(): # a batch is collecting the query instead of sending it
+        return query_dict
+    rejected = _rejected(query_dict)
+    if rejected is not None:
+        return rejected
+    micro_batcher = _micro_batcher(query_dict)
+    if micro_batcher is not None:
+        return micro_batcher.submit(query_dict)
+
+    body = _request_body(query_dict)
+
+    return _convert(parse_response(post(body, operation=query_dict["operation"], commands=(query_dict["command"],))), query_dict)
+
+def _execute_traced(build, args, as_models):
+    trace = hooks.Trace()
+    query_dict = build(*args)
+    if as_models:
+        query_dict["as_models"] = True
+    if _capturing.get():
+        return query_dict
+    rejected = _rejected(query_dict)
+    if rejected is not None:
+        return rejected
+    micro_batcher = _micro_batcher(query_dict)
+    if micro_batcher is not None: # traced by the batch it is sent in
+        return micro_batcher.submit(query_dict)
+    trace.lap("validate")
+
+    data = encode_body(_request_body(query_dict))
+    trace.lap("build")
+    trace.start(query_dict["command"], query_dict["operation"], len(data))
+    try:
+        response = send(data, operation=query_dict["operation"], commands=(query_dict["command"],))
+        trace.lap("http")
+        parsed = _convert(parse_response(response), query_dict)
+        trace.lap("parse")
+    except Exception as e:
+        trace.end(error=e)
+        raise
+    trace.end(parsed["status"], response)
+    return parsed
+
+def _rejected(query_dict):
+    """Return the failure response of a query dict that does not match the schema in use, or None if it can be sent."""
+    current = schema.SCHEMA
+    if current is None:
+        return None
+    errors = current.errors(query_dict, _compile_selection(query_dict["fields"]))
+    if errors:
+        return _parse_body({"errors": errors})
+    return None
+
+def _convert(response, query_dict):
+    if query_dict.get("as_models"):
+        return models.convert(response, query_dict["command"])
+    return response
+
+def execute_streaming(build, *args, on_node):
+    """Like execute, but decodes the response incrementally and hands every node of an `edges` list to on_node instead of returning it.
+
+    Args:
+        build (function):
+            The component function that validates its arguments and returns the query dict, e.g orders._list_market_orders_query
+
+        *args:
+            The arguments passed on to build
+
+        on_node (function):
+            Called with every node dict of every `edges` list in the response as soon as it has been decoded
+
+    Returns:
+        The parsed response dict as returned by parse_streaming_response, with every `edges` list empty
+
+    Raises:
+        Exception: Raised if build rejects its arguments or the authentication credentials have not been set up.
+    """
+    query_dict = build(*args)
+    if _capturing.get():
+        return query_dict
+
+    nodes = stream(query_dict)
+    while True:
+        try:
+            node = next(nodes)
+        except StopIteration as stop:
+            return stop.value
+        on_node(node)
+
+def stream(query_dict:dict):
+    """Send a validated query dict and decode its response incrementally, yielding every node of an `edges` list as soon as it has been decoded.
+
+    Args:
+        query_dict (dict):
+            The query dict built by a component's query builder
+
+    Returns:
+        A generator of node dicts, whose return value is the parsed response dict as returned by iter_streaming_response
+
+    Raises:
+        Exception: Raised if the authentication credentials have not been set up.
+    """
+    rejected = _rejected(query_dict)
+    if rejected is not None:
+        return rejected
+    if not HOOKS:
+        return (yield from iter_streaming_response(post(_request_body(query_dict), stream=True, operation=query_dict["operation"], commands=(query_dict["command"],))))
+
+    trace = hooks.Trace()
+    data = json_backend.dumps(_request_body(query_dict))
+    trace.lap("build")
+    trace.start(query_dict["command"], query_dict["operation"], len(data))
+    try:
+        response = send(data, stream=True, operation=query_dict["operation"], commands=(query_dict["command"],))
+        trace.lap("http")
+        parsed = yield from iter_streaming_response(response)
+        trace.lap("parse") # includes the time spent by the consumer of each node
+    except BaseException as e: # including GeneratorExit when the consumer stops early
+        trace.end(error=e)
+        raise
+    trace.end(parsed["status"], response)
+    return parsed
+
+def capture(function, *args, **kwargs):
+    """Call a component function without sending its request and return the validated query dict it would have sent.
+
+    Args:
+        function (function):
+            A public component function e.g Prices.list
+
+        *args, **kwargs:
+            The arguments passed on to function
+
+    Returns:
+        The query dict built by the component function
+
+    Raises:
+        Exception: Raised if the component function rejects its arguments.
+    """
+    token = _capturing.set(True)
+    try:
+        query_dict = function(*args, **kwargs)
+        if inspect.iscoroutine(query_dict): # an aio component function, which returns before its first await when capturing
+            try:
+                query_dict.send(None)
+            except StopIteration as stop:
+                query_dict = stop.value
+    finally:
+        _capturing.reset(token)
+
+    return query_dict
+
+def post(body:dict, stream:bool=False, operation:str="mutation", commands:list=()):
+    """Send a request body to the API as JSON, serialized with the fastest installed JSON backend, through the shared transport and return the raw response.
+
+    Args:
+        body (dict):
+            The request body created by _request_body or create_batch_request_body
+
+        stream (bool):
+            If True, the response body is not read until it is iterated over. Defaults to False.
+
+        operation (str):
+            The operation of the document, "query" or "mutation", which decides when the transport's RetryPolicy may send it again. Defaults to "mutation", which is only retried if it was never sent.
+
+        commands (list):
+            The commands the document sends, which the transport's RateLimiter counts against their budgets
+
+    Returns:
+        A requests.Response object
+
+    Raises:
+        Exception: Only raised if the authentication credentials have not been set up.
+    """
+    return send(encode_body(body), stream, operation, commands)
+
+def send(data:bytes, stream:bool=False, operation:str="mutation", commands:list=()):
+    """Send an already encoded request body to the API through the shared transport and return the raw response.
+
+    The request is sent with the credentials, transport and API url of the BuycoinsClient making the call, or those set up with Auth.setup and set_transport when it is made through the module functions. Every attempt first waits for its turn with the transport's RateLimiter, and failed requests are sent again as the transport's RetryPolicy allows, in which case the response has the list of attempts as its `attempts` attribute. A query identical to one in flight shares its response when the transport has a SingleFlight, and a persisted query the API does not know is sent again with its document, see encode_body.
+
+    Args:
+        data (bytes):
+            The JSON encoded request body
+
+        stream (bool):
+            If True, the response body is not read until it is iterated over. Defaults to False.
+
+        operation (str):
+            "query" or "mutation", see post
+
+        commands (list):
+            The commands the document sends, see post
+
+    Returns:
+        A requests.Response object
+
+    Raises:
+        Exception: Only raised if the authentication credentials have not been set up.
+    """
+    client = _client.get()
+    if client is not None:
+        basic_auth, transport, url = client.auth, client.transport or get_transport(), client.api_url or API_URL
+    else:
+        basic_auth, transport, url = _default_auth(), get_transport(), API_URL
+
+    if stream and type(data) is PersistedQuery: # a streamed response cannot be checked for an unknown hash before it is handed out
+        data = data.full()
+    if transport.single_flight is not None and operation == "query" and not stream: # mutations are never shared
+        return transport.single_flight.do((url, basic_auth.header, data), lambda: _send(transport, url, basic_auth, data, stream, operation, commands))
+    return _send(transport, url, basic_auth, data, stream, operation, commands)
+
+def _send(transport, url, basic_auth, data, stream, operation, commands):
+    response = _post(transport, url, basic_auth, data, stream, operation, commands)
+    if type(data) is PersistedQuery and not_persisted(response):
+        response = _post(transport, url, basic_auth, data.full(), stream, operation, commands)
+    return response
+
+def _post(transport, url, basic_auth, data, stream, operation, commands):
+    if transport.retry is None and transport.rate_limiter is None:
+        return transport.post(url, headers=HEADERS, auth=basic_auth, data=data, params={}, stream=stream)
+
+    def request():
+        if transport.rate_limiter is not None:
+            transport.rate_limiter.acquire(commands)
+        return transport.post(url, headers=HEADERS, auth=basic_auth, data=data, params={}, stream=stream)
+
+    return request() if transport.retry is None else transport.retry.send(request, operation)
+
+def _default_auth():
+    """Return the BasicAuth of the credentials set up with Auth.setup, encoding them only when they change."""
+    global _auth
+    if(not AUTH):
+        raise Exception("Please set up your public and secret keys using buycoins_python.Auth.setup function.")
+
+    source, basic_auth = _auth
+    if source is not AUTH:
+        basic_auth = auth.BasicAuth(AUTH['username'], AUTH['password'])
+        _auth = (AUTH, basic_auth)
+    return basic_auth
+
+def check_auth():
+    """Raise the exception of missing credentials now, before a call that sends several requests turns it into the failure of each one.
+
+    Raises:
+        Exception: Raised if the call is made through the module functions and Auth.setup has not been called.
+    """
+    if _client.get() is None:
+        _default_auth()
+
+def parse_batch_response(response, query_dicts:list):
+    """Parses the response to a batch document and splits it into one response per aliased query dict.
+
+    Errors are matched to a query dict through the alias in their path, so a failing call does not hide the data returned for the others. Errors without an alias in their path, like invalid credentials, apply to every call.
+
+    Args:
+        response (requests.Response):
+            The response from the API call
+
+        query_dicts (list):
+            The aliased query dicts the batch document was created from
+
+    Returns:
+        A list of response dicts in the same order as query_dicts, each in the same format as parse_response returns with data keyed by the command name. For example:
+
+            [{"status":"success", "data":{"getPrices":[...]}}, {"status":"failure", "errors":[...], "raw":[...]}]
+    """
+    parsed = parse_response(response)
+    if parsed["status"] == "failure" and not parsed["raw"]: # the request itself failed
+        return [dict(parsed) for _ in query_dicts]
+
+    data = parsed.get("data") or {}
+    aliases = set(query_dict["alias"] for query_dict in query_dicts)
+    errors_by_alias = {}
+    shared_errors = []
+    for error in parsed.get("raw", []):
+        alias = next((part for part in (error.get("path") or []) if part in aliases), None)
+        if alias is None:
+            shared_errors.append(error)
+        else:
+            errors_by_alias.setdefault(alias, []).append(error)
+
+    results = []
+    for query_dict in query_dicts:
+        value = data.get(query_dict["alias"])
+        errors = errors_by_alias.get(query_dict["alias"], []) + shared_errors
+        if errors:
+            result = {"status": "failure", "errors": _create_error_response(errors), "raw": errors}
+            if value is not None:
+                result["data"] = {query_dict["command"]: value}
+        else:
+            result = {"status": "success", "data": {query_dict["command"]: value}}
+        if "attempts" in parsed:
+            result["attempts"] = parsed["attempts"]
+        results.append(_convert(result, query_dict))
+    return results
@@ -0,0 +1,3 @@
+from .server import FakeServer, constant, uniform, exponential, lognormal
+from .exchange import Exchange
+from .graphql import GraphQLError
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""Run FakeServer on its own, e.g to load-test a client from another process:
+
+    python -m buycoins_client.testing --port 8000 --latency 0.05 --fault 429=0.01 --market-book-size 100000
+"""
+import argparse
+import time
+
+from .server import FakeServer, lognormal
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m buycoins_client.testing", description="A local stand-in for the Buycoins graphql API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0, help="median latency in seconds, drawn from a log-normal distribution")
+    parser.add_argument("--sigma", type=float, default=0.5, help="spread of the log-normal latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a graphql error")
+    parser.add_argument("--fault", action="append", default=[], metavar="STATUS=RATE", help="fraction of requests answered with an HTTP status code, e.g 503=0.01")
+    parser.add_argument("--market-book-size", type=int, default=100)
+    parser.add_argument("--seed", type=int)
+    options = parser.parse_args()
+
+    faults = {int(status_code): float(rate) for status_code, rate in (fault.split("=") for fault in options.fault)}
+    server = FakeServer(market_book_size=options.market_book_size, latency=lognormal(options.latency, options.sigma) if options.latency else None, error_rate=options.error_rate, faults=faults, seed=options.seed, host=options.host, port=options.port)
+    server.start()
+    print("Serving the Buycoins API on {}".format(server.url))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+        print(dict(server.stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import base64
+import random
+import threading
+import time
+from decimal import Decimal
+
+from .graphql import Connection, GraphQLError
+
+# naira price of one coin
+PRICES = {
+    "bitcoin": Decimal("26000000"),
+    "ethereum": Decimal("1800000"),
+    "litecoin": Decimal("95000"),
+    "usd_coin": Decimal("570"),
+    "usd_tether": Decimal("570"),
+}
+NETWORK_FEES = {
+    "bitcoin": Decimal("0.00044"),
+    "ethereum": Decimal("0.0037"),
+    "litecoin": Decimal("0.001"),
+    "usd_coin": Decimal("10"),
+    "usd_tether": Decimal("10"),
+}
+USD_RATE = Decimal("570") # naira per dollar, for dynamically priced orders
+SPREAD = Decimal("0.01")
+PRICE_TTL = 15 # seconds a price quote can be used to buy or sell
+DYNAMIC_PRICE_TTL = 30
+
+
+def _id(type_name, number):
+    return base64.b64encode("{}-{}".format(type_name, number).encode()).decode().rstrip("=")
+
+def _amount(value):
+    return format(value.normalize(), "f")
+
+
+class Exchange:
+    """The state behind FakeServer: prices, wallet balances, the market book and your own orders.
+
+    Every resolver is named after the graphql field it answers and takes that field's arguments. Mutations change the state the way the real API does, e.g buy debits the naira balance and credits the coin balance, and postMarketOrder fills the best orders of the market book, so a sequence of calls sees consistent results.
+
+    Args:
+        market_book_size (int):
+            The number of synthetic orders other users have placed on the market book
+        balances (dict):
+            The starting balance of each cryptocurrency and of "naira_token", e.g {"bitcoin": "0.5"}. Every wallet starts with 1 coin and 10,000,000 naira by default.
+        seed (int):
+            Makes the synthetic market book, ids and addresses repeatable
+    """
+
+    def __init__(self, market_book_size:int=100, balances:dict=None, seed:int=None):
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.balances = {cryptocurrency: Decimal("1") for cryptocurrency in PRICES}
+        self.balances["naira_token"] = Decimal("10000000")
+        for cryptocurrency, balance in (balances or {}).items():
+            self.balances[cryptocurrency] = Decimal(str(balance))
+        self.quotes = {} # price id -> quote
+        self.market = [] # active orders of other users
+        self.mine = [] # your own orders, active and completed
+        self._count = 0
+        for _ in range(market_book_size):
+            cryptocurrency = self.random.choice(list(PRICES))
+            side = self.random.choice(["buy", "sell"])
+            offset = Decimal(self.random.randint(1, 500)) / 10000
+            price = PRICES[cryptocurrency] * (1 - offset if side == "buy" else 1 + offset)
+            amount = Decimal(self.random.randint(1, 100000)) / 100000
+            self.market.append(self._order(cryptocurrency, side, amount, price.quantize(Decimal("0.01")), "static", "active"))
+
+    def _next(self, type_name):
+        self._count += 1
+        return _id(type_name, self._count)
+
+    def _order(self, cryptocurrency, side, amount, price, price_type, status, rate=None):
+        return {
+            "__typename": "PostOrder", "id": self._next("PostOrder"), "cryptocurrency": cryptocurrency, "coinAmount": _amount(amount), "side": side, "status": status,
+            "createdAt": int(time.time()), "pricePerCoin": _amount(price), "priceType": price_type,
+            "staticPrice": _amount(price * 100) if price_type == "static" else None, "dynamicExchangeRate": None if rate is None else _amount(rate),
+        }
+
+    def _cryptocurrency(self, args):
+        cryptocurrency = args.get("cryptocurrency", "bitcoin")
+        if cryptocurrency not in PRICES:
+            raise GraphQLError("Argument 'cryptocurrency' on Field has an invalid value ({}). Expected type 'Cryptocurrency'.".format(cryptocurrency))
+        return cryptocurrency
+
+    def _positive(self, args, name):
+        try:
+            value = Decimal(str(args[name]))
+        except KeyError:
+            raise GraphQLError("Field is missing required argument: {}".format(name))
+        if value <= 0:
+            raise GraphQLError("{} must be greater than 0".format(name))
+        return value
+
+    def _debit(self, wallet, amount):
+        if self.balances.get(wallet, 0) < amount:
+            raise GraphQLError("Insufficient balance")
+        self.balances[wallet] -= amount
+
+    def _credit(self, wallet, amount):
+        self.balances[wallet] = self.balances.get(wallet, 0) + amount
+
+    def getPrices(self, args):
+        prices = []
+        now = int(time.time())
+        expires_at = now + PRICE_TTL
+        if len(self.quotes) > 1000:
+            self.quotes = {price_id: quote for price_id, quote in self.quotes.items() if quote["expiresAt"] >= now}
+        for cryptocurrency, price in PRICES.items():
+            quote = {
+                "__typename": "BuycoinsPrice", "id": self._next("BuycoinsPrice"), "cryptocurrency": cryptocurrency, "status": "active", "expiresAt": expires_at,
+                "buyPricePerCoin": _amount(price * (1 + SPREAD)), "sellPricePerCoin": _amount(price * (1 - SPREAD)),
+                "minBuy": "0.001", "maxBuy": "100", "minSell": "0.001", "maxSell": "100", "minCoinAmount": "0.001",
+            }
+            self.quotes[quote["id"]] = quote
+            prices.append(quote)
+        return prices
+
+    def getBalances(self, args):
+        wallets = [args["cryptocurrency"]] if args.get("cryptocurrency") else list(PRICES) + ["naira_token"]
+        return [{"__typename": "Account", "id": _id("Account", wallet), "cryptocurrency": wallet, "confirmedBalance": _amount(self.balances.get(wallet, Decimal("0")))} for wallet in wallets]
+
+    def getOrders(self, args):
+        status = {"open": "active", "completed": "completed"}.get(args.get("status"))
+        if status is None:
+            raise GraphQLError("Argument 'status' on Field 'getOrders' has an invalid value ({}). Expected type 'GetOrdersStatus!'.".format(args.get("status")))
+        return {"__typename": "PostOrders", "dynamicPriceExpiry": int(time.time()) + DYNAMIC_PRICE_TTL, "orders": Connection([order for order in self.mine if order["status"] == status])}
+
+    def getMarketBook(self, args):
+        return {"__typename": "PostOrders", "dynamicPriceExpiry": int(time.time()) + DYNAMIC_PRICE_TTL, "orders": Connection(self.market + [order for order in self.mine if order["status"] == "active"])}
+
+    def getEstimatedNetworkFee(self, args):
+        cryptocurrency = self._cryptocurrency(args)
+        amount = self._positive(args, "amount")
+        return {"__typename": "EstimatedFee", "estimatedFee": _amount(NETWORK_FEES[cryptocurrency]), "total": _amount(amount + NETWORK_FEES[cryptocurrency])}
+
+    def send(self, args):
+        cryptocurrency = self._cryptocurrency(args)
+        amount = self._positive(args, "amount")
+        if not str(args.get("address", "")).strip():
+            raise GraphQLError("Invalid address")
+        self._debit(cryptocurrency, amount + NETWORK_FEES[cryptocurrency])
+        return {
+            "__typename": "OnchainTransfer", "id": self._next("OnchainTransfer"), "address": args["address"], "amount": _amount(amount), "cryptocurrency": cryptocurrency,
+            "fee": _amount(NETWORK_FEES[cryptocurrency]), "status": "pending", "createdAt": int(time.time()),
+            "transaction": {"__typename": "Transaction", "id": self._next("Transaction"), "hash": "%064x" % self.random.getrandbits(256), "confirmed": False, "createdAt": int(time.time())},
+        }
+
+    def buy(self, args):
+        return self._trade(args, "buy")
+
+    def sell(self, args):
+        return self._trade(args, "sell")
+
+    def _trade(self, args, side):
+        cryptocurrency = self._cryptocurrency(args)
+        amount = self._positive(args, "coin_amount")
+        quote = self.quotes.get(args.get("price"))
+        if quote is None or quote["cryptocurrency"] != cryptocurrency:
+            raise GraphQLError("Invalid price ID")
+        if quote["expiresAt"] < time.time():
+            raise GraphQLError("Price has expired")
+        if amount < Decimal(quote["min" + side.capitalize()]) or amount > Decimal(quote["max" + side.capitalize()]):
+            raise GraphQLError("coin_amount must be between {} and {}".format(quote["min" + side.capitalize()], quote["max" + side.capitalize()]))
+
+        total = amount * Decimal(quote[side + "PricePerCoin"])
+        if side == "buy":
+            self._debit("naira_token", total)
+            self._credit(cryptocurrency, amount)
+        else:
+            self._debit(cryptocurrency, amount)
+            self._credit("naira_token", total)
+        return {"__typename": "Order", "id": self._next("Order"), "cryptocurrency": cryptocurrency, "status": "processing", "side": side, "totalCoinAmount": _amount(amount), "createdAt": int(time.time())}
+
+    def postLimitOrder(self, args):
+        cryptocurrency = self._cryptocurrency(args)
+        amount = self._positive(args, "coinAmount")
+        side = args.get("orderSide")
+        if args.get("priceType") == "static":
+            price = self._positive(args, "staticPrice")
+            rate = None
+        elif args.get("priceType") == "dynamic":
+            rate = self._positive(args, "dynamicExchangeRate")
+            price = PRICES[cryptocurrency] / USD_RATE * rate
+        else:
+            raise GraphQLError("Argument 'priceType' on Field 'postLimitOrder' has an invalid value ({}). Expected type 'PriceType!'.".format(args.get("priceType")))
+        if side == "sell":
+            self._debit(cryptocurrency, amount) # held until the order is filled
+        elif side == "buy":
+            self._debit("naira_token", amount * price)
+        else:
+            raise GraphQLError("Argument 'orderSide' on Field 'postLimitOrder' has an invalid value ({}). Expected type 'OrderSide!'.".format(side))
+        order = self._order(cryptocurrency, side, amount, price, args["priceType"], "active", rate)
+        self.mine.append(order)
+        return order
+
+    def postMarketOrder(self, args):
+        cryptocurrency = self._cryptocurrency(args)
+        amount = self._positive(args, "coinAmount")
+        side = args.get("orderSide")
+        if side not in ("buy", "sell"):
+            raise GraphQLError("Argument 'orderSide' on Field 'postMarketOrder' has an invalid value ({}). Expected type 'OrderSide!'.".format(side))
+
+        # fill the best priced orders of the other side of the market book
+        book = sorted((order for order in self.market if order["cryptocurrency"] == cryptocurrency and order["side"] != side), key=lambda order: Decimal(order["pricePerCoin"]), reverse=side == "sell")
+        fills, remaining, total = [], amount, Decimal("0")
+        for order in book:
+            if remaining == 0:
+                break
+            filled = min(remaining, Decimal(order["coinAmount"]))
+            fills.append((order, filled))
+            remaining -= filled
+            total += filled * Decimal(order["pricePerCoin"])
+        if remaining > 0:
+            raise GraphQLError("Insufficient liquidity to fill {} {}".format(_amount(amount), cryptocurrency))
+
+        if side == "buy":
+            self._debit("naira_token", total)
+            self._credit(cryptocurrency, amount)
+        else:
+            self._debit(cryptocurrency, amount)
+            self._credit("naira_token", total)
+        for order, filled in fills:
+            left = Decimal(order["coinAmount"]) - filled
+            if left == 0:
+                self.market.remove(order)
+            else:
+                order["coinAmount"] = _amount(left)
+        order = self._order(cryptocurrency, side, amount, (total / amount).quantize(Decimal("0.01")), "static", "completed")
+        self.mine.append(order)
+        return order
+
+    def createAddress(self, args):
+        cryptocurrency = self._cryptocurrency(args)
+        address = "".join(self.random.choice("123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz") for _ in range(34))
+        return {"__typename": "Address", "id": self._next("Address"), "cryptocurrency": cryptocurrency, "address": address, "createdAt": int(time.time())}
+
+    def createDepositAccount(self, args):
+        name = str(args.get("accountName", "")).strip()
+        if not name:
+            raise GraphQLError("accountName can't be blank")
+        return {
+            "__typename": "DepositAccount", "id": self._next("DepositAccount"), "accountNumber": "{:010d}".format(self.random.randrange(10 ** 10)), "accountName": name,
+            "accountType": "deposit", "bankName": "Providus Bank", "accountReference": "%032x" % self.random.getrandbits(128), "createdAt": int(time.time()),
+        }
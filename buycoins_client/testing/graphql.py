@@ -0,0 +1,250 @@
+import re
+
+# type -> {field: the type of the field, or None for scalars}
+SCHEMA = {
+    "Query": {"getPrices": "BuycoinsPrice", "getBalances": "Account", "getOrders": "PostOrders", "getMarketBook": "PostOrders", "getEstimatedNetworkFee": "EstimatedFee"},
+    "Mutation": {"send": "OnchainTransfer", "buy": "Order", "sell": "Order", "postLimitOrder": "PostOrder", "postMarketOrder": "PostOrder", "createAddress": "Address", "createDepositAccount": "DepositAccount"},
+    "BuycoinsPrice": {"id": None, "cryptocurrency": None, "buyPricePerCoin": None, "sellPricePerCoin": None, "minBuy": None, "maxBuy": None, "minSell": None, "maxSell": None, "minCoinAmount": None, "expiresAt": None, "status": None},
+    "Account": {"id": None, "cryptocurrency": None, "confirmedBalance": None},
+    "PostOrders": {"dynamicPriceExpiry": None, "orders": "PostOrderConnection"},
+    "PostOrderConnection": {"edges": "PostOrderEdge", "pageInfo": "PageInfo"},
+    "PostOrderEdge": {"cursor": None, "node": "PostOrder"},
+    "PageInfo": {"hasNextPage": None, "hasPreviousPage": None, "startCursor": None, "endCursor": None},
+    "PostOrder": {"id": None, "cryptocurrency": None, "coinAmount": None, "side": None, "status": None, "createdAt": None, "pricePerCoin": None, "priceType": None, "staticPrice": None, "dynamicExchangeRate": None},
+    "EstimatedFee": {"estimatedFee": None, "total": None},
+    "OnchainTransfer": {"id": None, "address": None, "amount": None, "cryptocurrency": None, "fee": None, "status": None, "createdAt": None, "transaction": "Transaction"},
+    "Transaction": {"id": None, "hash": None, "confirmed": None, "createdAt": None},
+    "Order": {"id": None, "cryptocurrency": None, "status": None, "side": None, "totalCoinAmount": None, "createdAt": None},
+    "Address": {"id": None, "cryptocurrency": None, "address": None, "createdAt": None},
+    "DepositAccount": {"id": None, "accountNumber": None, "accountName": None, "accountType": None, "bankName": None, "accountReference": None, "createdAt": None},
+}
+
+_TOKEN = re.compile(r'\s+|,|#[^\n]*|(?P<punctuator>[{}()\[\]:$!=])|(?P<name>[_A-Za-z][_0-9A-Za-z]*)|(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)|(?P<string>"(?:[^"\\]|\\.)*")')
+
+
+class GraphQLError(Exception):
+    """An error that is returned in the errors list of a response, with the path of the field it belongs to."""
+
+    def __init__(self, message, path=None):
+        super().__init__(message)
+        self.path = path
+
+    def to_dict(self):
+        error = {"message": str(self)}
+        if self.path is not None:
+            error["path"] = self.path
+        return error
+
+
+class Field:
+    """A field of a parsed document: its name, alias, argument values and sub-selection."""
+
+    __slots__ = ("name", "alias", "args", "selection")
+
+    def __init__(self, name, alias, args, selection):
+        self.name = name
+        self.alias = alias
+        self.args = args
+        self.selection = selection
+
+
+class _Variable:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+def parse(document:str, variables:dict=None):
+    """Parse a query or mutation document into its operation and root fields.
+
+    Only the subset of graphql the client sends is supported: one anonymous operation, variable definitions, aliases, arguments with literal or variable values and nested selections.
+
+    Returns:
+        An (operation, [Field]) tuple, with variables replaced by their values. Arguments whose variable has no value are left out.
+
+    Raises:
+        GraphQLError: Raised if the document cannot be parsed.
+    """
+    parser = _Parser(document, variables or {})
+    return parser.parse()
+
+def validate(operation:str, fields:list):
+    """Check every selection of a parsed document against SCHEMA.
+
+    Raises:
+        GraphQLError: Raised for the first unknown field, or a field whose selection does not match its type.
+    """
+    _validate("Query" if operation == "query" else "Mutation", fields, [operation])
+
+def _validate(type_name, fields, path):
+    for field in fields:
+        field_path = path + [field.alias]
+        if field.name == "__typename":
+            continue
+        if field.name not in SCHEMA[type_name]:
+            raise GraphQLError("Field '{field}' doesn't exist on type '{type}'".format(field=field.name, type=type_name), field_path)
+        field_type = SCHEMA[type_name][field.name]
+        if field_type is None and field.selection is not None:
+            raise GraphQLError("Selections can't be made on scalars (field '{field}' of type '{type}')".format(field=field.name, type=type_name), field_path)
+        if field_type is not None:
+            if not field.selection:
+                raise GraphQLError("Field '{field}' of type '{type}' must have a selection of subfields".format(field=field.name, type=field_type), field_path)
+            _validate(field_type, field.selection, field_path)
+
+def project(value, selection:list):
+    """Return the parts of a resolved value that a selection asks for, under their aliases.
+
+    Lists are projected item by item and Connection values are paged with the `first` and `after` arguments of their field.
+    """
+    if selection is None or value is None:
+        return value
+    if type(value) is list:
+        return [project(item, selection) for item in value]
+
+    result = {}
+    for field in selection:
+        if field.name == "__typename":
+            result[field.alias] = value.get("__typename")
+            continue
+        child = value.get(field.name)
+        if isinstance(child, Connection):
+            child = child.page(field.args.get("first"), field.args.get("after"))
+        result[field.alias] = project(child, field.selection)
+    return result
+
+
+class Connection:
+    """A list of nodes that is returned one page at a time, as the orders of getOrders and getMarketBook are."""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def page(self, first=None, after=None):
+        start = 0
+        if after is not None:
+            try:
+                start = int(after) + 1
+            except ValueError:
+                raise GraphQLError("Invalid cursor {}".format(after))
+        end = len(self.nodes) if first is None else min(start + int(first), len(self.nodes))
+        edges = [{"cursor": str(position), "node": self.nodes[position]} for position in range(start, end)]
+        return {
+            "edges": edges,
+            "pageInfo": {
+                "hasNextPage": end < len(self.nodes),
+                "hasPreviousPage": start > 0,
+                "startCursor": edges[0]["cursor"] if edges else None,
+                "endCursor": edges[-1]["cursor"] if edges else None,
+            },
+        }
+
+
+class _Parser:
+
+    def __init__(self, document, variables):
+        self.variables = variables
+        self.tokens = []
+        position = 0
+        while position < len(document):
+            match = _TOKEN.match(document, position)
+            if match is None:
+                raise GraphQLError("Parse error on {!r} at offset {}".format(document[position:position + 10], position))
+            position = match.end()
+            if match.lastgroup is not None:
+                self.tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        self.position = 0
+
+    def parse(self):
+        operation = "query"
+        if self._peek() in (("name", "query"), ("name", "mutation")):
+            operation = self._next()[1]
+            if self._peek() == ("punctuator", "("):
+                self._skip_variable_definitions()
+        fields = self._selection()
+        if self.position != len(self.tokens):
+            raise GraphQLError("Parse error on {!r}: expected the end of the document".format(self.tokens[self.position][1]))
+        return operation, fields
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _next(self):
+        token = self._peek()
+        if token[0] is None:
+            raise GraphQLError("Parse error: unexpected end of document")
+        self.position += 1
+        return token
+
+    def _expect(self, value):
+        token = self._next()
+        if token[1] != value or token[0] in ("string", "number"):
+            raise GraphQLError("Parse error on {!r}: expected {!r}".format(token[1], value))
+
+    def _skip_variable_definitions(self):
+        self._expect("(")
+        while self._peek() != ("punctuator", ")"):
+            self._next()
+        self._expect(")")
+
+    def _selection(self):
+        self._expect("{")
+        fields = []
+        while self._peek() != ("punctuator", "}"):
+            fields.append(self._field())
+        self._expect("}")
+        return fields
+
+    def _field(self):
+        kind, name = self._next()
+        if kind != "name":
+            raise GraphQLError("Parse error on {!r}: expected a field name".format(name))
+        alias = name
+        if self._peek() == ("punctuator", ":"):
+            self._next()
+            kind, name = self._next()
+            if kind != "name":
+                raise GraphQLError("Parse error on {!r}: expected a field name".format(name))
+
+        args = {}
+        if self._peek() == ("punctuator", "("):
+            self._next()
+            while self._peek() != ("punctuator", ")"):
+                kind, arg = self._next()
+                self._expect(":")
+                value = self._value()
+                if isinstance(value, _Variable):
+                    if value.name not in self.variables or self.variables[value.name] is None:
+                        continue
+                    value = self.variables[value.name]
+                args[arg] = value
+            self._expect(")")
+
+        selection = self._selection() if self._peek() == ("punctuator", "{") else None
+        return Field(name, alias, args, selection)
+
+    def _value(self):
+        kind, value = self._next()
+        if kind == "string":
+            return value[1:-1].encode("utf-8").decode("unicode_escape") if "\\" in value else value[1:-1]
+        if kind == "number":
+            return float(value) if "." in value or "e" in value.lower() else int(value)
+        if value == "$":
+            return _Variable(self._next()[1])
+        if value == "[":
+            items = []
+            while self._peek() != ("punctuator", "]"):
+                items.append(self._value())
+            self._next()
+            return items
+        if value == "{":
+            fields = {}
+            while self._peek() != ("punctuator", "}"):
+                key = self._next()[1]
+                self._expect(":")
+                fields[key] = self._value()
+            self._next()
+            return fields
+        if kind == "name":
+            return {"true": True, "false": False, "null": None}.get(value, value) # enums are returned as their names
+        raise GraphQLError("Parse error on {!r}: expected a value".format(value))
@@ -0,0 +1,215 @@
+import base64
+import collections
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ..components import utilities
+from . import graphql
+from .exchange import Exchange
+
+
+def constant(seconds:float):
+    """A latency distribution that always waits the given number of seconds."""
+    return lambda generator: seconds
+
+def uniform(low:float, high:float):
+    """A latency distribution uniformly spread between low and high seconds."""
+    return lambda generator: generator.uniform(low, high)
+
+def exponential(mean:float):
+    """An exponential latency distribution with the given mean in seconds."""
+    return lambda generator: generator.expovariate(1 / mean)
+
+def lognormal(median:float, sigma:float=0.5):
+    """A log-normal latency distribution, the usual shape of real API latencies: most requests take about median seconds with a long tail of slow ones that grows with sigma."""
+    return lambda generator: generator.lognormvariate(0, sigma) * median
+
+
+class FakeServer:
+    """A local stand-in for the Buycoins graphql API, for integration and load tests without network access.
+
+    It answers getPrices, getBalances, getOrders, getMarketBook, getEstimatedNetworkFee, send, buy, sell, postLimitOrder, postMarketOrder, createAddress and createDepositAccount from the state of an Exchange, including automatic persisted queries, and can add latency and inject failures to every request. Inside a `with` block it points the client at itself.
+
+    Args:
+        exchange (Exchange):
+            The state the server answers from. A new Exchange with market_book_size orders is created if it is not given.
+        market_book_size (int):
+            The number of synthetic orders on the market book of the default exchange
+        latency (float|function):
+            Seconds to wait before answering each request, or a distribution such as lognormal(0.05) to draw them from
+        error_rate (float):
+            The fraction of requests answered with a graphql error ("Internal server error") in place of their data
+        faults (dict):
+            The fraction of requests answered with each HTTP status code, e.g {429: 0.05, 503: 0.01}. The status codes can be 401, 429 or 5xx. 429 responses include a Retry-After header.
+        credentials (tuple):
+            A (public_key, secret_key) pair every request must authenticate with. Any credentials are accepted if it is not given.
+        persisted_queries (bool):
+            Whether to answer automatic persisted queries, requests that name their document by its sha256 hash. Documents are remembered once a request has sent them with their hash. If False, such requests are answered with a PersistedQueryNotSupported error. Defaults to True.
+        seed (int):
+            Makes the latencies, faults and default exchange repeatable
+        host (str), port (int):
+            The address to listen on. A free port is picked by default.
+
+    Raises:
+        Exception: Raised if a fault status code is not 401, 429 or 5xx or a rate is not between 0 and 1.
+
+    Example:
+        with FakeServer(latency=lognormal(0.05), faults={429: 0.01}) as server:
+            buycoins.Auth.setup("public", "secret")
+            buycoins.Prices.list()
+        print(server.stats)
+    """
+
+    def __init__(self, exchange:Exchange=None, market_book_size:int=100, latency=None, error_rate:float=0.0, faults:dict=None, credentials:tuple=None, persisted_queries:bool=True, seed:int=None, host:str="127.0.0.1", port:int=0):
+        faults = dict(faults or {})
+        for status_code, rate in list(faults.items()) + [("error_rate", error_rate)]:
+            if status_code != "error_rate" and status_code not in (401, 429) and not 500 <= status_code <= 599:
+                raise Exception("Fault status codes must be 401, 429 or 5xx. Got {}".format(status_code))
+            if not 0 <= rate <= 1:
+                raise Exception("Fault and error rates must be between 0 and 1. Got {}".format(rate))
+        if sum(faults.values()) > 1:
+            raise Exception("Fault and error rates must be between 0 and 1. Got {}".format(sum(faults.values())))
+
+        self.exchange = exchange if exchange is not None else Exchange(market_book_size, seed=seed)
+        self.latency = latency if latency is None or callable(latency) else constant(latency)
+        self.error_rate = error_rate
+        self.faults = faults
+        self.credentials = credentials
+        self.persisted_queries = persisted_queries
+        self.documents = {} # sha256 hash -> the persisted document
+        self.random = random.Random(seed)
+        self.stats = collections.Counter() # requests by status code, by root field for answered documents, and the request "bytes_received"
+        self._address = (host, port)
+        self._server = None
+        self._thread = None
+        self._api_url = None
+
+    @property
+    def url(self):
+        """The API_URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}/api/graphql".format(host, port)
+
+    def start(self):
+        """Start answering requests on a background thread and return the server."""
+        self._server = _HTTPServer(self._address, _Handler)
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True) # poll often so stop returns quickly
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and close its socket."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        self._api_url = utilities.API_URL
+        utilities.API_URL = self.url
+        return self
+
+    def __exit__(self, *exc_info):
+        utilities.API_URL = self._api_url
+        self.stop()
+
+    def handle(self, body:bytes, authorization:str=None):
+        """Answer one request body, returning a (status code, headers, response body) tuple."""
+        if self.latency is not None:
+            time.sleep(max(self.latency(self.random), 0))
+
+        draw = self.random.random()
+        for status_code, rate in self.faults.items():
+            if draw < rate:
+                return self._error(status_code)
+            draw -= rate
+
+        if self.credentials is not None and authorization != "Basic " + base64.b64encode("{}:{}".format(*self.credentials).encode()).decode():
+            return self._error(401)
+
+        self.stats["bytes_received"] += len(body)
+        try:
+            request = json.loads(body)
+            persisted = (request.get("extensions") or {}).get("persistedQuery")
+            if persisted is not None:
+                error = self._persist(request, persisted)
+                if error is not None:
+                    return self._answer({"errors": [{"message": error, "extensions": {"code": _PERSISTED_QUERY_CODES[error]}}]})
+            operation, fields = graphql.parse(request["query"], request.get("variables"))
+            graphql.validate(operation, fields)
+        except graphql.GraphQLError as e:
+            return self._answer({"errors": [e.to_dict()]})
+        except (ValueError, KeyError, TypeError):
+            return self._error(400)
+
+        if self.random.random() < self.error_rate:
+            return self._answer({"errors": [{"message": "Internal server error", "path": [fields[0].alias]}], "data": None})
+
+        data, errors = {}, []
+        for field in fields:
+            self.stats[field.name] += 1
+            try:
+                with self.exchange.lock:
+                    data[field.alias] = graphql.project(getattr(self.exchange, field.name)(field.args), field.selection)
+            except graphql.GraphQLError as e:
+                data[field.alias] = None
+                errors.append({"message": str(e), "path": [field.alias]})
+        return self._answer({"data": data, "errors": errors} if errors else {"data": data})
+
+    def _persist(self, request, persisted):
+        """Fill in the document of a persisted query, remembering it if the request sent it, and return the error to answer with if there is one."""
+        if not self.persisted_queries:
+            return None if "query" in request else "PersistedQueryNotSupported" # the hash of a full document is ignored
+        digest = persisted.get("sha256Hash")
+        if "query" in request:
+            if hashlib.sha256(request["query"].encode()).hexdigest() != digest:
+                return "provided sha does not match query"
+            self.documents[digest] = request["query"]
+            return None
+        if digest not in self.documents:
+            self.stats["persisted_query_misses"] += 1
+            return "PersistedQueryNotFound"
+        request["query"] = self.documents[digest]
+        return None
+
+    def _answer(self, response):
+        self.stats[200] += 1
+        return 200, {}, json.dumps(response).encode()
+
+    def _error(self, status_code):
+        self.stats[status_code] += 1
+        headers = {"Retry-After": "1"} if status_code == 429 else {}
+        return status_code, headers, json.dumps({"errors": [{"message": _REASONS.get(status_code, "Server error")}]}).encode()
+
+
+_REASONS = {400: "Bad request", 401: "Invalid credentials", 429: "Too many requests"}
+_PERSISTED_QUERY_CODES = {"PersistedQueryNotFound": "PERSISTED_QUERY_NOT_FOUND", "PersistedQueryNotSupported": "PERSISTED_QUERY_NOT_SUPPORTED", "provided sha does not match query": "INTERNAL_SERVER_ERROR"}
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128 # accept many concurrent clients in load tests
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep connections alive like the real API
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        status_code, headers, body = self.server.fake.handle(self.rfile.read(int(self.headers.get("Content-Length", 0))), self.headers.get("Authorization"))
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
@@ -16,6 +16,18 @@ setup(name='buycoins_client',
     license='MIT', 
     packages=find_packages(), 
     install_requires=['requests'], 
+    extras_require={'aio': ['aiohttp']}, 
+    python_requires='>=3.7', 
+    classifiers=[
+        'Programming Language :: Python :: 3', 
+        'Programming Language :: Python :: 3 :: Only', 
+        'Programming Language :: Python :: 3.7', 
+        'Programming Language :: Python :: 3.8', 
+        'Programming Language :: Python :: 3.9', 
+        'Programming Language :: Python :: 3.10', 
+        'Programming Language :: Python :: 3.11', 
+        'Programming Language :: Python :: 3.12', 
+    ], 
     zip_safe=True, 
     long_description=README, 
     long_description_content_type='text/markdown'
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, patch
+
+from buycoins_client.components import utilities
+
+try:
+    import aiohttp
+    from buycoins_client import aio
+    from buycoins_client.aio.transport import Response
+except ImportError:
+    aiohttp = None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"data":{"getPrices":[{"id":"QnV5Y29pbnNQcmljZS0x","cryptocurrency":"bitcoin"}]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipUnless(aiohttp, "aiohttp is not installed")
+class TestAioMethods(unittest.IsolatedAsyncioTestCase):
+
+    def tearDown(self):
+        aio.utilities.TRANSPORT = None
+
+    async def test_invalid_field(self):
+        """
+            Should throw the same exception as the blocking client for a node dict without a field property
+        """
+        try:
+            await aio.Prices.list([{"field":"cryptocrrency"}, {"name":"chuks"}])
+        except Exception as e:
+            self.assertEqual(str(e), "Fields contains a node dict without a 'field' property.")
+
+    async def test_invalid_transport(self):
+        """
+            Should throw an exception when setting a transport that is not an AsyncTransport instance
+        """
+        try:
+            aio.set_transport("aiohttp")
+        except Exception as e:
+            self.assertEqual(str(e), "transport must be an instance of buycoins_client.aio.AsyncTransport")
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    async def test_failed_balances_retrieval(self, mock_post):
+        """
+            Should return a failure status when invalid node is requested.
+        """
+        mock_post.return_value = Response(200, json.dumps({"errors":[{"message":"Field 'cryptocurrenc' doesn't exist on type 'Account'","path":["query","getBalances","cryptocurrenc"]}]}).encode())
+
+        aio.Auth.setup("chuks", "emeka")
+        response = await aio.Balances.get("bitcoin", [{"field":"cryptocurrenc"}])
+
+        self.assertEqual(response['status'], "failure")
+        self.assertEqual(response["errors"][0]["reason"], "Field 'cryptocurrenc' doesn't exist on type 'Account'")
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    async def test_successful_post_market_order(self, mock_post):
+        """
+            Should return a success status for successful market order posting
+        """
+        mock_post.return_value = Response(200, json.dumps({"data":{"postMarketOrder":{"id":"adfFDAFDajd829slsf"}}}).encode())
+
+        aio.Auth.setup("chuks", "emeka")
+        response = await aio.Orders.post_market_order({"orderSide":"buy", "cryptocurrency":"bitcoin", "coinAmount":0.001})
+
+        self.assertEqual(response['status'], "success")
+        self.assertEqual(response["data"]["postMarketOrder"]["id"], "adfFDAFDajd829slsf")
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    async def test_post_limit_orders_concurrently(self, mock_post):
+        """
+            Should post every order as its own request and return the results in order
+        """
+        mock_post.return_value = Response(200, json.dumps({"data":{"postLimitOrder":{"id":"adfFDAFDajd829slsf"}}}).encode())
+
+        aio.Auth.setup("chuks", "emeka")
+        orders = [{"orderSide":"buy", "priceType":"static", "cryptocurrency":"bitcoin", "coinAmount":0.01, "staticPrice":price} for price in [24000000.0, 23900000.0, 23800000.0]]
+        responses = await aio.Orders.post_limit_orders(orders, concurrency=2)
+
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual([response["status"] for response in responses], ["success"] * 3)
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    async def test_batch(self, mock_post):
+        """
+            Should send aio component calls added to a batch in one request
+        """
+        mock_post.return_value = Response(200, json.dumps({"data":{"c0":[{"id":"price"}], "c1":[{"id":"balance"}]}}).encode())
+
+        aio.Auth.setup("chuks", "emeka")
+        batch = aio.Batch()
+        batch.add(aio.Prices.list)
+        batch.add(aio.Balances.get, "bitcoin")
+        prices, balance = await batch.send()
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(prices["data"]["getPrices"][0]["id"], "price")
+        self.assertEqual(balance["data"]["getBalances"][0]["id"], "balance")
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    async def test_iter_market_orders(self, mock_post):
+        """
+            Should page through the market book with an async generator
+        """
+        mock_post.side_effect = [
+            Response(200, json.dumps({"data":{"getMarketBook":{"orders":{"pageInfo":{"hasNextPage":True, "endCursor":"MQ"}, "edges":[{"cursor":"MQ", "node":{"id":"1"}}]}}}}).encode()),
+            Response(200, json.dumps({"data":{"getMarketBook":{"orders":{"pageInfo":{"hasNextPage":False, "endCursor":"Mg"}, "edges":[{"cursor":"Mg", "node":{"id":"2"}}]}}}}).encode()),
+        ]
+
+        aio.Auth.setup("chuks", "emeka")
+        nodes = [node async for node in aio.Orders.iter_market_orders(page_size=1)]
+
+        self.assertEqual([node["id"] for node in nodes], ["1", "2"])
+        self.assertEqual(json.loads(mock_post.call_args_list[1][1]["data"])["variables"], {"first":1, "after":"MQ"})
+
+    async def test_concurrent_calls_share_one_loop(self):
+        """
+            Should run many concurrent calls on one event loop against a local server
+        """
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        api_url = utilities.API_URL
+        utilities.API_URL = "http://127.0.0.1:{}/api/graphql".format(server.server_address[1])
+        aio.set_transport(aio.AsyncTransport(pool_size=8))
+        try:
+            aio.Auth.setup("chuks", "emeka")
+            responses = await asyncio.gather(*[aio.Prices.list() for _ in range(50)])
+        finally:
+            await aio.utilities.get_transport().close()
+            utilities.API_URL = api_url
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(len(responses), 50)
+        self.assertTrue(all(response["status"] == "success" for response in responses))
+        self.assertEqual(responses[0]["data"]["getPrices"][0]["cryptocurrency"], "bitcoin")
+
+if __name__ == '__main__':
+    unittest.main()
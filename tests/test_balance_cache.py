@@ -0,0 +1,206 @@
+from buycoins_client import Auth
+from buycoins_client import BalanceCache
+from buycoins_client import Balances
+from buycoins_client import Batch
+from buycoins_client import BuycoinsClient
+from buycoins_client import Orders
+from buycoins_client import Transfers
+from buycoins_client import set_balance_cache
+import json
+import unittest
+from unittest.mock import AsyncMock, patch
+
+try:
+    import aiohttp
+    from buycoins_client import aio
+    from buycoins_client.aio.transport import Response
+except ImportError:
+    aiohttp = None
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+def balance(cryptocurrency, amount):
+    return {"id":"QWNjb3VudC0x", "cryptocurrency":cryptocurrency, "confirmedBalance":amount}
+
+def balances_response(*nodes):
+    return MockResponse({"data":{"getBalances":list(nodes)}}, 200)
+
+class TestBalanceCacheMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+        self.cache = BalanceCache()
+        set_balance_cache(self.cache)
+
+    def tearDown(self):
+        set_balance_cache(None)
+
+    def test_invalid_ttl(self):
+        """
+            Should throw an exception for a ttl that is not a positive number
+        """
+        try:
+            BalanceCache(ttl=0)
+        except Exception as e:
+            self.assertEqual(str(e), "ttl must be a number of seconds greater than 0.")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_balances_are_served_from_memory(self, mock_post):
+        """
+            Should send getBalances once for repeated calls and answer get calls from a cached list
+        """
+        mock_post.return_value = balances_response(balance("bitcoin", "0.5"), balance("naira_token", "1000"))
+
+        first = Balances.list()
+        first["data"]["getBalances"].clear() # callers get copies
+        second = Balances.list()
+        bitcoin = Balances.get("bitcoin", as_models=True)
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(len(second["data"]["getBalances"]), 2)
+        self.assertEqual(str(bitcoin["data"]["getBalances"][0].confirmedBalance), "0.5")
+        self.assertEqual(self.cache.stats(), {"hits": 2, "misses": 1, "invalidations": 0, "size": 3})
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_mutations_invalidate_balances(self, mock_post):
+        """
+            Should drop the balances a successful send or order changes and keep them after a failed one
+        """
+        mock_post.side_effect = [
+            balances_response(balance("bitcoin", "0.5")),
+            balances_response(balance("ethereum", "2")),
+            MockResponse({"data":{"send":{"id":"1", "cryptocurrency":"bitcoin"}}}, 200),
+            balances_response(balance("bitcoin", "0.4")),
+            MockResponse({"errors":[{"message":"Insufficient balance", "path":["postLimitOrder"]}]}, 200),
+            MockResponse({"data":{"postLimitOrder":{"id":"2"}}}, 200),
+        ]
+        Balances.get("bitcoin")
+        Balances.get("ethereum")
+        Transfers.send({"cryptocurrency":"bitcoin", "amount":0.1, "address":"1MmyYvSEYLCPm45Ps6vQin1heGBv3jnBMx"})
+        bitcoin = Balances.get("bitcoin")
+        Balances.get("ethereum")
+
+        order = {"orderSide":"buy", "priceType":"static", "cryptocurrency":"ethereum", "coinAmount":0.1, "staticPrice":1000000.0}
+        Orders.post_limit_order(order)
+        Balances.get("ethereum")
+        Orders.post_limit_order(order)
+
+        self.assertEqual(bitcoin["data"]["getBalances"][0]["confirmedBalance"], "0.4")
+        self.assertEqual(mock_post.call_count, 6)
+        self.assertEqual(self.cache.invalidations, 2)
+        self.assertEqual(self.cache.stats()["size"], 1)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_batches_and_custom_fields_bypass_the_cache(self, mock_post):
+        """
+            Should send calls with custom fields and batched calls, and invalidate on batched mutations
+        """
+        mock_post.side_effect = [
+            balances_response(balance("bitcoin", "0.5")),
+            balances_response(balance("bitcoin", "0.5")),
+            MockResponse({"data":{"c0":[balance("bitcoin", "0.5")]}}, 200),
+            MockResponse({"data":{"c0":{"id":"1", "cryptocurrency":"bitcoin"}}}, 200),
+        ]
+        Balances.get("bitcoin")
+        Balances.get("bitcoin", fields=[{"field":"confirmedBalance"}])
+        batch = Batch()
+        batch.add(Balances.get, "bitcoin")
+        batch.send()
+        batch = Batch()
+        batch.add(Transfers.sell, {"cryptocurrency":"bitcoin", "coin_amount":0.1, "price":"QnV5Y29pbnNQcmljZS0x"})
+        batch.send()
+
+        self.assertEqual(mock_post.call_count, 4)
+        self.assertEqual(self.cache.stats(), {"hits": 0, "misses": 1, "invalidations": 1, "size": 0})
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_clients_keep_their_own_balances(self, mock_post):
+        """
+            Should not serve the balances of the module functions to a client
+        """
+        mock_post.return_value = balances_response(balance("bitcoin", "0.5"))
+        client = BuycoinsClient("buycoins", "africa", balance_cache=BalanceCache())
+
+        Balances.list()
+        client.Balances.list()
+        client.Balances.list()
+        BuycoinsClient("buycoins", "africa").Balances.list()
+
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(client.balance_cache.hits, 1)
+
+def aio_response(mock_response):
+    return Response(mock_response.status_code, mock_response.content)
+
+@unittest.skipUnless(aiohttp, "aiohttp is not installed")
+class TestAsyncBalanceCacheMethods(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+        self.cache = BalanceCache()
+        set_balance_cache(self.cache)
+
+    def tearDown(self):
+        set_balance_cache(None)
+        aio.utilities.TRANSPORT = None
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    async def test_mutations_invalidate_balances(self, mock_post):
+        """
+            Should drop the balances a successful aio send or order changes and keep them after a failed one
+        """
+        mock_post.side_effect = [aio_response(response) for response in [
+            balances_response(balance("bitcoin", "0.5")),
+            balances_response(balance("ethereum", "2")),
+            MockResponse({"data":{"send":{"id":"1", "cryptocurrency":"bitcoin"}}}, 200),
+            balances_response(balance("bitcoin", "0.4")),
+            MockResponse({"errors":[{"message":"Insufficient balance", "path":["postLimitOrder"]}]}, 200),
+            MockResponse({"data":{"postLimitOrder":{"id":"2"}}}, 200),
+        ]]
+        await aio.Balances.get("bitcoin")
+        await aio.Balances.get("ethereum")
+        await aio.Transfers.send({"cryptocurrency":"bitcoin", "amount":0.1, "address":"1MmyYvSEYLCPm45Ps6vQin1heGBv3jnBMx"})
+        bitcoin = await aio.Balances.get("bitcoin")
+        await aio.Balances.get("ethereum")
+
+        order = {"orderSide":"buy", "priceType":"static", "cryptocurrency":"ethereum", "coinAmount":0.1, "staticPrice":1000000.0}
+        await aio.Orders.post_limit_order(order)
+        await aio.Balances.get("ethereum")
+        await aio.Orders.post_limit_order(order)
+
+        self.assertEqual(bitcoin["data"]["getBalances"][0]["confirmedBalance"], "0.4")
+        self.assertEqual(mock_post.call_count, 6)
+        self.assertEqual(self.cache.invalidations, 2)
+        self.assertEqual(self.cache.stats()["size"], 1)
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    async def test_batched_and_bulk_mutations_invalidate_balances(self, mock_post):
+        """
+            Should drop the balances changed by the mutations of an aio Batch and of concurrent bulk orders
+        """
+        mock_post.side_effect = [aio_response(response) for response in [
+            balances_response(balance("bitcoin", "0.5")),
+            MockResponse({"data":{"c0":{"id":"1", "cryptocurrency":"bitcoin"}}}, 200),
+            balances_response(balance("bitcoin", "0.4")),
+            MockResponse({"data":{"postMarketOrder":{"id":"2"}}}, 200),
+        ]]
+        await aio.Balances.get("bitcoin")
+        batch = aio.Batch()
+        batch.add(aio.Transfers.sell, {"cryptocurrency":"bitcoin", "coin_amount":0.1, "price":"QnV5Y29pbnNQcmljZS0x"})
+        await batch.send()
+        await aio.Balances.get("bitcoin")
+        await aio.Orders.post_market_orders([{"orderSide":"sell", "cryptocurrency":"bitcoin", "coinAmount":0.1}], concurrency=1)
+
+        self.assertEqual(mock_post.call_count, 4)
+        self.assertEqual(self.cache.invalidations, 2)
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+from buycoins_client import Auth
+from buycoins_client import Balances
+from buycoins_client import Batch
+from buycoins_client import Orders
+from buycoins_client import Prices
+from buycoins_client import Transfers
+import json
+import unittest
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+class TestBatchMethods(unittest.TestCase):
+
+    def test_invalid_call_is_rejected_on_add(self):
+        """
+            Should throw the component's exception when an invalid call is added
+        """
+        batch = Batch()
+        try:
+            batch.add(Balances.get, "    ")
+        except Exception as e:
+            self.assertEqual(str(e), "cryptocurrency argument must be a valid string identifier.")
+        self.assertEqual(len(batch), 0)
+
+    @patch('requests.Session.post')
+    def test_calls_are_sent_in_one_document(self, mock_post):
+        """
+            Should send every query call as an aliased field of one document
+        """
+        mock_post.return_value = MockResponse({"data":{"c0":[{"id":"price"}], "c1":[{"id":"balance"}], "c2":{"dynamicPriceExpiry":1612396362}}}, 200)
+
+        Auth.setup("chuks", "emeka")
+        batch = Batch()
+        batch.add(Prices.list, [{"field":"id"}])
+        batch.add(Balances.get, "bitcoin", fields=[{"field":"id"}])
+        batch.add(Orders.list_my_orders, status="open")
+        prices, balance, orders = batch.send()
+
+        self.assertEqual(mock_post.call_count, 1)
+        body = json.loads(mock_post.call_args[1]["data"])
+        self.assertTrue(body["query"].startswith("query($c1_cryptocurrency:Cryptocurrency, $c2_status:GetOrdersStatus!) { c0:getPrices{ id } c1:getBalances(cryptocurrency:$c1_cryptocurrency){ id } c2:getOrders(status:$c2_status)"))
+        self.assertEqual(body["variables"], {"c1_cryptocurrency":"bitcoin", "c2_status":"open"})
+        self.assertEqual(prices, {"status":"success", "data":{"getPrices":[{"id":"price"}]}})
+        self.assertEqual(balance["data"]["getBalances"][0]["id"], "balance")
+        self.assertEqual(orders["data"]["getOrders"]["dynamicPriceExpiry"], 1612396362)
+
+    @patch('requests.Session.post')
+    def test_partial_success(self, mock_post):
+        """
+            Should only fail the call an error belongs to and keep the data of the others
+        """
+        mock_post.return_value = MockResponse({"data":{"c0":[{"id":"price"}], "c1":None}, "errors":[{"message":"Field 'cryptocurrenc' doesn't exist on type 'Account'", "path":["query","c1","cryptocurrenc"]}]}, 200)
+
+        Auth.setup("chuks", "emeka")
+        batch = Batch()
+        batch.add(Prices.list)
+        batch.add(Balances.list, [{"field":"cryptocurrenc"}])
+        prices, balances = batch.send()
+
+        self.assertEqual(prices["status"], "success")
+        self.assertEqual(prices["data"]["getPrices"][0]["id"], "price")
+        self.assertEqual(balances["status"], "failure")
+        self.assertEqual(balances["errors"][0]["reason"], "Field 'cryptocurrenc' doesn't exist on type 'Account'")
+        self.assertNotIn("data", balances)
+
+    @patch('requests.Session.post')
+    def test_request_failure_applies_to_every_call(self, mock_post):
+        """
+            Should fail every call when the request itself fails
+        """
+        mock_post.return_value = MockResponse({}, 401)
+
+        Auth.setup("chuks", "emeka")
+        batch = Batch()
+        batch.add(Prices.list)
+        batch.add(Balances.list)
+        responses = batch.send()
+
+        self.assertEqual([response["errors"][0]["reason"] for response in responses], ["Invalid credentials", "Invalid credentials"])
+
+    @patch('requests.Session.post')
+    def test_queries_and_mutations_are_sent_separately(self, mock_post):
+        """
+            Should send one document per operation type and keep the responses in call order
+        """
+        mock_post.side_effect = [
+            MockResponse({"data":{"c0":[{"id":"price"}]}}, 200),
+            MockResponse({"data":{"c1":{"id":"transfer"}}}, 200),
+        ]
+
+        Auth.setup("chuks", "emeka")
+        batch = Batch()
+        batch.add(Prices.list)
+        batch.add(Transfers.send, {"cryptocurrency":"bitcoin", "amount":0.02, "address":"vdADFaj7f89dfkadf="})
+        prices, transfer = batch.send()
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertTrue(json.loads(mock_post.call_args_list[1][1]["data"])["query"].startswith("mutation($c1_cryptocurrency:Cryptocurrency, $c1_amount:BigDecimal!, $c1_address:String!) { c1:send("))
+        self.assertEqual(prices["data"]["getPrices"][0]["id"], "price")
+        self.assertEqual(transfer["data"]["send"]["id"], "transfer")
+
+    @patch('requests.Session.post')
+    def test_failure_response_keeps_partial_data(self, mock_post):
+        """
+            Should keep the data returned alongside errors in a single call's failure response
+        """
+        mock_post.return_value = MockResponse({"data":{"getPrices":[{"id":"price"}]}, "errors":[{"message":"Too many fields", "path":["getPrices", 0, "maxSell"]}]}, 200)
+
+        Auth.setup("chuks", "emeka")
+        response = Prices.list()
+
+        self.assertEqual(response["status"], "failure")
+        self.assertEqual(response["data"]["getPrices"][0]["id"], "price")
+
+if __name__ == '__main__':
+    unittest.main()
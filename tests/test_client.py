@@ -0,0 +1,111 @@
+from buycoins_client import Auth
+from buycoins_client import BuycoinsClient
+from buycoins_client import Prices
+from buycoins_client.components import utilities
+import base64
+import concurrent.futures
+import json
+import unittest
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+def authorization(public_key, secret_key):
+    return "Basic " + base64.b64encode("{}:{}".format(public_key, secret_key).encode()).decode()
+
+class TestClientMethods(unittest.TestCase):
+
+    def test_invalid_credentials(self):
+        """
+            Should throw an exception for credentials that are not strings
+        """
+        try:
+            BuycoinsClient("buycoins", None)
+        except Exception as e:
+            self.assertEqual(str(e), "Invalid secret key. Secret key should be a string")
+
+    def test_component_methods(self):
+        """
+            Should expose the public functions of every component and hide the private ones
+        """
+        client = BuycoinsClient("buycoins", "africa")
+
+        self.assertEqual(client.Prices.list.__doc__, Prices.list.__doc__)
+        self.assertTrue(callable(client.Orders.post_limit_order))
+        self.assertTrue(callable(client.Transfers.fees))
+        self.assertFalse(hasattr(client.Prices, "_list_query"))
+        self.assertNotIn("africa", repr(client.auth))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_client_credentials(self, mock_post):
+        """
+            Should send the precomputed Authorization header of the client instead of the Auth.setup credentials
+        """
+        mock_post.return_value = MockResponse({"data":{"getPrices":[]}}, 200)
+        Auth.setup("chuks", "emeka")
+        client = BuycoinsClient("buycoins", "africa")
+
+        client.Prices.list()
+        Prices.list()
+
+        self.assertEqual(mock_post.call_args_list[0][1]["auth"].header, authorization("buycoins", "africa"))
+        self.assertEqual(mock_post.call_args_list[1][1]["auth"].header, authorization("chuks", "emeka"))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_module_functions_need_credentials(self, mock_post):
+        """
+            Should still require Auth.setup for the module functions outside a client
+        """
+        mock_post.return_value = MockResponse({"data":{"getPrices":[]}}, 200)
+        previous, utilities.AUTH = utilities.AUTH, None
+        client = BuycoinsClient("buycoins", "africa")
+        try:
+            with client.use():
+                self.assertEqual(Prices.list()["status"], "success")
+            Prices.list()
+        except Exception as e:
+            self.assertEqual(str(e), "Please set up your public and secret keys using buycoins_python.Auth.setup function.")
+        finally:
+            utilities.AUTH = previous
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_clients_in_threads(self, mock_post):
+        """
+            Should keep the credentials of concurrent calls of different clients apart
+        """
+        mock_post.return_value = MockResponse({"data":{"getBalances":[]}}, 200)
+        clients = [BuycoinsClient("account{}".format(number), "secret{}".format(number)) for number in range(4)]
+
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda client: client.Balances.list(), clients * 25))
+
+        headers = sorted(call[1]["auth"].header for call in mock_post.call_args_list)
+        self.assertEqual(headers, sorted([authorization("account{}".format(number), "secret{}".format(number)) for number in range(4)] * 25))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_iterators_and_batches(self, mock_post):
+        """
+            Should use the client for every page of an iterator and for a batch
+        """
+        page = {"dynamicPriceExpiry":1, "orders":{"pageInfo":{"hasNextPage":False, "endCursor":None}, "edges":[{"cursor":"MA", "node":{"id":"1"}}]}}
+        mock_post.side_effect = [MockResponse({"data":{"getMarketBook":page}}, 200), MockResponse({"data":{"c0":[], "c1":[]}}, 200)]
+        client = BuycoinsClient("buycoins", "africa")
+
+        nodes = list(client.Orders.iter_market_orders(prefetch=False))
+        batch = client.batch()
+        batch.add(Prices.list)
+        batch.add(Prices.list)
+        batch.send()
+
+        self.assertEqual(nodes, [{"id":"1"}])
+        self.assertEqual([call[1]["auth"].header for call in mock_post.call_args_list], [authorization("buycoins", "africa")] * 2)
+
+if __name__ == '__main__':
+    unittest.main()
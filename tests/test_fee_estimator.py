@@ -0,0 +1,104 @@
+from buycoins_client import Auth
+from buycoins_client import FeeEstimator
+import json
+import time
+import unittest
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+def fee(amount):
+    return {"estimatedFee":"0.00044", "total":str(round(amount + 0.00044, 6))}
+
+def sent_amounts(call):
+    variables = json.loads(call[1]["data"])["variables"]
+    return sorted(value for name, value in variables.items() if name.endswith("_amount"))
+
+class TestFeeEstimatorMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+
+    def test_invalid_amount(self):
+        """
+            Should throw the exceptions of Transfers.fees for invalid arguments
+        """
+        try:
+            FeeEstimator().fees({"cryptocurrency":"bitcoin", "amount":1})
+        except Exception as e:
+            self.assertEqual(str(e), "amount argument must be a valid float and greater than 0.")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_amounts_share_their_bucket(self, mock_post):
+        """
+            Should fetch one estimate per amount bucket and compute the total of each amount
+        """
+        mock_post.return_value = MockResponse({"data":{"c0":fee(0.012)}}, 200)
+        estimator = FeeEstimator()
+
+        first = estimator.fees({"cryptocurrency":"bitcoin", "amount":0.01234})
+        second = estimator.fees({"cryptocurrency":"bitcoin", "amount":0.0121})
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(sent_amounts(mock_post.call_args), [0.012])
+        self.assertEqual(first["data"]["getEstimatedNetworkFee"], {"estimatedFee":"0.00044", "total":"0.01278"})
+        self.assertEqual(second["data"]["getEstimatedNetworkFee"]["total"], "0.01254")
+        self.assertEqual((estimator.hits, estimator.misses), (1, 1))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_many_amounts_in_one_request(self, mock_post):
+        """
+            Should fetch the estimates of every missing amount with a single aliased query
+        """
+        mock_post.side_effect = [
+            MockResponse({"data":{"c0":fee(0.1)}}, 200),
+            MockResponse({"data":{"c0":fee(0.5), "c1":fee(1.0)}, "errors":[{"message":"Amount is above the limit", "path":["c2"]}]}, 200),
+        ]
+        estimator = FeeEstimator(significant_digits=None)
+        estimator.fees({"cryptocurrency":"bitcoin", "amount":0.1})
+
+        responses = estimator.fees_many("bitcoin", [1.0, 0.1, 0.5, 1000.0])
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(sent_amounts(mock_post.call_args), [0.5, 1.0, 1000.0])
+        self.assertEqual([response["status"] for response in responses], ["success", "success", "success", "failure"])
+        self.assertEqual(responses[0]["data"]["getEstimatedNetworkFee"]["total"], "1.00044")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_expired_estimates_are_fetched_again(self, mock_post):
+        """
+            Should fetch an estimate again once it is older than ttl
+        """
+        mock_post.return_value = MockResponse({"data":{"c0":fee(0.1)}}, 200)
+        estimator = FeeEstimator(ttl=0.05)
+
+        estimator.fees({"cryptocurrency":"bitcoin", "amount":0.1})
+        time.sleep(0.06)
+        estimator.fees({"cryptocurrency":"bitcoin", "amount":0.1})
+
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_warm_amounts(self, mock_post):
+        """
+            Should fetch every warm amount in the background with one request
+        """
+        mock_post.return_value = MockResponse({"data":{"c0":fee(0.01), "c1":fee(0.1), "c2":fee(1.0)}}, 200)
+        estimator = FeeEstimator(warm={"bitcoin":[0.01, 0.1], "ethereum":[1.0]})
+
+        with estimator:
+            time.sleep(0.05)
+        estimator.fees({"cryptocurrency":"ethereum", "amount":1.0})
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(estimator.hits, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+from buycoins_client import Auth
+from buycoins_client import Batch
+from buycoins_client import Hooks
+from buycoins_client import Orders
+from buycoins_client import Prices
+from buycoins_client import Transfers
+import json
+import unittest
+import warnings
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+class MockStreamingResponse:
+    def __init__(self, json_data, status_code):
+        self.body = json.dumps(json_data).encode("utf-8")
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(len(self.body))}
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+    def close(self):
+        pass
+
+class TestHooksMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+        self.events = []
+        Hooks.register(self.events.append)
+
+    def tearDown(self):
+        Hooks.unregister(self.events.append)
+
+    def test_invalid_hook(self):
+        """
+            Should throw an exception when registering a hook that is not callable
+        """
+        try:
+            Hooks.register("print")
+        except Exception as e:
+            self.assertEqual(str(e), "hook must be a function that takes an event dict.")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_start_and_end_events(self, mock_post):
+        """
+            Should emit a start and an end event with the size and phase timings of the request
+        """
+        mock_post.return_value = MockResponse({"data":{"getPrices":[{"id":"QnV5Y29pbnNQcmljZS0x"}]}}, 200)
+
+        Prices.list()
+
+        start, end = self.events
+        self.assertEqual((start["event"], end["event"]), ("start", "end"))
+        self.assertEqual(start["id"], end["id"])
+        self.assertEqual((end["command"], end["operation"], end["status"], end["error"]), ("getPrices", "query", "success", None))
+        self.assertEqual(start["bytes_sent"], len(mock_post.call_args[1]["data"]))
+        self.assertEqual(end["bytes_received"], len(mock_post.return_value.content))
+        self.assertEqual(sorted(start["timings"]), ["build", "validate"])
+        self.assertEqual(sorted(end["timings"]), ["build", "http", "parse", "validate"])
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_failed_request(self, mock_post):
+        """
+            Should emit an end event with the exception when the request raises
+        """
+        mock_post.side_effect = ConnectionError("Connection refused")
+
+        try:
+            Transfers.fees({"cryptocurrency":"bitcoin", "amount":0.02})
+        except ConnectionError as e:
+            self.assertEqual(str(e), "Connection refused")
+
+        self.assertEqual(self.events[-1]["event"], "end")
+        self.assertEqual(self.events[-1]["status"], None)
+        self.assertIs(type(self.events[-1]["error"]), ConnectionError)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_batch_and_stream_events(self, mock_post):
+        """
+            Should emit one pair of events per batch document and per streamed response
+        """
+        streamed = MockStreamingResponse({"data":{"getMarketBook":{"orders":{"edges":[{"node":{"id":"1"}}]}}}}, 200)
+        mock_post.side_effect = [MockResponse({"data":{"c0":[{"id":"price"}], "c1":{"dynamicPriceExpiry":1}}}, 200), streamed]
+
+        batch = Batch()
+        batch.add(Prices.list)
+        batch.add(Orders.list_market_orders)
+        batch.send()
+        nodes = list(Orders.stream_market_orders())
+
+        self.assertEqual([event["event"] for event in self.events], ["start", "end", "start", "end"])
+        self.assertEqual((self.events[1]["command"], self.events[1]["commands"], self.events[1]["status"]), ("batch", ["getPrices", "getMarketBook"], "success"))
+        self.assertEqual((self.events[3]["command"], self.events[3]["status"]), ("getMarketBook", "success"))
+        self.assertEqual(self.events[3]["bytes_received"], len(streamed.body))
+        self.assertEqual(nodes, [{"id":"1"}])
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_hook_errors_do_not_fail_requests(self, mock_post):
+        """
+            Should turn an exception raised by a hook into a warning
+        """
+        mock_post.return_value = MockResponse({"data":{"getPrices":[]}}, 200)
+
+        def broken(event):
+            raise KeyError("trace_id")
+
+        Hooks.register(broken)
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                response = Prices.list()
+        finally:
+            Hooks.unregister(broken)
+
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(len(caught), 2)
+        self.assertIs(caught[0].category, RuntimeWarning)
+
+if __name__ == '__main__':
+    unittest.main()
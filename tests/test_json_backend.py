@@ -0,0 +1,54 @@
+from buycoins_client.components import json_backend
+from buycoins_client.components import utilities
+import unittest
+
+class MockResponse:
+    def __init__(self, content, status_code):
+        self.content = content
+        self.status_code = status_code
+
+class TestJsonBackendMethods(unittest.TestCase):
+
+    def tearDown(self):
+        json_backend.use(json_backend.available()[0])
+
+    def test_unknown_backend(self):
+        """
+            Should throw an exception for a backend that is unknown or not installed
+        """
+        try:
+            json_backend.use("simplejson")
+        except Exception as e:
+            self.assertTrue(str(e).startswith("Unknown or uninstalled JSON backend simplejson."))
+
+    def test_fastest_backend_is_the_default(self):
+        """
+            Should select the first installed backend by default
+        """
+        self.assertEqual(json_backend.NAME, json_backend.available()[0])
+        self.assertEqual(json_backend.available()[-1], "json")
+
+    def test_backends_round_trip(self):
+        """
+            Should encode to bytes and decode back the same value with every installed backend
+        """
+        body = {"query":"query($amount:BigDecimal!) { getEstimatedNetworkFee(amount:$amount){ total }}", "variables":{"amount":0.02, "address":"naïra"}}
+        for name in json_backend.available():
+            json_backend.use(name)
+            encoded = json_backend.dumps(body)
+
+            self.assertIs(type(encoded), bytes)
+            self.assertEqual(json_backend.loads(encoded), body)
+
+    def test_parse_response_decodes_the_body(self):
+        """
+            Should decode the raw response body with the selected backend
+        """
+        for name in json_backend.available():
+            json_backend.use(name)
+            response = utilities.parse_response(MockResponse(b'{"data":{"getPrices":[{"id":"QnV5Y29pbnNQcmljZS0x"}]}}', 200))
+
+            self.assertEqual(response["data"]["getPrices"][0]["id"], "QnV5Y29pbnNQcmljZS0x")
+
+if __name__ == '__main__':
+    unittest.main()
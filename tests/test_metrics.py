@@ -0,0 +1,131 @@
+from buycoins_client import Auth
+from buycoins_client import BuycoinsClient
+from buycoins_client import Hooks
+from buycoins_client import Metrics
+from buycoins_client import Prices
+from buycoins_client import Transfers
+from buycoins_client import Transport
+from buycoins_client import set_transport
+from buycoins_client.components import utilities
+from buycoins_client.components.metrics import Histogram
+import json
+import unittest
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+class TestMetricsMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+        self.metrics = Metrics().enable()
+
+    def tearDown(self):
+        self.metrics.disable()
+        utilities.TRANSPORT = None
+
+    def test_histogram_percentiles(self):
+        """
+            Should report percentiles within the precision of the histogram
+        """
+        histogram = Histogram()
+        for millisecond in range(1, 1001):
+            histogram.record(millisecond / 1000)
+
+        self.assertEqual((histogram.count, histogram.min, histogram.max), (1000, 0.001, 1.0))
+        self.assertAlmostEqual(histogram.percentile(0.5), 0.5, delta=0.5 / 128)
+        self.assertAlmostEqual(histogram.percentile(0.99), 0.99, delta=0.99 / 128)
+        self.assertEqual(histogram.percentile(1), 1.0)
+        self.assertEqual(sorted(histogram.snapshot()), ["count", "max", "min", "p50", "p90", "p99", "p999", "sum"])
+        self.assertEqual(Histogram().percentile(0.5), None)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_metrics_per_command(self, mock_post):
+        """
+            Should count requests, errors by category and phase latencies per command
+        """
+        mock_post.side_effect = [
+            MockResponse({"data":{"getPrices":[{"id":"QnV5Y29pbnNQcmljZS0x"}]}}, 200),
+            MockResponse({"errors":[{"message":"Too many requests"}]}, 429),
+            MockResponse({"errors":[{"message":"Invalid amount", "path":["getEstimatedNetworkFee"]}], "data":None}, 200),
+        ]
+
+        Prices.list()
+        Prices.list()
+        Transfers.fees({"cryptocurrency":"bitcoin", "amount":0.02})
+
+        commands = self.metrics.snapshot()["commands"]
+        self.assertEqual((commands["getPrices"]["requests"], commands["getPrices"]["errors"]), (2, {"rate_limited": 1}))
+        self.assertEqual(commands["getEstimatedNetworkFee"]["errors"], {"graphql_error": 1})
+        self.assertEqual(sorted(commands["getPrices"]["latency"]), ["build", "http", "parse", "total", "validate"])
+        self.assertEqual(commands["getPrices"]["latency"]["http"]["count"], 2)
+        self.assertEqual(commands["getPrices"]["bytes_sent"], sum(len(call[1]["data"]) for call in mock_post.call_args_list[:2]))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_exceptions_are_counted(self, mock_post):
+        """
+            Should count requests that raise as exception errors
+        """
+        mock_post.side_effect = ConnectionError("Connection refused")
+
+        try:
+            Prices.list()
+        except ConnectionError as e:
+            self.assertEqual(str(e), "Connection refused")
+
+        self.assertEqual(self.metrics.snapshot()["commands"]["getPrices"]["errors"], {"exception": 1})
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_prometheus_export(self, mock_post):
+        """
+            Should export the metrics in the Prometheus text format
+        """
+        mock_post.return_value = MockResponse({"errors":[{"message":"Server error"}]}, 502)
+
+        Prices.list()
+        text = self.metrics.to_prometheus()
+
+        self.assertIn('buycoins_requests_total{command="getPrices"} 1\n', text)
+        self.assertIn('buycoins_errors_total{command="getPrices",category="server_error"} 1\n', text)
+        self.assertIn('# TYPE buycoins_request_duration_seconds summary\n', text)
+        self.assertIn('buycoins_request_duration_seconds_count{command="getPrices",phase="http"} 1\n', text)
+        self.assertIn('buycoins_request_duration_seconds{command="getPrices",phase="total",quantile="0.99"} ', text)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_pool_of_a_client_transport(self, mock_post):
+        """
+            Should report the pool of the transport of the client the snapshot is taken for
+        """
+        mock_post.return_value = MockResponse({"data":{"getPrices":[{"id":"QnV5Y29pbnNQcmljZS0x"}]}}, 200)
+        client = BuycoinsClient("public", "secret", transport=Transport(pool_size=3))
+        with client.use():
+            Prices.list()
+            pool = self.metrics.snapshot()["pool"]
+
+        self.assertEqual(pool["max_size"], 3)
+        set_transport(Transport(pool_size=5))
+        self.assertEqual(self.metrics.snapshot()["pool"]["max_size"], 5)
+        self.assertEqual(self.metrics.snapshot(client=client)["pool"], pool)
+        self.assertIn("buycoins_pool_max_size 3\n", self.metrics.to_prometheus(client=client))
+
+    def test_disable(self):
+        """
+            Should stop collecting metrics once disabled and forget them on reset
+        """
+        self.metrics({"event":"end", "command":"getPrices", "bytes_sent":10, "bytes_received":None, "status":"success", "status_code":200, "error":None, "timings":{"http":0.2}})
+        self.metrics.disable()
+        self.assertNotIn(self.metrics, Hooks.HOOKS)
+
+        self.assertEqual(self.metrics.snapshot()["commands"]["getPrices"]["requests"], 1)
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot()["commands"], {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+from buycoins_client import Auth
+from buycoins_client import Balances
+from buycoins_client import MicroBatcher
+from buycoins_client import Orders
+from buycoins_client import Transfers
+from buycoins_client import Transport
+from buycoins_client import set_transport
+from buycoins_client.components import utilities
+import asyncio
+import concurrent.futures
+import json
+import unittest
+from unittest.mock import AsyncMock, patch
+
+try:
+    import aiohttp
+    from buycoins_client import aio
+    from buycoins_client.aio.transport import AsyncTransport, Response
+except ImportError:
+    aiohttp = None
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+def balances(data, **kwargs):
+    """Answer a batch document of getBalances queries with the balance of each aliased cryptocurrency."""
+    variables = json.loads(data)["variables"]
+    return MockResponse({"data":{name.split("_")[0]:[{"cryptocurrency":value, "confirmedBalance":"1"}] for name, value in variables.items()}}, 200)
+
+def market_pages(data, **kwargs):
+    """Answer a batch document of getMarketBook page queries from a book of three orders, using the first and after variables of each alias."""
+    body = json.loads(data)
+    variables = body.get("variables", {})
+    pages = {}
+    for alias in [part.split(":")[0] for part in body["query"].split() if ":getMarketBook" in part]:
+        start = int(variables.get(alias + "_after", 0))
+        end = min(start + variables[alias + "_first"], 3)
+        pages[alias] = {"orders":{"pageInfo":{"hasNextPage":end < 3, "endCursor":str(end)}, "edges":[{"cursor":str(position + 1), "node":{"id":str(position + 1)}} for position in range(start, end)]}}
+    return MockResponse({"data":pages}, 200)
+
+CRYPTOCURRENCIES = ["bitcoin", "ethereum", "litecoin", "usd_coin", "naira_token"]
+
+class TestMicroBatcherMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+
+    def tearDown(self):
+        utilities.TRANSPORT = None
+
+    def test_invalid_window(self):
+        """
+            Should throw an exception for a window that is not a positive number
+        """
+        try:
+            MicroBatcher(window="2ms")
+        except Exception as e:
+            self.assertEqual(str(e), "window must be a number of seconds greater than or equal to 0.")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_concurrent_queries_share_a_document(self, mock_post):
+        """
+            Should send the queries made within the window as one document and route each response to its caller
+        """
+        mock_post.side_effect = lambda url, data=None, **kwargs: balances(data)
+        batcher = MicroBatcher(window=0.05)
+        set_transport(Transport(micro_batcher=batcher))
+
+        with concurrent.futures.ThreadPoolExecutor(5) as executor:
+            responses = list(executor.map(Balances.get, CRYPTOCURRENCIES))
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual([response["data"]["getBalances"][0]["cryptocurrency"] for response in responses], CRYPTOCURRENCIES)
+        self.assertEqual((batcher.calls, batcher.batches), (5, 1))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_concurrent_paginated_iterators(self, mock_post):
+        """
+            Should keep the page variables of every batched query apart, so each iterator follows its own cursor
+        """
+        mock_post.side_effect = lambda url, data=None, **kwargs: market_pages(data)
+        set_transport(Transport(micro_batcher=MicroBatcher(window=0.05)))
+
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            futures = [executor.submit(lambda page_size: [node["id"] for node in Orders.iter_market_orders(page_size=page_size, prefetch=False)], page_size) for page_size in (2, 1)]
+
+        self.assertEqual([future.result() for future in futures], [["1", "2", "3"], ["1", "2", "3"]])
+        first = json.loads(mock_post.call_args_list[0][1]["data"])
+        self.assertIn("$c0_first:Int, $c0_after:String, $c1_first:Int, $c1_after:String", first["query"])
+        self.assertLess(mock_post.call_count, 5)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_full_documents_are_sent_early(self, mock_post):
+        """
+            Should start a new document once max_size queries have joined one
+        """
+        mock_post.side_effect = lambda url, data=None, **kwargs: balances(data)
+        set_transport(Transport(micro_batcher=MicroBatcher(window=0.05, max_size=2)))
+
+        with concurrent.futures.ThreadPoolExecutor(5) as executor:
+            responses = list(executor.map(Balances.get, CRYPTOCURRENCIES))
+
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual([response["status"] for response in responses], ["success"] * 5)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_mutations_are_sent_alone(self, mock_post):
+        """
+            Should send mutations right away in a document of their own
+        """
+        mock_post.return_value = MockResponse({"data":{"send":{"id":"1"}}}, 200)
+        batcher = MicroBatcher(window=0.05)
+        set_transport(Transport(micro_batcher=batcher))
+
+        response = Transfers.send({"cryptocurrency":"bitcoin", "amount":0.1, "address":"1MmyYvSEYLCPm45Ps6vQin1heGBv3jnBMx"})
+
+        self.assertEqual(response["data"], {"send":{"id":"1"}})
+        self.assertEqual(batcher.calls, 0)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_request_errors_reach_every_caller(self, mock_post):
+        """
+            Should raise the exception of a failed document in every call it was sent for
+        """
+        mock_post.side_effect = ConnectionError("connection reset")
+        set_transport(Transport(micro_batcher=MicroBatcher(window=0.05)))
+
+        with concurrent.futures.ThreadPoolExecutor(3) as executor:
+            futures = [executor.submit(Balances.get, cryptocurrency) for cryptocurrency in CRYPTOCURRENCIES[:3]]
+
+        self.assertEqual([str(future.exception()) for future in futures], ["connection reset"] * 3)
+        self.assertEqual(mock_post.call_count, 1)
+
+@unittest.skipUnless(aiohttp, "aiohttp is not installed")
+class TestAsyncMicroBatcherMethods(unittest.IsolatedAsyncioTestCase):
+
+    def tearDown(self):
+        aio.utilities.TRANSPORT = None
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    async def test_concurrent_queries_share_a_document(self, mock_post):
+        """
+            Should send the queries of concurrent coroutines as one document
+        """
+        mock_post.side_effect = lambda url, data=None, **kwargs: Response(200, balances(data).content)
+        Auth.setup("chuks", "emeka")
+        aio.set_transport(AsyncTransport(micro_batcher=MicroBatcher(window=0.01)))
+
+        responses = await asyncio.gather(*[aio.Balances.get(cryptocurrency) for cryptocurrency in CRYPTOCURRENCIES])
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual([response["data"]["getBalances"][0]["cryptocurrency"] for response in responses], CRYPTOCURRENCIES)
+
+if __name__ == '__main__':
+    unittest.main()
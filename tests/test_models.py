@@ -0,0 +1,107 @@
+from buycoins_client import Auth
+from buycoins_client import Batch
+from buycoins_client import Orders
+from buycoins_client import Prices
+from buycoins_client import Transfers
+from buycoins_client import models
+from datetime import datetime, timezone
+from decimal import Decimal
+import unittest
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+class TestModelsMethods(unittest.TestCase):
+
+    def test_fields_are_decoded_on_first_access(self):
+        """
+            Should keep values as received until they are read, then keep the decoded value
+        """
+        order = models.Order.from_dict({"id":"UG9zdE9yZGVy", "coinAmount":"0.0005", "createdAt":1614291760, "dynamicExchangeRate":None})
+
+        self.assertEqual(models.Order._coinAmount.__get__(order), "0.0005")
+        self.assertEqual(order.coinAmount, Decimal("0.0005"))
+        self.assertIs(models.Order._coinAmount.__get__(order), order.coinAmount)
+        self.assertEqual(order.createdAt, datetime(2021, 2, 25, 22, 22, 40, tzinfo=timezone.utc))
+        self.assertEqual(order.dynamicExchangeRate, None)
+        self.assertFalse(hasattr(order, "__dict__"))
+
+    def test_missing_and_unknown_fields(self):
+        """
+            Should throw an AttributeError for a field that was not requested and keep fields the model does not know
+        """
+        price = models.Price.from_dict({"id":"QnV5Y29pbnNQcmljZS0x", "fancyField":1})
+
+        self.assertEqual(price.fancyField, 1)
+        self.assertEqual(price.to_dict(), {"id":"QnV5Y29pbnNQcmljZS0x", "fancyField":1})
+        try:
+            price.sellPricePerCoin
+        except AttributeError as e:
+            self.assertEqual(str(e), "Price has no field sellPricePerCoin. Add it to the fields of the query to retrieve it.")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_list_prices_as_models(self, mock_post):
+        """
+            Should return Price models in the data of the response
+        """
+        mock_post.return_value = MockResponse({"data":{"getPrices":[{"id":"QnV5Y29pbnNQcmljZS0x", "cryptocurrency":"bitcoin", "sellPricePerCoin":"23865583.5", "expiresAt":1614295216}]}}, 200)
+
+        Auth.setup("chuks", "emeka")
+        response = Prices.list(as_models=True)
+
+        self.assertEqual(response["status"], "success")
+        self.assertIsInstance(response["data"]["getPrices"][0], models.Price)
+        self.assertEqual(response["data"]["getPrices"][0].sellPricePerCoin, Decimal("23865583.5"))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_market_orders_are_unwrapped(self, mock_post):
+        """
+            Should replace the orders connection with a list of Order models
+        """
+        mock_post.return_value = MockResponse({"data":{"getMarketBook":{"dynamicPriceExpiry":1614296236, "orders":{"edges":[{"node":{"id":"1", "pricePerCoin":"26599999.0"}}, {"node":{"id":"2", "pricePerCoin":"26500000.0"}}]}}}}, 200)
+
+        Auth.setup("chuks", "emeka")
+        response = Orders.list_market_orders(as_models=True)
+
+        book = response["data"]["getMarketBook"]
+        self.assertEqual(book["dynamicPriceExpiry"], 1614296236)
+        self.assertEqual([order.id for order in book["orders"]], ["1", "2"])
+        self.assertEqual(book["orders"][1].pricePerCoin, Decimal("26500000.0"))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_failure_response_is_unchanged(self, mock_post):
+        """
+            Should return failure responses without models
+        """
+        mock_post.return_value = MockResponse({"errors":[{"message":"Insufficient balance"}]}, 200)
+
+        Auth.setup("chuks", "emeka")
+        response = Transfers.send({"cryptocurrency":"bitcoin", "amount":0.02, "address":"vdADFaj7f89dfkadf="}, as_models=True)
+
+        self.assertEqual(response["status"], "failure")
+        self.assertNotIn("data", response)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_batch_calls_as_models(self, mock_post):
+        """
+            Should only convert the batched calls that asked for models
+        """
+        mock_post.return_value = MockResponse({"data":{"c0":[{"id":"price"}], "c1":[{"id":"other"}]}}, 200)
+
+        Auth.setup("chuks", "emeka")
+        batch = Batch()
+        batch.add(Prices.list, as_models=True)
+        batch.add(Prices.list)
+        models_response, dicts_response = batch.send()
+
+        self.assertEqual(models_response["data"]["getPrices"][0].id, "price")
+        self.assertEqual(dicts_response["data"]["getPrices"][0], {"id":"other"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+from buycoins_client import Auth
+from buycoins_client import OrderBook
+from decimal import Decimal
+import json
+import unittest
+from unittest.mock import patch
+
+def node(order_id, side, price, amount, cryptocurrency="bitcoin"):
+    return {"id":order_id, "cryptocurrency":cryptocurrency, "side":side, "pricePerCoin":price, "coinAmount":amount}
+
+POLL = [
+    node("1", "buy", "26000000.0", "0.5"),
+    node("2", "buy", "26100000.0", "0.2"),
+    node("3", "buy", "26100000.0", "0.3"),
+    node("4", "sell", "26500000.0", "0.1"),
+    node("5", "sell", "26400000.0", "0.4"),
+    node("6", "sell", "1800000.0", "2", cryptocurrency="ethereum"),
+]
+
+class MockStreamingResponse:
+    def __init__(self, json_data, status_code):
+        self.body = json.dumps(json_data).encode("utf-8")
+        self.status_code = status_code
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+    def close(self):
+        pass
+
+class TestOrderBookMethods(unittest.TestCase):
+
+    def test_best_bid_ask_and_spread(self):
+        """
+            Should index orders by cryptocurrency and side and aggregate orders at the same price
+        """
+        book = OrderBook()
+        diff = book.update(POLL)
+
+        self.assertEqual(diff, {"added":["1", "2", "3", "4", "5", "6"], "changed":[], "removed":[]})
+        self.assertEqual(book.best_bid("bitcoin"), (Decimal("26100000.0"), Decimal("0.5")))
+        self.assertEqual(book.best_ask("bitcoin"), (Decimal("26400000.0"), Decimal("0.4")))
+        self.assertEqual(book.spread("bitcoin"), Decimal("300000.0"))
+        self.assertEqual(book.best_bid("ethereum"), None)
+        self.assertEqual(book.spread("ethereum"), None)
+        self.assertEqual(book.depth("bitcoin", "buy"), [(Decimal("26100000.0"), Decimal("0.5")), (Decimal("26000000.0"), Decimal("0.5"))])
+        self.assertEqual(book.depth("bitcoin", "sell", levels=1), [(Decimal("26400000.0"), Decimal("0.4"))])
+
+    def test_successive_polls_apply_the_diff(self):
+        """
+            Should only add, change and remove the orders that differ from the previous poll
+        """
+        book = OrderBook()
+        book.update(POLL)
+        diff = book.update([POLL[0], POLL[1], node("3", "buy", "26200000.0", "0.3"), POLL[3], POLL[5], node("7", "sell", "26450000.0", "1")])
+
+        self.assertEqual(diff, {"added":["7"], "changed":["3"], "removed":["5"]})
+        self.assertEqual(len(book), 6)
+        self.assertNotIn("5", book)
+        self.assertEqual(book.get("3"), ("bitcoin", "buy", Decimal("26200000.0"), Decimal("0.3")))
+        self.assertEqual(book.best_bid("bitcoin"), (Decimal("26200000.0"), Decimal("0.3")))
+        self.assertEqual(book.best_ask("bitcoin"), (Decimal("26450000.0"), Decimal("1")))
+        self.assertEqual(book.depth("bitcoin", "buy"), [(Decimal("26200000.0"), Decimal("0.3")), (Decimal("26100000.0"), Decimal("0.2")), (Decimal("26000000.0"), Decimal("0.5"))])
+
+    def test_emptied_level_can_be_refilled(self):
+        """
+            Should keep the best price correct when a removed price level is filled again
+        """
+        book = OrderBook()
+        book.update([node("1", "sell", "10", "1"), node("2", "sell", "11", "1")])
+        book.update([node("2", "sell", "11", "1")])
+        book.update([node("2", "sell", "11", "1"), node("3", "sell", "10", "2")])
+
+        self.assertEqual(book.best_ask("bitcoin"), (Decimal("10"), Decimal("2")))
+        book.update([])
+        self.assertEqual(book.best_ask("bitcoin"), None)
+        self.assertEqual(len(book), 0)
+
+    def test_float_prices(self):
+        """
+            Should keep prices and amounts given as floats at the value they were written with
+        """
+        book = OrderBook()
+        book.update([{"id":"1", "cryptocurrency":"bitcoin", "side":"buy", "pricePerCoin":26100000.1, "coinAmount":0.1}, node("2", "buy", "26100000.1", "0.2")])
+
+        self.assertEqual(book.get("1"), ("bitcoin", "buy", Decimal("26100000.1"), Decimal("0.1")))
+        self.assertEqual(book.best_bid("bitcoin"), (Decimal("26100000.1"), Decimal("0.3")))
+
+    def test_emptied_levels_are_compacted(self):
+        """
+            Should keep the heap of a side bounded by its live price levels when every poll brings new prices
+        """
+        book = OrderBook()
+        for poll in range(1000):
+            book.update([node("resting", "sell", "100", "1"), node(str(poll), "sell", str(200 + poll), "1")])
+
+        book_side = book._sides[("bitcoin", "sell")]
+        self.assertLessEqual(len(book_side._heap), 2 * len(book_side._levels))
+        self.assertEqual(book.best_ask("bitcoin"), (Decimal("100"), Decimal("1")))
+        self.assertEqual(book.depth("bitcoin", "sell"), [(Decimal("100"), Decimal("1")), (Decimal("1199"), Decimal("1"))])
+
+    def test_failed_response(self):
+        """
+            Should throw an exception when updating from a failed response
+        """
+        try:
+            OrderBook().update({"status":"failure", "errors":[{"reason":"Invalid credentials"}]})
+        except Exception as e:
+            self.assertEqual(str(e), "Could not retrieve the market book: Invalid credentials")
+
+    def test_node_without_price(self):
+        """
+            Should throw an exception for an order node without the fields the book needs
+        """
+        try:
+            OrderBook().update([{"id":"1", "cryptocurrency":"bitcoin", "side":"buy", "coinAmount":"1"}])
+        except Exception as e:
+            self.assertEqual(str(e), "Order nodes need the id, cryptocurrency, side, coinAmount and pricePerCoin fields. Missing 'pricePerCoin'")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_refresh(self, mock_post):
+        """
+            Should retrieve the market book and fill the book from it
+        """
+        mock_post.return_value = MockStreamingResponse({"data":{"getMarketBook":{"orders":{"edges":[{"node":order} for order in POLL]}}}}, 200)
+
+        Auth.setup("chuks", "emeka")
+        book = OrderBook()
+        diff = book.refresh()
+
+        self.assertEqual(len(diff["added"]), 6)
+        self.assertTrue(json.loads(mock_post.call_args[1]["data"])["query"].startswith("query { getMarketBook{ orders{edges{node{id,cryptocurrency,side,coinAmount,pricePerCoin}}}"))
+        self.assertEqual(book.best_ask("ethereum"), (Decimal("1800000.0"), Decimal("2")))
+
+if __name__ == '__main__':
+    unittest.main()
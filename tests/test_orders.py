@@ -1,5 +1,7 @@
 from buycoins_client import Auth
 from buycoins_client import Orders
+from buycoins_client.components import utilities
+import json
 import unittest
 from unittest.mock import patch
 
@@ -128,7 +130,7 @@ class TestOrdersMethods(unittest.TestCase):
         except Exception as e:
             self.assertEqual(str(e), "Fields contains a node dict without a 'field' property.")
     
-    @patch('buycoins_client.Orders.requests.post')  # Mock 'requests' module 'post' method.
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
     def test_failed_list_my_orders(self, mock_post):
         """
             Should return a failure status when invalid node is requested.
@@ -142,7 +144,7 @@ class TestOrdersMethods(unittest.TestCase):
         self.assertEqual(response['status'], "failure")
         self.assertEqual(response["errors"][0]["reason"], "Field 'edgesa' doesn't exist on type 'PostOrderConnection'")
 
-    @patch('buycoins_client.Orders.requests.post')  # Mock 'requests' module 'post' method.
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
     def test_successful_list_my_orders(self, mock_post):
         """
             Should return a success status for successful personal orders retrieval
@@ -155,7 +157,7 @@ class TestOrdersMethods(unittest.TestCase):
         self.assertEqual(response['status'], "success")
         self.assertEqual(response["data"]["getOrders"]["dynamicPriceExpiry"], 1612396362)
 
-    @patch('buycoins_client.Orders.requests.post')  # Mock 'requests' module 'post' method.
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
     def test_failed_list_market_orders(self, mock_post):
         """
             Should return a failure status when invalid node is requested.
@@ -169,7 +171,7 @@ class TestOrdersMethods(unittest.TestCase):
         self.assertEqual(response['status'], "failure")
         self.assertEqual(response["errors"][0]["reason"], "Field 'edgesa' doesn't exist on type 'PostOrderConnection'")
 
-    @patch('buycoins_client.Orders.requests.post')  # Mock 'requests' module 'post' method.
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
     def test_successful_list_market_orders(self, mock_post):
         """
             Should return a success status for successful personal orders retrieval
@@ -182,7 +184,7 @@ class TestOrdersMethods(unittest.TestCase):
         self.assertEqual(response['status'], "success")
         self.assertEqual(response["data"]["getMarketBook"]["dynamicPriceExpiry"], 1612396362)
 
-    @patch('buycoins_client.Orders.requests.post')  # Mock 'requests' module 'post' method.
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
     def test_successful_post_limit_order(self, mock_post):
         """
             Should return a success status for successful list order posting
@@ -201,7 +203,7 @@ class TestOrdersMethods(unittest.TestCase):
         self.assertEqual(response['status'], "success")
         self.assertEqual(response["data"]["postLimitOrder"]["id"], "bDAd8slaAFDajd829slsf")
 
-    @patch('buycoins_client.Orders.requests.post')  # Mock 'requests' module 'post' method.
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
     def test_successful_post_market_order(self, mock_post):
         """
             Should return a success status for successful market order posting
@@ -219,6 +221,125 @@ class TestOrdersMethods(unittest.TestCase):
         self.assertEqual(response['status'], "success")
         self.assertEqual(response["data"]["postMarketOrder"]["id"], "adfFDAFDajd829slsf")
 
+    def test_invalid_page_size(self):
+        """
+            Should throw an exception for a page size that is not a positive integer
+        """
+        try:
+            Orders.iter_market_orders(page_size=0)
+        except Exception as e:
+            self.assertEqual(str(e), "page_size must be an integer greater than 0.")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_iter_market_orders(self, mock_post):
+        """
+            Should page through the market book with cursors and yield one order node at a time
+        """
+        mock_post.side_effect = [
+            MockResponse({"data":{"getMarketBook":{"orders":{"pageInfo":{"hasNextPage":True, "endCursor":"Mg"}, "edges":[{"cursor":"MQ", "node":{"id":"1"}}, {"cursor":"Mg", "node":{"id":"2"}}]}}}}, 200),
+            MockResponse({"data":{"getMarketBook":{"orders":{"pageInfo":{"hasNextPage":False, "endCursor":"Mw"}, "edges":[{"cursor":"Mw", "node":{"id":"3"}}]}}}}, 200),
+        ]
+
+        Auth.setup("chuks", "emeka")
+        nodes = Orders.iter_market_orders(page_size=2)
+
+        self.assertEqual([node["id"] for node in nodes], ["1", "2", "3"])
+        self.assertEqual(json.loads(mock_post.call_args_list[0][1]["data"])["variables"], {"first":2})
+        self.assertEqual(json.loads(mock_post.call_args_list[1][1]["data"])["variables"], {"first":2, "after":"Mg"})
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_iter_my_orders_without_prefetch(self, mock_post):
+        """
+            Should only request the next page once the current one has been consumed
+        """
+        mock_post.side_effect = [
+            MockResponse({"data":{"getOrders":{"orders":{"pageInfo":{"hasNextPage":True, "endCursor":"MQ"}, "edges":[{"cursor":"MQ", "node":{"id":"1"}}]}}}}, 200),
+            MockResponse({"data":{"getOrders":{"orders":{"pageInfo":{"hasNextPage":False, "endCursor":None}, "edges":[]}}}}, 200),
+        ]
+
+        Auth.setup("chuks", "emeka")
+        nodes = Orders.iter_my_orders("completed", page_size=1, prefetch=False)
+
+        self.assertEqual(next(nodes)["id"], "1")
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(list(nodes), [])
+        self.assertEqual(json.loads(mock_post.call_args_list[0][1]["data"])["variables"], {"status":"completed", "first":1})
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_iter_market_orders_failure(self, mock_post):
+        """
+            Should raise an exception when a page cannot be retrieved
+        """
+        mock_post.return_value = MockResponse({}, 401)
+
+        Auth.setup("chuks", "emeka")
+        try:
+            list(Orders.iter_market_orders())
+        except Exception as e:
+            self.assertEqual(str(e), "Could not retrieve a page of orders: Invalid credentials")
+
+
+    def test_invalid_order_in_bulk(self):
+        """
+            Should throw an exception with the position of the first invalid order before sending any of them
+        """
+        orders = [{"orderSide":"buy", "priceType":"static", "cryptocurrency":"bitcoin", "coinAmount":0.01, "staticPrice":24000000.0}, {"orderSide":"hold", "priceType":"static", "cryptocurrency":"bitcoin", "coinAmount":0.01}]
+        try:
+            Orders.post_limit_orders(orders)
+        except Exception as e:
+            self.assertEqual(str(e), "Order 1: orderSide argument must be a valid string that is either 'buy' or 'sell'")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_post_limit_orders_in_one_document(self, mock_post):
+        """
+            Should send the orders as aliased mutations of one document and split the results in order
+        """
+        mock_post.return_value = MockResponse({"data":{"c0":{"id":"order0"}, "c1":None}, "errors":[{"message":"Insufficient balance", "path":["c1"]}]}, 200)
+
+        Auth.setup("chuks", "emeka")
+        orders = [{"orderSide":"buy", "priceType":"static", "cryptocurrency":"bitcoin", "coinAmount":0.01, "staticPrice":24000000.0}, {"orderSide":"sell", "priceType":"dynamic", "cryptocurrency":"ethereum", "coinAmount":2.0, "dynamicExchangeRate":570.0}]
+        responses = Orders.post_limit_orders(orders)
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(json.loads(mock_post.call_args[1]["data"])["query"].count("postLimitOrder"), 2)
+        self.assertEqual(responses[0], {"status":"success", "data":{"postLimitOrder":{"id":"order0"}}})
+        self.assertEqual((responses[1]["status"], responses[1]["errors"][0]["reason"]), ("failure", "Insufficient balance"))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_post_market_orders_concurrently(self, mock_post):
+        """
+            Should send one request per order and turn a failed request into the failure of its order only
+        """
+        def respond(url, data, **kwargs):
+            if b'"coinAmount":0.5' in data:
+                raise ConnectionError("Connection reset by peer")
+            return MockResponse({"data":{"postMarketOrder":{"id":"order"}}}, 200)
+        mock_post.side_effect = respond
+
+        Auth.setup("chuks", "emeka")
+        orders = [{"orderSide":"buy", "cryptocurrency":"bitcoin", "coinAmount":amount} for amount in [0.1, 0.5, 0.2]]
+        responses = Orders.post_market_orders(orders, concurrency=2)
+
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual([response["status"] for response in responses], ["success", "failure", "success"])
+        self.assertEqual(responses[1]["errors"], [{"reason":"Connection reset by peer", "field":None}])
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_bulk_orders_need_credentials(self, mock_post):
+        """
+            Should raise the missing credentials exception once instead of failing every order
+        """
+        previous, utilities.AUTH = utilities.AUTH, None
+        orders = [{"orderSide":"buy", "cryptocurrency":"bitcoin", "coinAmount":amount} for amount in [0.1, 0.2]]
+        try:
+            with self.assertRaises(Exception) as raised:
+                Orders.post_market_orders(orders, concurrency=2)
+        finally:
+            utilities.AUTH = previous
+
+        self.assertEqual(str(raised.exception), "Please set up your public and secret keys using buycoins_python.Auth.setup function.")
+        mock_post.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
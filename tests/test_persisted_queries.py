@@ -0,0 +1,94 @@
+from buycoins_client import Auth
+from buycoins_client import BuycoinsClient
+from buycoins_client import Orders
+from buycoins_client import Prices
+from buycoins_client.components import utilities
+from buycoins_client.testing import FakeServer
+import hashlib
+import json
+import unittest
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+NOT_FOUND = MockResponse({"errors":[{"message":"PersistedQueryNotFound", "extensions":{"code":"PERSISTED_QUERY_NOT_FOUND"}}]}, 200)
+ORDERS = MockResponse({"data":{"getOrders":{"dynamicPriceExpiry":1, "orders":{"edges":[]}}}}, 200)
+
+class TestPersistedQueriesMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+        utilities.PERSISTED_QUERIES = True
+
+    def tearDown(self):
+        utilities.PERSISTED_QUERIES = False
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_documents_are_sent_by_hash(self, mock_post):
+        """
+            Should send the sha256 hash of the document instead of its text
+        """
+        mock_post.return_value = ORDERS
+
+        response = Orders.list_my_orders("open")
+
+        body = json.loads(mock_post.call_args[1]["data"])
+        document = utilities._request_body(Orders._list_my_orders_query("open", []))["query"]
+        self.assertEqual(response["status"], "success")
+        self.assertNotIn("query", body)
+        self.assertEqual(body["variables"], {"status":"open"})
+        self.assertEqual(body["extensions"]["persistedQuery"], {"version":1, "sha256Hash":hashlib.sha256(document.encode()).hexdigest()})
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_unknown_hashes_are_sent_with_their_document(self, mock_post):
+        """
+            Should send the document with its hash when the API does not know the hash
+        """
+        mock_post.side_effect = [NOT_FOUND, ORDERS]
+
+        response = Orders.list_my_orders("open")
+
+        bodies = [json.loads(call[1]["data"]) for call in mock_post.call_args_list]
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(bodies[1]["query"], utilities._request_body(Orders._list_my_orders_query("open", []))["query"])
+        self.assertEqual(bodies[1]["extensions"], bodies[0]["extensions"])
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_short_documents_and_clients(self, mock_post):
+        """
+            Should send short documents in full and follow the persisted_queries setting of a client
+        """
+        mock_post.return_value = ORDERS
+        client = BuycoinsClient("buycoins", "africa", persisted_queries=False)
+
+        Prices.list()
+        client.Orders.list_my_orders("open")
+
+        self.assertTrue(all("query" in json.loads(call[1]["data"]) for call in mock_post.call_args_list))
+
+    def test_fake_server_protocol(self):
+        """
+            Should register documents with the fake server once and send only their hashes afterwards
+        """
+        with FakeServer(market_book_size=5) as server:
+            responses = [Orders.list_market_orders() for _ in range(3)]
+        with FakeServer(market_book_size=5, persisted_queries=False) as unsupported:
+            fallback = Orders.list_market_orders()
+
+        self.assertEqual([len(response["data"]["getMarketBook"]["orders"]["edges"]) for response in responses], [5, 5, 5])
+        self.assertEqual(server.stats["persisted_query_misses"], 1)
+        self.assertEqual(server.stats[200], 4)
+        self.assertEqual(fallback["status"], "success")
+        self.assertEqual(unsupported.stats[200], 2) # the hash, answered with PersistedQueryNotSupported, then the full document
+        self.assertEqual(unsupported.stats["getMarketBook"], 1)
+        self.assertEqual(unsupported.stats["persisted_query_misses"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+from buycoins_client import Auth
+from buycoins_client import PriceWatcher
+from buycoins_client.components import utilities
+import asyncio
+import json
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+try:
+    import aiohttp
+    from buycoins_client import aio
+    from buycoins_client.aio.transport import Response
+except ImportError:
+    aiohttp = None
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+def price(cryptocurrency, sell, expires_at=1612391202):
+    return {"id":"QnV5Y29pbnNQcmljZS0x", "cryptocurrency":cryptocurrency, "buyPricePerCoin":"26260000", "sellPricePerCoin":sell, "minSell":"0.001", "maxSell":"100", "expiresAt":expires_at}
+
+def prices_response(*nodes):
+    return MockResponse({"data":{"getPrices":list(nodes)}}, 200)
+
+class TestPriceWatcherMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+
+    def test_invalid_interval(self):
+        """
+            Should throw an exception for an interval that is not a positive number
+        """
+        try:
+            PriceWatcher(interval=0)
+        except Exception as e:
+            self.assertEqual(str(e), "interval must be a number of seconds greater than 0.")
+
+    def test_watchers_do_not_grow_the_compiled_fields(self):
+        """
+            Should not keep the fields list of every watcher created
+        """
+        compiled = len(utilities._compiled_fields)
+        for position in range(50):
+            PriceWatcher(fields=["buyPricePerCoin", "minBuy"] * (position + 1))
+
+        self.assertEqual(len(utilities._compiled_fields), compiled)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_only_changes_are_notified(self, mock_post):
+        """
+            Should call subscribers with the changed fields of the cryptocurrencies they watch only
+        """
+        mock_post.side_effect = [
+            prices_response(price("bitcoin", "25740000"), price("ethereum", "1782000")),
+            prices_response(price("bitcoin", "25740000"), price("ethereum", "1790000", 1612391217)),
+            prices_response(price("bitcoin", "25740000")),
+        ]
+        watcher = PriceWatcher()
+        everything, bitcoin = [], []
+        watcher.subscribe(everything.append)
+        watcher.subscribe(bitcoin.append, ["bitcoin"])
+
+        watcher.refresh()
+        watcher.refresh()
+        watcher.refresh()
+
+        self.assertEqual(len(bitcoin), 1)
+        self.assertEqual(everything[1], {"ethereum": {"sellPricePerCoin":"1790000", "expiresAt":1612391217}})
+        self.assertEqual(everything[2], {"ethereum": None})
+        self.assertEqual(watcher.get("bitcoin")["sellPricePerCoin"], "25740000")
+        self.assertEqual(watcher.get("ethereum"), None)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_late_subscribers_get_the_snapshot(self, mock_post):
+        """
+            Should call a new subscriber with the current snapshot
+        """
+        mock_post.return_value = prices_response(price("bitcoin", "25740000"))
+        watcher = PriceWatcher()
+        watcher.refresh()
+
+        changes = []
+        watcher.subscribe(changes.append)
+
+        self.assertEqual(changes, [{"bitcoin": {"buyPricePerCoin":"26260000", "sellPricePerCoin":"25740000", "minSell":"0.001", "maxSell":"100", "expiresAt":1612391202}}])
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_concurrent_refreshes_share_one_poll(self, mock_post):
+        """
+            Should send one request for refresh calls made while a poll is in flight
+        """
+        def respond(*args, **kwargs):
+            time.sleep(0.1)
+            return prices_response(price("bitcoin", "25740000"))
+        mock_post.side_effect = respond
+        watcher = PriceWatcher()
+
+        threads = [threading.Thread(target=watcher.refresh) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_post.call_count, 1)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_failed_poll(self, mock_post):
+        """
+            Should raise the reasons a poll failed and keep the snapshot
+        """
+        mock_post.side_effect = [prices_response(price("bitcoin", "25740000")), MockResponse({"errors":[{"message":"Invalid credentials"}]}, 401)]
+        watcher = PriceWatcher()
+        watcher.refresh()
+
+        try:
+            watcher.refresh()
+        except Exception as e:
+            self.assertEqual(str(e), "Could not retrieve prices: Invalid credentials")
+        self.assertEqual(list(watcher.snapshot), ["bitcoin"])
+
+@unittest.skipUnless(aiohttp, "aiohttp is not installed")
+class TestAsyncPriceWatcherMethods(unittest.IsolatedAsyncioTestCase):
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    async def test_concurrent_refreshes_share_one_poll(self, mock_post):
+        """
+            Should send one request for refresh calls made while a poll is in flight and run coroutine subscribers
+        """
+        async def respond(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return Response(200, json.dumps({"data":{"getPrices":[price("bitcoin", "25740000")]}}).encode())
+        mock_post.side_effect = respond
+        Auth.setup("chuks", "emeka")
+        watcher = aio.AsyncPriceWatcher()
+        changes = []
+        async def on_change(change):
+            changes.append(change)
+        watcher.subscribe(on_change)
+
+        results = await asyncio.gather(*[watcher.refresh() for _ in range(4)])
+        await asyncio.sleep(0)
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(results[0], results[3])
+        self.assertEqual(list(changes[0]), ["bitcoin"])
+
+if __name__ == '__main__':
+    unittest.main()
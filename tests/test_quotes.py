@@ -0,0 +1,236 @@
+from buycoins_client import Auth
+from buycoins_client import Batch
+from buycoins_client import BuycoinsClient
+from buycoins_client import QuoteCache
+from buycoins_client import Transfers
+from buycoins_client import set_quote_cache
+import json
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+try:
+    import aiohttp
+    from buycoins_client import aio
+    from buycoins_client.aio.transport import Response
+except ImportError:
+    aiohttp = None
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+def prices_response(price_id, expires_in):
+    return MockResponse({"data":{"getPrices":[{"id":price_id, "cryptocurrency":"bitcoin", "buyPricePerCoin":"26260000", "sellPricePerCoin":"25740000", "expiresAt":time.time() + expires_in}]}}, 200)
+
+def trade_response(command):
+    return MockResponse({"data":{command:{"id":"QnV5Y29pbnNPcmRlci0x", "cryptocurrency":"bitcoin", "status":"processing", "totalCoinAmount":"0.01", "side":command}}}, 200)
+
+def sent_price(call):
+    return json.loads(call[1]["data"])["variables"]["price"]
+
+class TestQuoteCacheMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+
+    def tearDown(self):
+        set_quote_cache(None)
+
+    def test_invalid_margin(self):
+        """
+            Should throw an exception for a margin that is not a positive number
+        """
+        try:
+            QuoteCache(margin=-1)
+        except Exception as e:
+            self.assertEqual(str(e), "margin must be a number of seconds greater than or equal to 0.")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_trades_use_cached_price(self, mock_post):
+        """
+            Should fill in the price of buy and sell calls from one getPrices call while the quote is valid
+        """
+        mock_post.side_effect = [prices_response("QnV5Y29pbnNQcmljZS0x", 30), trade_response("buy"), trade_response("sell")]
+        set_quote_cache(QuoteCache(margin=5))
+
+        bought = Transfers.buy({"cryptocurrency":"bitcoin", "coin_amount":0.01})
+        sold = Transfers.sell({"cryptocurrency":"bitcoin", "coin_amount":0.01})
+
+        self.assertEqual(bought["status"], "success")
+        self.assertEqual(sold["status"], "success")
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual([sent_price(call) for call in mock_post.call_args_list[1:]], ["QnV5Y29pbnNQcmljZS0x"] * 2)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_quotes_inside_the_margin_are_refetched(self, mock_post):
+        """
+            Should fetch a new quote once the cached one expires within the margin
+        """
+        mock_post.side_effect = [prices_response("QnV5Y29pbnNQcmljZS0x", 4), prices_response("QnV5Y29pbnNQcmljZS0y", 30)]
+        cache = QuoteCache(margin=5)
+
+        self.assertEqual(cache.price_id("bitcoin"), "QnV5Y29pbnNQcmljZS0y") # the first quote was fetched inside the margin
+        self.assertEqual(cache.price_id("bitcoin"), "QnV5Y29pbnNQcmljZS0y")
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_quotes_that_stay_inside_the_margin_raise(self, mock_post):
+        """
+            Should throw an exception instead of handing out a quote that expires within the margin
+        """
+        mock_post.return_value = prices_response("QnV5Y29pbnNQcmljZS0x", 4)
+        cache = QuoteCache(margin=5)
+
+        try:
+            cache.price_id("bitcoin")
+        except Exception as e:
+            self.assertEqual(str(e), "The price quote for bitcoin expires within the 5 second margin.")
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_rejected_trade_drops_the_quote(self, mock_post):
+        """
+            Should drop the cached quote after a trade is rejected and keep explicit prices untouched
+        """
+        mock_post.side_effect = [
+            prices_response("QnV5Y29pbnNQcmljZS0x", 30),
+            MockResponse({"errors":[{"message":"Insufficient balance", "path":["buy"]}]}, 200),
+            trade_response("buy"),
+        ]
+        cache = QuoteCache()
+        client = BuycoinsClient("buycoins", "africa", quote_cache=cache)
+
+        self.assertEqual(client.Transfers.buy({"cryptocurrency":"bitcoin", "coin_amount":0.01})["status"], "failure")
+        self.assertEqual(cache.quotes, {})
+        client.Transfers.buy({"cryptocurrency":"bitcoin", "coin_amount":0.01, "price":"QnV5Y29pbnNQcmljZS05"})
+        self.assertEqual(sent_price(mock_post.call_args_list[2]), "QnV5Y29pbnNQcmljZS05")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_expired_price_is_retried_once(self, mock_post):
+        """
+            Should send a trade rejected for an expired price again with a fresh quote
+        """
+        mock_post.side_effect = [
+            prices_response("QnV5Y29pbnNQcmljZS0x", 30),
+            MockResponse({"errors":[{"message":"Price has expired", "path":["sell"]}]}, 200),
+            prices_response("QnV5Y29pbnNQcmljZS0y", 30),
+            trade_response("sell"),
+        ]
+        set_quote_cache(QuoteCache())
+
+        sold = Transfers.sell({"cryptocurrency":"bitcoin", "coin_amount":0.01})
+
+        self.assertEqual(sold["status"], "success")
+        self.assertEqual([sent_price(mock_post.call_args_list[position]) for position in (1, 3)], ["QnV5Y29pbnNQcmljZS0x", "QnV5Y29pbnNQcmljZS0y"])
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_batched_trade_without_price(self, mock_post):
+        """
+            Should fetch the quote of a trade added to a batch without a price instead of capturing the getPrices call
+        """
+        mock_post.side_effect = [prices_response("QnV5Y29pbnNQcmljZS0x", 30), MockResponse({"data":{"c0":trade_response("buy").json_data["data"]["buy"]}}, 200)]
+        set_quote_cache(QuoteCache())
+
+        batch = Batch()
+        batch.add(Transfers.buy, {"cryptocurrency":"bitcoin", "coin_amount":0.01})
+        bought, = batch.send()
+
+        self.assertEqual(bought["status"], "success")
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(json.loads(mock_post.call_args_list[1][1]["data"])["variables"]["c0_price"], "QnV5Y29pbnNQcmljZS0x")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_background_refresh(self, mock_post):
+        """
+            Should replace the quotes before they stop being used once started
+        """
+        mock_post.side_effect = [prices_response("QnV5Y29pbnNQcmljZS0x", 0.3), prices_response("QnV5Y29pbnNQcmljZS0y", 60)]
+        cache = QuoteCache(margin=0.1, refresh_ahead=0.1)
+        cache.price_id("bitcoin")
+
+        with cache:
+            time.sleep(0.3)
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(cache.quotes["bitcoin"]["id"], "QnV5Y29pbnNQcmljZS0y")
+
+    def test_trades_without_cache_need_a_price(self):
+        """
+            Should still require a price when no quote cache is set
+        """
+        try:
+            Transfers.sell({"cryptocurrency":"bitcoin", "coin_amount":0.01})
+        except Exception as e:
+            self.assertEqual(str(e), "price argument must be a valid string identifier.")
+
+@unittest.skipUnless(aiohttp, "aiohttp is not installed")
+class TestAsyncQuoteCacheMethods(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+
+    def tearDown(self):
+        set_quote_cache(None)
+        aio.utilities.TRANSPORT = None
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    async def test_trades_use_cached_price(self, mock_prices, mock_post):
+        """
+            Should fill in the price of aio buy and sell calls from the quote cache
+        """
+        mock_prices.return_value = prices_response("QnV5Y29pbnNQcmljZS0x", 30)
+        mock_post.side_effect = [Response(200, trade_response(command).content) for command in ("buy", "sell")]
+        set_quote_cache(QuoteCache(margin=5))
+
+        bought = await aio.Transfers.buy({"cryptocurrency":"bitcoin", "coin_amount":0.01})
+        sold = await aio.Transfers.sell({"cryptocurrency":"bitcoin", "coin_amount":0.01})
+
+        self.assertEqual([bought["status"], sold["status"]], ["success", "success"])
+        self.assertEqual(mock_prices.call_count, 1)
+        self.assertEqual([sent_price(call) for call in mock_post.call_args_list], ["QnV5Y29pbnNQcmljZS0x"] * 2)
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    async def test_batched_trade_without_price(self, mock_prices, mock_post):
+        """
+            Should fetch the quote of an aio trade added to a batch without a price instead of capturing the getPrices call
+        """
+        mock_prices.return_value = prices_response("QnV5Y29pbnNQcmljZS0x", 30)
+        mock_post.return_value = Response(200, MockResponse({"data":{"c0":trade_response("buy").json_data["data"]["buy"]}}, 200).content)
+        set_quote_cache(QuoteCache())
+
+        batch = aio.Batch()
+        batch.add(aio.Transfers.buy, {"cryptocurrency":"bitcoin", "coin_amount":0.01})
+        bought, = await batch.send()
+
+        self.assertEqual(bought["status"], "success")
+        self.assertEqual(mock_prices.call_count, 1)
+        self.assertEqual(json.loads(mock_post.call_args[1]["data"])["variables"]["c0_price"], "QnV5Y29pbnNQcmljZS0x")
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    async def test_expired_price_is_retried_once(self, mock_prices, mock_post):
+        """
+            Should send an aio trade rejected for an expired price again with a fresh quote
+        """
+        mock_prices.side_effect = [prices_response("QnV5Y29pbnNQcmljZS0x", 30), prices_response("QnV5Y29pbnNQcmljZS0y", 30)]
+        mock_post.side_effect = [
+            Response(200, MockResponse({"errors":[{"message":"Price has expired", "path":["buy"]}]}, 200).content),
+            Response(200, trade_response("buy").content),
+        ]
+        set_quote_cache(QuoteCache())
+
+        bought = await aio.Transfers.buy({"cryptocurrency":"bitcoin", "coin_amount":0.01})
+
+        self.assertEqual(bought["status"], "success")
+        self.assertEqual([sent_price(call) for call in mock_post.call_args_list], ["QnV5Y29pbnNQcmljZS0x", "QnV5Y29pbnNQcmljZS0y"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+from buycoins_client import Auth
+from buycoins_client import Balances
+from buycoins_client import RateLimiter
+from buycoins_client import Transport
+from buycoins_client import set_transport
+from buycoins_client.components import utilities
+import json
+import multiprocessing
+import time
+import unittest
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+def acquire_many(limiter, count):
+    for _ in range(count):
+        limiter.acquire(["getPrices"])
+
+class TestRateLimitMethods(unittest.TestCase):
+
+    def tearDown(self):
+        utilities.TRANSPORT = None
+
+    def test_invalid_rate(self):
+        """
+            Should throw an exception for a rate that is not greater than 0
+        """
+        try:
+            RateLimiter(10, commands={"getBalances": 0})
+        except Exception as e:
+            self.assertEqual(str(e), "The rate of the getBalances budget must be a number of requests per second greater than 0.")
+
+    def test_burst_then_pace(self):
+        """
+            Should let a burst through at once and then hand out one turn per 1/rate seconds
+        """
+        limiter = RateLimiter(100, burst=5)
+
+        waits = [limiter.reserve() for _ in range(8)]
+
+        self.assertEqual(waits[:5], [0.0] * 5)
+        for turn, wait in enumerate(waits[5:], 1):
+            self.assertAlmostEqual(wait, turn / 100, delta=0.005)
+
+    def test_command_budget(self):
+        """
+            Should pace a command by its own budget while other commands only use the global one
+        """
+        limiter = RateLimiter(1000, commands={"getBalances": (10, 1)})
+
+        self.assertEqual(limiter.reserve(["getBalances"]), 0.0)
+        self.assertAlmostEqual(limiter.reserve(["getBalances"]), 0.1, delta=0.005)
+        self.assertEqual(limiter.reserve(["getPrices"]), 0.0)
+
+    def test_shared_between_processes(self):
+        """
+            Should share one budget between worker processes
+        """
+        limiter = RateLimiter(50, burst=1, shared=True)
+        workers = [multiprocessing.Process(target=acquire_many, args=(limiter, 10)) for _ in range(2)]
+
+        start = time.monotonic()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertGreaterEqual(time.monotonic() - start, 19 / 50)
+        self.assertEqual([worker.exitcode for worker in workers], [0, 0])
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_requests_are_paced(self, mock_post):
+        """
+            Should wait for the budget of a command before sending its request
+        """
+        mock_post.return_value = MockResponse({"data":{"getBalances":[]}}, 200)
+        Auth.setup("chuks", "emeka")
+        set_transport(Transport(rate_limiter=RateLimiter(1000, commands={"getBalances": (20, 1)})))
+
+        start = time.monotonic()
+        for _ in range(3):
+            Balances.list()
+
+        self.assertGreaterEqual(time.monotonic() - start, 2 / 20)
+        self.assertEqual(mock_post.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+from buycoins_client import Auth
+from buycoins_client import Prices
+from buycoins_client import RetryPolicy
+from buycoins_client import Transfers
+from buycoins_client import Transport
+from buycoins_client import set_transport
+from buycoins_client.components import retry
+from buycoins_client.components import utilities
+import json
+import requests
+import socket
+import unittest
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code, headers=None):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def json(self):
+        return self.json_data
+
+class TestRetryMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+        set_transport(Transport(retry=RetryPolicy(attempts=3, base=0, cap=0, seed=1)))
+
+    def tearDown(self):
+        utilities.TRANSPORT = None
+
+    def test_invalid_policy(self):
+        """
+            Should throw an exception for a number of attempts that is not a positive integer
+        """
+        try:
+            RetryPolicy(attempts=0)
+        except Exception as e:
+            self.assertEqual(str(e), "attempts must be an integer greater than 0.")
+
+    def test_decorrelated_jitter(self):
+        """
+            Should wait between base and three times the previous wait, capped at cap
+        """
+        policy = RetryPolicy(base=0.1, cap=1.0, seed=7)
+        delay = 0
+        for _ in range(50):
+            previous, delay = delay, policy.backoff(delay)
+            self.assertTrue(0.1 <= delay <= min(1.0, max(previous, 0.1) * 3))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_query_is_retried(self, mock_post):
+        """
+            Should retry a query after a retryable status code and record every attempt
+        """
+        mock_post.side_effect = [MockResponse({}, 502), MockResponse({}, 429, {"Retry-After": "0"}), MockResponse({"data":{"getPrices":[]}}, 200)]
+
+        response = Prices.list()
+
+        self.assertEqual(response["status"], "success")
+        self.assertEqual([attempt["status_code"] for attempt in response["attempts"]], [502, 429, 200])
+        self.assertEqual(mock_post.call_count, 3)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_attempts_run_out(self, mock_post):
+        """
+            Should return the last failure once every attempt has been used
+        """
+        mock_post.return_value = MockResponse({}, 503)
+
+        response = Prices.list()
+
+        self.assertEqual(response["errors"], [{"reason": "Unknown failure", "field":None}])
+        self.assertEqual(len(response["attempts"]), 3)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_long_retry_after_is_not_waited_for(self, mock_post):
+        """
+            Should return a rate limited response at once when Retry-After is longer than max_retry_after
+        """
+        mock_post.return_value = MockResponse({}, 429, {"Retry-After": "120"})
+
+        response = Prices.list()
+
+        self.assertEqual(len(response["attempts"]), 1)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_mutation_is_not_retried_after_it_was_sent(self, mock_post):
+        """
+            Should not send a mutation again after a server error or a reset connection
+        """
+        mock_post.side_effect = [MockResponse({}, 502), requests.exceptions.ConnectionError("Connection reset by peer")]
+
+        response = Transfers.send({"cryptocurrency":"bitcoin", "amount":0.02, "address":"vdADFaj7f89dfkadf="})
+        self.assertEqual(len(response["attempts"]), 1)
+
+        try:
+            Transfers.send({"cryptocurrency":"bitcoin", "amount":0.02, "address":"vdADFaj7f89dfkadf="})
+        except requests.exceptions.ConnectionError as e:
+            self.assertEqual(len(e.attempts), 1)
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_mutation_is_retried_after_connect_failure(self, mock_post):
+        """
+            Should send a mutation again when the connection could not be opened
+        """
+        mock_post.side_effect = [requests.exceptions.ConnectTimeout("Connect timeout"), MockResponse({"data":{"send":{"id":"T25jaGFpblRyYW5zZmVyLTE"}}}, 200)]
+
+        response = Transfers.send({"cryptocurrency":"bitcoin", "amount":0.02, "address":"vdADFaj7f89dfkadf="})
+
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(response["attempts"][0]["status_code"], None)
+
+    def test_refused_connection_is_a_connect_failure(self):
+        """
+            Should recognise a refused connection as a request that was never sent
+        """
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        port = listener.getsockname()[1]
+        listener.close()
+
+        try:
+            requests.post("http://127.0.0.1:{}/api/graphql".format(port))
+        except requests.exceptions.ConnectionError as e:
+            self.assertTrue(retry.is_connect_failure(e))
+        self.assertFalse(retry.is_connect_failure(requests.exceptions.ConnectionError("Connection reset by peer")))
+
+if __name__ == '__main__':
+    unittest.main()
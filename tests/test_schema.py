@@ -0,0 +1,145 @@
+from buycoins_client import Auth
+from buycoins_client import Balances
+from buycoins_client import Batch
+from buycoins_client import Orders
+from buycoins_client import Prices
+from buycoins_client import Schema
+from buycoins_client import introspect
+from buycoins_client import set_schema
+from buycoins_client.components import schema
+from buycoins_client.components import utilities
+import json
+import unittest
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+def type_ref(name, kind="OBJECT", non_null=False):
+    ref = {"kind": kind, "name": name, "ofType": None}
+    return {"kind": "NON_NULL", "name": None, "ofType": ref} if non_null else ref
+
+INTROSPECTION = {"__schema": {
+    "queryType": {"name": "QueryRoot"},
+    "mutationType": None,
+    "types": [
+        {"name": "QueryRoot", "fields": [{"name": "getBalances", "args": [{"name": "cryptocurrency", "type": type_ref("Cryptocurrency", "ENUM", True)}], "type": {"kind": "LIST", "name": None, "ofType": type_ref("Account")}}]},
+        {"name": "Account", "fields": [{"name": "id", "args": [], "type": type_ref("ID", "SCALAR", True)}, {"name": "cryptocurrency", "args": [], "type": type_ref("Cryptocurrency", "ENUM")}]},
+        {"name": "Cryptocurrency", "fields": None},
+    ],
+}}
+
+class TestSchemaMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+        set_schema(schema.BUNDLED)
+
+    def tearDown(self):
+        set_schema(None)
+        utilities.TRANSPORT = None
+
+    def test_later_sibling_fields_are_checked(self):
+        """
+            Should check the fields that follow a field with a sub-selection
+        """
+        self.assertFalse(utilities.is_valid_fields([{"field":"orders", "fields":[{"field":"id"}]}, {"name":"chuks"}]))
+        self.assertTrue(utilities.is_valid_fields([{"field":"orders", "fields":[{"field":"id"}]}, {"field":"dynamicPriceExpiry"}]))
+
+    def test_invalid_schema(self):
+        """
+            Should throw an exception for a schema that is not a Schema instance
+        """
+        try:
+            set_schema({"Query": {}})
+        except Exception as e:
+            self.assertEqual(str(e), "schema must be an instance of buycoins_client.Schema")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_queries_are_sent_unchecked_by_default(self, mock_post):
+        """
+            Should leave fields to the API when no schema has been set
+        """
+        mock_post.return_value = MockResponse({"data":{"getBalances":[{"network":"bitcoin"}]}}, 200)
+        set_schema(None)
+
+        response = Balances.list([{"field":"network"}])
+
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(mock_post.call_count, 1)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_invalid_queries_are_not_sent(self, mock_post):
+        """
+            Should answer unknown fields, unknown arguments and wrong nesting locally with every error
+        """
+        fields = [{"field":"dynamicPriceExpiry", "fields":[{"field":"id"}]}, {"field":"orders", "args":{"frist":"10"}, "fields":[{"field":"edges", "fields":[{"field":"node", "fields":[{"field":"cryptocurren"}]}]}, {"field":"pageInfo"}]}]
+        response = Orders.list_my_orders("open", fields)
+
+        mock_post.assert_not_called()
+        self.assertEqual(response["status"], "failure")
+        self.assertEqual(response["errors"], [
+            {"reason":"Selections can't be made on scalars (field 'dynamicPriceExpiry' of type 'PostOrders')", "field":"query.getOrders.dynamicPriceExpiry"},
+            {"reason":"Field 'orders' doesn't accept argument 'frist'", "field":"query.getOrders.orders"},
+            {"reason":"Field 'cryptocurren' doesn't exist on type 'PostOrder'", "field":"query.getOrders.orders.edges.node.cryptocurren"},
+            {"reason":"Field 'pageInfo' of type 'PageInfo' must have a selection of subfields", "field":"query.getOrders.orders.pageInfo"},
+        ])
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_results_are_memoized(self, mock_post):
+        """
+            Should check a selection once and send the queries that match the schema
+        """
+        mock_post.return_value = MockResponse({"data":{"getPrices":[{"id":"price"}]}}, 200)
+        fresh = Schema(schema.TYPES, schema.ARGUMENTS)
+        set_schema(fresh)
+        with patch.object(fresh, "_check_root", side_effect=fresh._check_root) as check:
+            Prices.list([{"field":"id"}])
+            Prices.list([{"field":"id"}])
+            Prices.list([{"field":"idd"}])
+            Prices.list([{"field":"idd"}])
+
+        self.assertEqual(check.call_count, 2)
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_batched_calls_are_checked_one_by_one(self, mock_post):
+        """
+            Should only leave a rejected call out of its batch document
+        """
+        mock_post.return_value = MockResponse({"data":{"c1":[{"id":"balance"}]}}, 200)
+        batch = Batch()
+        batch.add(Prices.list, [{"field":"cryptocrrency"}])
+        batch.add(Balances.list, [{"field":"id"}])
+        prices, balances = batch.send()
+
+        self.assertEqual(prices["errors"][0]["reason"], "Field 'cryptocrrency' doesn't exist on type 'BuycoinsPrice'")
+        self.assertEqual(balances, {"status":"success", "data":{"getBalances":[{"id":"balance"}]}})
+        self.assertNotIn("c0:getPrices", json.loads(mock_post.call_args[1]["data"])["query"])
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_schema_from_introspection(self, mock_post):
+        """
+            Should fetch an introspection result and check queries against the schema created from it
+        """
+        mock_post.side_effect = [MockResponse({"data":INTROSPECTION}, 200), MockResponse({"data":{"getBalances":[{"id":"1"}]}}, 200)]
+        set_schema(Schema.from_introspection(introspect()))
+
+        listed = Balances.list([{"field":"id"}])
+        got = Balances.get("bitcoin", [{"field":"confirmedBalance"}])
+
+        self.assertEqual(listed["errors"][0]["reason"], "Field 'getBalances' is missing required arguments: cryptocurrency")
+        self.assertEqual(got["errors"][0]["reason"], "Field 'confirmedBalance' doesn't exist on type 'Account'")
+        self.assertEqual(mock_post.call_count, 1)
+
+        set_schema(None)
+        self.assertEqual(Balances.list([{"field":"id"}])["status"], "success")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+from buycoins_client import Auth
+from buycoins_client import Balances
+from buycoins_client import BuycoinsClient
+from buycoins_client import Prices
+from buycoins_client import SingleFlight
+from buycoins_client import Transfers
+from buycoins_client import Transport
+from buycoins_client import set_transport
+from buycoins_client.components import utilities
+import asyncio
+import concurrent.futures
+import json
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+try:
+    import aiohttp
+    from buycoins_client import aio
+    from buycoins_client.aio.transport import AsyncTransport, Response
+except ImportError:
+    aiohttp = None
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+def slow(json_data):
+    def respond(*args, **kwargs):
+        time.sleep(0.1)
+        return MockResponse(json_data, 200)
+    return respond
+
+class TestSingleFlightMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+        self.single_flight = SingleFlight()
+        set_transport(Transport(single_flight=self.single_flight))
+
+    def tearDown(self):
+        utilities.TRANSPORT = None
+
+    def test_invalid_single_flight(self):
+        """
+            Should throw an exception for a single_flight that is not a SingleFlight instance
+        """
+        try:
+            Transport(single_flight=True)
+        except Exception as e:
+            self.assertEqual(str(e), "single_flight must be an instance of buycoins_client.SingleFlight")
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_identical_queries_share_one_request(self, mock_post):
+        """
+            Should send one request for identical concurrent queries and give every caller its own response dict
+        """
+        mock_post.side_effect = slow({"data":{"getBalances":[{"id":"1", "cryptocurrency":"bitcoin", "confirmedBalance":"0.5"}]}})
+
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            responses = list(executor.map(lambda _: Balances.get("bitcoin"), range(8)))
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual((self.single_flight.sent, self.single_flight.shared), (1, 7))
+        self.assertTrue(all(response == responses[0] and response is not responses[0] for response in responses[1:]))
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_different_queries_and_accounts_are_sent(self, mock_post):
+        """
+            Should only share requests with the same body and credentials
+        """
+        mock_post.side_effect = slow({"data":{"getBalances":[]}})
+        client = BuycoinsClient("buycoins", "africa")
+        calls = [lambda: Balances.get("bitcoin"), lambda: Balances.get("ethereum"), lambda: client.Balances.get("bitcoin"), lambda: Balances.get("bitcoin")]
+
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda call: call(), calls))
+
+        self.assertEqual(mock_post.call_count, 3)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_mutations_are_never_shared(self, mock_post):
+        """
+            Should send every mutation even when an identical one is in flight
+        """
+        mock_post.side_effect = slow({"data":{"send":{"id":"1"}}})
+        args = {"cryptocurrency":"bitcoin", "amount":0.1, "address":"1MmyYvSEYLCPm45Ps6vQin1heGBv3jnBMx"}
+
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda _: Transfers.send(args), range(4)))
+
+        self.assertEqual(mock_post.call_count, 4)
+        self.assertEqual(self.single_flight.sent, 0)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_errors_reach_every_caller(self, mock_post):
+        """
+            Should raise the exception of a shared request in every caller and send the next query again
+        """
+        def fail(*args, **kwargs):
+            time.sleep(0.1)
+            raise ConnectionError("connection reset")
+        mock_post.side_effect = fail
+
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            futures = [executor.submit(Prices.list) for _ in range(4)]
+        errors = [str(future.exception()) for future in futures]
+
+        mock_post.side_effect = None
+        mock_post.return_value = MockResponse({"data":{"getPrices":[]}}, 200)
+        Prices.list()
+
+        self.assertEqual(errors, ["connection reset"] * 4)
+        self.assertEqual(mock_post.call_count, 2)
+
+@unittest.skipUnless(aiohttp, "aiohttp is not installed")
+class TestAsyncSingleFlightMethods(unittest.IsolatedAsyncioTestCase):
+
+    def tearDown(self):
+        aio.utilities.TRANSPORT = None
+
+    @patch('buycoins_client.aio.transport.AsyncTransport.post', new_callable=AsyncMock)
+    async def test_identical_queries_share_one_request(self, mock_post):
+        """
+            Should send one request for identical concurrent queries, even if one of the callers is cancelled
+        """
+        async def respond(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return Response(200, json.dumps({"data":{"getPrices":[]}}).encode())
+        mock_post.side_effect = respond
+        Auth.setup("chuks", "emeka")
+        aio.set_transport(AsyncTransport(single_flight=SingleFlight()))
+
+        first = asyncio.ensure_future(aio.Prices.list())
+        await asyncio.sleep(0)
+        first.cancel()
+        responses = await asyncio.gather(*[aio.Prices.list() for _ in range(4)])
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual([response["status"] for response in responses], ["success"] * 4)
+
+if __name__ == '__main__':
+    unittest.main()
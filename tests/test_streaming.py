@@ -0,0 +1,112 @@
+from buycoins_client import Auth
+from buycoins_client import Orders
+from buycoins_client.components import utilities
+from buycoins_client.components.streaming import EdgeDecoder
+import json
+import unittest
+from unittest.mock import patch
+
+BOOK = {"data":{"getMarketBook":{"dynamicPriceExpiry":1612396362, "orders":{"edges":[{"node":{"id":"1", "pricePerCoin":"26599999.0"}}, {"node":{"id":"2", "note":"\"edges\": [é]"}}, {"node":{"id":"3", "pricePerCoin":"25500000.0"}}]}}}}
+
+class MockStreamingResponse:
+    def __init__(self, json_data, status_code, chunk_size=7):
+        self.body = json.dumps(json_data, ensure_ascii=False).encode("utf-8")
+        self.status_code = status_code
+        self.chunk_size = chunk_size
+        self.closed = False
+
+    def json(self):
+        raise AssertionError("the body of a streamed response should not be decoded at once")
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+    def close(self):
+        self.closed = True
+
+class TestStreamingMethods(unittest.TestCase):
+
+    def test_decoder_hands_off_nodes_across_chunk_boundaries(self):
+        """
+            Should decode every node when the body arrives one byte at a time
+        """
+        nodes = []
+        decoder = EdgeDecoder(nodes.append)
+        for byte in json.dumps(BOOK, ensure_ascii=False).encode("utf-8"):
+            decoder.feed(bytes([byte]))
+        body = decoder.close()
+
+        self.assertEqual([node["id"] for node in nodes], ["1", "2", "3"])
+        self.assertEqual(nodes[1]["note"], "\"edges\": [é]")
+        self.assertEqual(body, {"data":{"getMarketBook":{"dynamicPriceExpiry":1612396362, "orders":{"edges":[]}}}})
+
+    def test_decoder_rejects_a_truncated_body(self):
+        """
+            Should raise an exception when the body ends inside an edges list
+        """
+        decoder = EdgeDecoder(lambda node: None)
+        decoder.feed(b'{"data":{"getMarketBook":{"orders":{"edges":[{"node":{"id":"1"}},{"node":')
+        try:
+            decoder.close()
+        except ValueError as e:
+            self.assertEqual(str(e), "The response body ended before the JSON document was complete.")
+
+    def test_failed_request_body_is_not_decoded(self):
+        """
+            Should answer failed requests from the status code alone
+        """
+        response = MockStreamingResponse({}, 502)
+
+        self.assertEqual(utilities.parse_response(response)["errors"][0]["reason"], "Unknown failure")
+        self.assertEqual(utilities.parse_streaming_response(response, print)["errors"][0]["reason"], "Unknown failure")
+        self.assertTrue(response.closed)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_list_market_orders_with_on_node(self, mock_post):
+        """
+            Should pass every order node to on_node and return the rest of the response
+        """
+        mock_post.return_value = MockStreamingResponse(BOOK, 200)
+
+        Auth.setup("chuks", "emeka")
+        nodes = []
+        response = Orders.list_market_orders(on_node=nodes.append)
+
+        self.assertEqual(mock_post.call_args[1]["stream"], True)
+        self.assertEqual(len(nodes), 3)
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(response["data"]["getMarketBook"]["dynamicPriceExpiry"], 1612396362)
+        self.assertEqual(response["data"]["getMarketBook"]["orders"]["edges"], [])
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_stream_market_orders(self, mock_post):
+        """
+            Should yield order nodes while the response is being read
+        """
+        response = MockStreamingResponse(BOOK, 200, chunk_size=len(json.dumps(BOOK)) // 2)
+        mock_post.return_value = response
+
+        Auth.setup("chuks", "emeka")
+        nodes = Orders.stream_market_orders()
+
+        self.assertEqual(next(nodes)["id"], "1")
+        self.assertFalse(response.closed)
+        self.assertEqual([node["id"] for node in nodes], ["2", "3"])
+        self.assertTrue(response.closed)
+
+    @patch('requests.Session.post')  # Mock the pooled session 'post' method.
+    def test_stream_my_orders_failure(self, mock_post):
+        """
+            Should raise an exception when the request fails
+        """
+        mock_post.return_value = MockStreamingResponse({"errors":[{"message":"Invalid status"}]}, 200)
+
+        Auth.setup("chuks", "emeka")
+        try:
+            list(Orders.stream_my_orders("completed"))
+        except Exception as e:
+            self.assertEqual(str(e), "Could not retrieve orders: Invalid status")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+from buycoins_client import Auth
+from buycoins_client import Balances
+from buycoins_client import Batch
+from buycoins_client import Orders
+from buycoins_client import Prices
+from buycoins_client import Transfers
+from buycoins_client.components import utilities
+from buycoins_client.testing import FakeServer, Exchange, constant
+from decimal import Decimal
+import time
+import unittest
+
+class TestFakeServerMethods(unittest.TestCase):
+
+    def setUp(self):
+        Auth.setup("chuks", "emeka")
+
+    def test_invalid_fault(self):
+        """
+            Should throw an exception for a fault status code that is not 401, 429 or 5xx
+        """
+        try:
+            FakeServer(faults={404: 0.1})
+        except Exception as e:
+            self.assertEqual(str(e), "Fault status codes must be 401, 429 or 5xx. Got 404")
+
+    def test_state_is_kept_between_calls(self):
+        """
+            Should debit and credit balances for trades and transfers
+        """
+        with FakeServer(exchange=Exchange(market_book_size=0, balances={"bitcoin": "0.5", "naira_token": "1000000"}, seed=1)):
+            price = [price for price in Prices.list()["data"]["getPrices"] if price["cryptocurrency"] == "bitcoin"][0]
+            bought = Transfers.buy({"cryptocurrency":"bitcoin", "coin_amount":0.01, "price":price["id"]})
+            sent = Transfers.send({"cryptocurrency":"bitcoin", "amount":0.1, "address":"vdADFaj7f89dfkadf="})
+            too_much = Transfers.send({"cryptocurrency":"bitcoin", "amount":1.0, "address":"vdADFaj7f89dfkadf="})
+            balances = {balance["cryptocurrency"]: balance["confirmedBalance"] for balance in Balances.list()["data"]["getBalances"]}
+
+        self.assertEqual(bought["data"]["buy"]["status"], "processing")
+        self.assertEqual(sent["data"]["send"]["fee"], "0.00044")
+        self.assertEqual(too_much["errors"][0]["reason"], "Insufficient balance")
+        self.assertEqual(balances["bitcoin"], "0.40956")
+        self.assertEqual(balances["naira_token"], "737400")
+
+    def test_market_order_fills_the_market_book(self):
+        """
+            Should fill a market order from the best orders of the market book and list it as completed
+        """
+        with FakeServer(market_book_size=2000, seed=3):
+            before = list(Orders.iter_market_orders(page_size=500))
+            order = Orders.post_market_order({"orderSide":"buy", "cryptocurrency":"bitcoin", "coinAmount":0.2})
+            completed = Orders.list_my_orders("completed")
+            after = [edge["node"] for edge in Orders.list_market_orders()["data"]["getMarketBook"]["orders"]["edges"]]
+
+        self.assertEqual(len(before), 2000)
+        self.assertEqual(order["data"]["postMarketOrder"]["status"], "completed")
+        self.assertEqual(completed["data"]["getOrders"]["orders"]["edges"][0]["node"]["id"], order["data"]["postMarketOrder"]["id"])
+        self.assertEqual(sum(Decimal(order["coinAmount"]) for order in before if order["side"] == "sell" and order["cryptocurrency"] == "bitcoin") - Decimal("0.2"),
+            sum(Decimal(order["coinAmount"]) for order in after if order["side"] == "sell" and order["cryptocurrency"] == "bitcoin"))
+
+    def test_unknown_field(self):
+        """
+            Should answer a field that is not in the schema with a graphql error
+        """
+        with FakeServer():
+            response = Balances.get("bitcoin", [{"field":"cryptocurrenc"}])
+
+        self.assertEqual(response["errors"][0]["reason"], "Field 'cryptocurrenc' doesn't exist on type 'Account'")
+
+    def test_batch(self):
+        """
+            Should answer every aliased field of a batch document
+        """
+        with FakeServer():
+            batch = Batch()
+            batch.add(Prices.list)
+            batch.add(Balances.get, "ethereum")
+            prices, balance = batch.send()
+
+        self.assertEqual(len(prices["data"]["getPrices"]), 5)
+        self.assertEqual(balance["data"]["getBalances"][0]["confirmedBalance"], "1")
+
+    def test_injected_faults(self):
+        """
+            Should answer with the injected status codes and graphql errors
+        """
+        with FakeServer(faults={429: 1.0}) as server:
+            throttled = Prices.list()
+        with FakeServer(error_rate=1.0):
+            failed = Prices.list()
+        with FakeServer(credentials=("public", "secret")):
+            unauthorized = Prices.list()
+
+        self.assertEqual(server.stats[429], 1)
+        self.assertEqual(throttled["errors"][0]["reason"], "Unknown failure")
+        self.assertEqual(failed["errors"][0]["reason"], "Internal server error")
+        self.assertEqual(unauthorized["errors"][0]["reason"], "Invalid credentials")
+
+    def test_latency(self):
+        """
+            Should wait for the injected latency before answering and point the client back when it stops
+        """
+        api_url = utilities.API_URL
+        with FakeServer(latency=constant(0.05)):
+            start = time.perf_counter()
+            Prices.list()
+            elapsed = time.perf_counter() - start
+
+        self.assertGreaterEqual(elapsed, 0.05)
+        self.assertEqual(utilities.API_URL, api_url)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+from buycoins_client import Auth
+from buycoins_client import Prices
+from buycoins_client import Transport
+from buycoins_client import set_transport
+from buycoins_client.components import utilities
+import unittest
+from unittest.mock import patch
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+class TestTransportMethods(unittest.TestCase):
+
+    def tearDown(self):
+        utilities.TRANSPORT = None
+
+    def test_invalid_pool_size(self):
+        """
+            Should throw an exception for a pool size that is not a positive integer
+        """
+        try:
+            Transport(pool_size=0)
+        except Exception as e:
+            self.assertEqual(str(e), "pool_size must be an integer greater than 0.")
+
+    def test_invalid_transport(self):
+        """
+            Should throw an exception when setting a transport that is not a Transport instance
+        """
+        try:
+            set_transport("requests")
+        except Exception as e:
+            self.assertEqual(str(e), "transport must be an instance of buycoins_client.Transport")
+
+    def test_session_is_reused(self):
+        """
+            Should reuse one pooled session across calls
+        """
+        transport = Transport(pool_size=4)
+        session = transport.session
+
+        self.assertIs(transport.session, session)
+        self.assertEqual(session.get_adapter("https://backend.buycoins.tech")._pool_maxsize, 4)
+
+    def test_session_is_recreated_after_fork(self):
+        """
+            Should drop the parent's session in a forked child
+        """
+        transport = Transport()
+        session = transport.session
+        transport._after_fork()
+
+        self.assertIsNot(transport.session, session)
+
+    def test_session_rejects_cookies(self):
+        """
+            Should never store cookies on the shared session
+        """
+        transport = Transport()
+        self.assertFalse(transport.session.cookies.get_policy().set_ok(None, None))
+
+    def test_components_use_shared_transport(self):
+        """
+            Should send component calls through the configured transport
+        """
+        transport = Transport()
+        set_transport(transport)
+
+        with patch.object(transport, "post", return_value=MockResponse({"data":{"getPrices":[]}}, 200)) as mock_post:
+            Auth.setup("chuks", "emeka")
+            response = Prices.list()
+
+        self.assertEqual(response['status'], "success")
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(mock_post.call_args[0][0], utilities.API_URL)
+
+if __name__ == '__main__':
+    unittest.main()
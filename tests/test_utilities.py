@@ -0,0 +1,78 @@
+from buycoins_client import Orders
+from buycoins_client import Prices
+from buycoins_client.components import utilities
+import unittest
+
+class TestUtilitiesMethods(unittest.TestCase):
+
+    def test_invalid_operation(self):
+        """
+            Should throw an exception for an operation that is neither query nor mutation
+        """
+        try:
+            utilities._request_body({"operation":"subscription", "command":"getPrices", "fields":[{"field":"id"}]})
+        except Exception as e:
+            self.assertEqual(str(e), "Invalid operation subscription")
+
+    def test_create_request_body_returns_the_document(self):
+        """
+            Should still return the graphql document with the argument values written into it
+        """
+        document = utilities.create_request_body({"operation":"query", "command":"getBalances", "args":{"cryptocurrency":"bitcoin"}, "fields":[{"field":"confirmedBalance"}]})
+
+        self.assertEqual(document, "query { getBalances(cryptocurrency:bitcoin){ confirmedBalance }}")
+
+    def test_arguments_are_sent_as_variables(self):
+        """
+            Should pass root field arguments as graphql variables
+        """
+        body = utilities._request_body({"operation":"mutation", "command":"buy", "args":{"price":"QnV5Y29pbnNQcmljZS0x", "coin_amount":0.02, "cryptocurrency":"bitcoin"}, "fields":[{"field":"id"}]})
+
+        self.assertEqual(body["query"], "mutation($price:ID!, $coin_amount:BigDecimal!, $cryptocurrency:Cryptocurrency) { buy(price:$price,coin_amount:$coin_amount,cryptocurrency:$cryptocurrency){ id }}")
+        self.assertEqual(body["variables"], {"price":"QnV5Y29pbnNQcmljZS0x", "coin_amount":0.02, "cryptocurrency":"bitcoin"})
+
+    def test_absent_optional_arguments_are_left_out(self):
+        """
+            Should leave arguments without a value out of the variables
+        """
+        body = utilities._request_body({"operation":"mutation", "command":"postLimitOrder", "args":{"orderSide":"buy", "priceType":"dynamic", "cryptocurrency":"bitcoin", "coinAmount":0.01, "staticPrice":None}, "fields":[{"field":"id"}]})
+
+        self.assertNotIn("staticPrice", body["variables"])
+        self.assertEqual(body["variables"]["coinAmount"], 0.01)
+
+    def test_field_arguments_are_written_into_the_document(self):
+        """
+            Should keep writing arguments of nested fields and unknown commands into the document
+        """
+        body = utilities._request_body({"operation":"query", "command":"getPrices", "fields":[{"field":"cryptocurrency"}, {"field":"fees", "args":{"type":"min"}, "fields":[{"field":"day"}]}]})
+
+        self.assertEqual(body, {"query":"query { getPrices{ cryptocurrency,fees(type:min){day} }}"})
+
+    def test_documents_are_reused(self):
+        """
+            Should return the same cached document for calls that only differ in argument values
+        """
+        first = utilities._request_body(Orders._post_market_order_query({"orderSide":"buy", "cryptocurrency":"bitcoin", "coinAmount":0.001}, []))
+        second = utilities._request_body(Orders._post_market_order_query({"orderSide":"sell", "cryptocurrency":"litecoin", "coinAmount":2.5}, []))
+
+        self.assertIs(first["query"], second["query"])
+        self.assertEqual(second["variables"], {"orderSide":"sell", "cryptocurrency":"litecoin", "coinAmount":2.5})
+
+    def test_equal_fields_lists_share_a_document(self):
+        """
+            Should reuse the document of an equal fields list passed as a new object
+        """
+        first = utilities._request_body(Prices._list_query([{"field":"id"}, {"field":"minSell"}]))
+        second = utilities._request_body(Prices._list_query([{"field":"id"}, {"field":"minSell"}]))
+
+        self.assertIs(first["query"], second["query"])
+
+    def test_is_valid_fields(self):
+        """
+            Should reject a fields list with a node dict without a field property
+        """
+        self.assertTrue(utilities.is_valid_fields(Orders.ORDER_BOOK_FIELDS))
+        self.assertFalse(utilities.is_valid_fields([{"field":"id"}, {"name":"chuks"}]))
+
+if __name__ == '__main__':
+    unittest.main()